@@ -0,0 +1,192 @@
+import os
+import json
+import numpy as np
+import torch
+
+from object_cache import LatestCache
+
+# ==========================================
+# 🔎 브랜드 임베딩 근사 최근접 이웃 (IVF, NumPy)
+# ------------------------------------------
+# find_competitors / find_similar_brands 는 쿼리마다 전체 브랜드와 코사인 유사도를 계산합니다.
+# 정규화된 임베딩을 k-means 로 nlist 개 클러스터(inverted list)로 나눠 두고,
+# 쿼리와 가까운 nprobe 개 클러스터 안에서만 내적을 계산합니다.
+#   - nprobe ↑ : recall ↑, 지연시간 ↑   (nprobe = nlist 이면 정확 검색과 동일)
+#   - 인덱스는 임베딩 파일과 같은 폴더(기본 outputs/graph/ann_company.npz)에 저장하고,
+#     dgl_node_embeddings_v3.pt 의 크기/수정시각이 바뀌면 자동으로 다시 만듭니다.
+#     (국가별 부분 그래프 임베딩은 slices/<국가>/ann_company.npz - 전체 그래프 인덱스를 덮어쓰지 않음)
+#   - exact_topk: 블록 단위 행렬곱 정확 검색 (검증용, 브랜드 수가 적으면 search 도 이 경로 사용)
+# ==========================================
+ANN_PATH = "./outputs/graph/ann_company.npz"
+DEFAULT_NPROBE = 16
+EXACT_BELOW = 20_000   # 이 이하 브랜드 수는 정확 검색이 더 빠름 (행렬곱 한 번)
+
+def normalize(x):
+    x = np.asarray(x, dtype=np.float32)
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norms, 1e-8)
+
+def topk_rows(scores, k):
+    """행별 상위 k (점수 내림차순) -> (인덱스, 점수)"""
+    k = min(k, scores.shape[1])
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind='stable')
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+BLOCK_ELEMS = 1 << 25   # 정확 검색 블록당 점수 행렬 원소 수 상한 (float32 128MB)
+
+def exact_topk(queries, base, k, block_size=None, exclude=None):
+    """
+    정확 검색: queries(정규화) x base(정규화) 를 block_size 행씩 행렬곱하여 top-k.
+    block_size 를 주지 않으면 점수 행렬이 BLOCK_ELEMS 를 넘지 않게 정합니다.
+    exclude[i] 가 주어지면 해당 base 행(자기 자신)은 제외합니다.
+    """
+    block_size = block_size or max(1, BLOCK_ELEMS // max(len(base), 1))
+    ids_out, scores_out = [], []
+    for start in range(0, len(queries), block_size):
+        scores = queries[start:start + block_size] @ base.T
+        if exclude is not None:
+            rows = np.arange(scores.shape[0])
+            scores[rows, exclude[start:start + block_size]] = -np.inf
+        ids, sc = topk_rows(scores, k)
+        ids_out.append(ids)
+        scores_out.append(sc)
+    return np.concatenate(ids_out), np.concatenate(scores_out)
+
+def file_signature(path):
+    st = os.stat(path)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+class IVFIndex:
+    def __init__(self, centroids, list_offsets, list_ids, vectors, source=None):
+        self.centroids = centroids        # [nlist, dim]
+        self.list_offsets = list_offsets  # [nlist + 1]  (CSR)
+        self.list_ids = list_ids          # [N] 클러스터 순으로 정렬된 원본 행 번호
+        self.vectors = vectors            # [N, dim] 정규화 임베딩 (원본 행 순서)
+        self.source = source or {}
+
+    @property
+    def nlist(self):
+        return len(self.centroids)
+
+    @classmethod
+    def build(cls, vectors, nlist=None, n_iter=15, sample_size=100_000, seed=42, source=None):
+        """구면 k-means (내적 기준) 로 클러스터를 만들고 각 벡터를 가장 가까운 클러스터에 배정"""
+        vectors = normalize(vectors)
+        n = len(vectors)
+        nlist = nlist or max(1, int(np.sqrt(n)))
+        nlist = min(nlist, n)
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(n, min(n, sample_size), replace=False)]
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(n_iter):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            empty = np.bincount(assign, minlength=nlist) == 0
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]  # 빈 클러스터 재시드
+            centroids = normalize(sums)
+
+        assign = np.concatenate([np.argmax(vectors[s:s + 65536] @ centroids.T, axis=1)
+                                 for s in range(0, n, 65536)])
+        list_ids = np.argsort(assign, kind='stable')
+        list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=nlist))])
+        return cls(centroids, list_offsets, list_ids, vectors, source)
+
+    def search(self, queries, k=10, nprobe=DEFAULT_NPROBE, exclude=None, batch_size=4096):
+        """
+        배치 top-k 근사 검색. queries: [Q, dim] (정규화 전 값도 가능)
+        exclude: 쿼리별로 제외할 원본 행 번호 (자기 자신) 또는 None
+        반환: (ids [Q, k], scores [Q, k]) - 후보가 k 개보다 적으면 남는 칸은 -1 / -inf
+        브랜드 수가 EXACT_BELOW 이하이거나 nprobe >= nlist 이면 정확 검색으로 처리합니다.
+        """
+        queries = normalize(queries)
+        if exclude is not None:
+            exclude = np.asarray(exclude, dtype=np.int64)
+        if len(self.vectors) <= EXACT_BELOW or nprobe >= self.nlist:
+            return exact_topk(queries, self.vectors, k, exclude=exclude)
+        ids_out, scores_out = [], []
+        for start in range(0, len(queries), batch_size):
+            ex = None if exclude is None else exclude[start:start + batch_size]
+            ids, sc = self._search_batch(queries[start:start + batch_size], k, nprobe, ex)
+            ids_out.append(ids)
+            scores_out.append(sc)
+        return np.concatenate(ids_out), np.concatenate(scores_out)
+
+    def _search_batch(self, queries, k, nprobe, exclude):
+        """클러스터 단위로 묶어 계산: 같은 클러스터를 조회하는 쿼리들을 한 번의 행렬곱으로 처리"""
+        n_q = len(queries)
+        probe = topk_rows(queries @ self.centroids.T, nprobe)[0]     # [Q, nprobe]
+        cand_ids = np.full((n_q, nprobe, k), -1, dtype=np.int64)
+        cand_scores = np.full((n_q, nprobe, k), -np.inf, dtype=np.float32)
+
+        flat = probe.ravel()
+        order = np.argsort(flat, kind='stable')
+        lists, starts = np.unique(flat[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+        for l, s, e in zip(lists, starts, ends):
+            q_idx, slot = np.divmod(order[s:e], nprobe)
+            members = self.list_ids[self.list_offsets[l]:self.list_offsets[l + 1]]
+            if len(members) == 0: continue
+            scores = queries[q_idx] @ self.vectors[members].T           # [쿼리 수, 클러스터 크기]
+            if exclude is not None:
+                scores[members[None, :] == exclude[q_idx][:, None]] = -np.inf
+            top, top_scores = topk_rows(scores, k)
+            cand_ids[q_idx, slot, :top.shape[1]] = members[top]
+            cand_scores[q_idx, slot, :top.shape[1]] = top_scores
+
+        best, best_scores = topk_rows(cand_scores.reshape(n_q, -1), k)
+        ids = np.take_along_axis(cand_ids.reshape(n_q, -1), best, axis=1)
+        ids[~np.isfinite(best_scores)] = -1
+        return ids, best_scores
+
+    def exact(self, queries, k=10, exclude=None):
+        return exact_topk(normalize(queries), self.vectors, k, exclude=exclude)
+
+    # ------------------------------------------
+    # 저장 / 로드 (벡터는 임베딩 파일에서 다시 읽으므로 저장하지 않음)
+    # ------------------------------------------
+    def save(self, path=ANN_PATH):
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, centroids=self.centroids, list_offsets=self.list_offsets, list_ids=self.list_ids,
+                 source=np.array(json.dumps(self.source)))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, vectors):
+        with np.load(path) as f:
+            return cls(f['centroids'], f['list_offsets'], f['list_ids'], normalize(vectors),
+                       json.loads(str(f['source'])))
+
+def load_or_build(company_embs, embedding_path, path=ANN_PATH, nlist=None):
+    """임베딩 파일이 인덱스 생성 이후 바뀌었으면 다시 만들고 저장합니다."""
+    if isinstance(company_embs, torch.Tensor):
+        company_embs = company_embs.detach().cpu().numpy()
+    source = file_signature(embedding_path) if os.path.exists(embedding_path) else {}
+    source['rows'] = int(len(company_embs))
+    if os.path.exists(path):
+        try:
+            index = IVFIndex.load(path, company_embs)
+            if index.source == source and len(index.list_ids) == len(company_embs):
+                return index
+            print("ℹ️ 임베딩이 변경되어 ANN 인덱스를 다시 생성합니다.")
+        except (OSError, KeyError, ValueError) as e:
+            print(f"⚠️ ANN 인덱스 로드 실패, 다시 생성합니다: {e}")
+    index = IVFIndex.build(company_embs, nlist=nlist, source=source)
+    try:
+        index.save(path)
+    except OSError as e:
+        print(f"⚠️ ANN 인덱스 저장 실패 (메모리에서만 사용): {e}")
+    return index
+
+_CACHE = LatestCache()
+
+def path_for(embedding_path):
+    """임베딩 파일 -> 같은 폴더의 ANN 인덱스 경로"""
+    return os.path.join(os.path.dirname(embedding_path), os.path.basename(ANN_PATH))
+
+def of(embeddings, embedding_path):
+    """분석 스크립트용: 임베딩 객체별로 인덱스를 한 번만 준비합니다."""
+    return _CACHE.get(embeddings, lambda: load_or_build(embeddings['company'], embedding_path,
+                                                       path=path_for(embedding_path)))
@@ -0,0 +1,189 @@
+import os
+import json
+import shutil
+import weakref
+import threading
+import numpy as np
+import torch
+
+# ==========================================
+# 🗄️ mmap 아티팩트 저장소 (pickle 없는 .npy 디렉터리)
+# ------------------------------------------
+# graph_data.pt / label_encoders.pt / dgl_node_embeddings_v3.pt 는 pickle 이라
+# 로드할 때마다 전체를 새 힙 메모리로 역직렬화합니다. (프로세스마다 사본 1개씩)
+# 같은 내용을 <이름>.mmap/ 디렉터리에 배열별 .npy + manifest.json 으로 함께 저장하고,
+# 로드는 np.load(mmap_mode='c') 로 파일을 매핑만 합니다.
+#   - 로드가 거의 즉시 끝나고, 여러 프로세스가 같은 페이지 캐시를 공유
+#   - 'c'(copy-on-write) 모드라 텐서를 수정해도 원본 파일은 바뀌지 않음
+#   - manifest 에 함께 저장한 .pt 의 크기/수정시각을 기록 -> .pt 만 새로 쓰인 경우(구버전 스크립트)는
+#     mmap 을 무시하고 .pt 를 읽음. mmap 디렉터리가 없을 때도 .pt 로 대체
+# ==========================================
+MMAP_SUFFIX = ".mmap"
+MANIFEST_FILE = "manifest.json"
+FORMAT_VERSION = 1
+
+GRAPH_PATH = "./outputs/graph/graph_data.pt"
+EMBEDDING_PATH = "./outputs/graph/dgl_node_embeddings_v3.pt"
+
+def mmap_dir(pt_path):
+    return os.path.splitext(pt_path)[0] + MMAP_SUFFIX
+
+def _signature(path):
+    if not os.path.exists(path):
+        return None
+    st = os.stat(path)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+def _torch_load(path):
+    try:
+        return torch.load(path, map_location='cpu', weights_only=False)
+    except TypeError:
+        return torch.load(path, map_location='cpu')
+
+# ==========================================
+# 💾 공통: 배열 묶음 저장 / 매핑
+# ==========================================
+def save_arrays(pt_path, arrays, meta=None):
+    """
+    arrays: {키: ndarray/Tensor}, meta: JSON 직렬화 가능한 dict
+    pt_path 와 같은 이름의 .mmap 디렉터리에 저장 (pt_path 를 먼저 저장한 뒤 호출)
+    """
+    out_dir = mmap_dir(pt_path)
+    tmp_dir, old_dir = out_dir + ".tmp", out_dir + ".old"
+    try:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        files = {}
+        for i, (key, arr) in enumerate(arrays.items()):
+            if isinstance(arr, torch.Tensor):
+                arr = arr.detach().cpu().numpy()
+            files[key] = f"{i:04d}.npy"
+            np.save(os.path.join(tmp_dir, files[key]), np.ascontiguousarray(arr))
+        manifest = {'version': FORMAT_VERSION, 'arrays': files, 'meta': meta or {},
+                    'source': _signature(pt_path)}
+        with open(os.path.join(tmp_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if os.path.exists(out_dir):
+            os.replace(out_dir, old_dir)
+        os.replace(tmp_dir, out_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+    except (OSError, TypeError, ValueError) as e:
+        # (Windows 에서 다른 프로세스가 매핑 중이면 교체 실패할 수 있음) -> .pt 만 사용
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        print(f"⚠️ mmap 아티팩트 저장 실패 ({out_dir}), .pt 파일만 사용합니다: {e}")
+
+def open_arrays(pt_path):
+    """(배열 dict, meta) 반환. mmap 디렉터리가 없거나 .pt 보다 오래되었으면 None"""
+    out_dir = mmap_dir(pt_path)
+    manifest_path = os.path.join(out_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') != FORMAT_VERSION:
+            return None
+        source = _signature(pt_path)
+        if source is not None and manifest.get('source') != source:
+            return None
+        arrays = {key: np.load(os.path.join(out_dir, name), mmap_mode='c')
+                  for key, name in manifest['arrays'].items()}
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️ mmap 아티팩트 열기 실패 ({out_dir}), .pt 로 대체합니다: {e}")
+        return None
+    return arrays, manifest['meta']
+
+def exists(pt_path):
+    return os.path.exists(pt_path) or os.path.exists(os.path.join(mmap_dir(pt_path), MANIFEST_FILE))
+
+# ==========================================
+# 🔖 그래프 출처 (파생 인덱스 재사용/저장 여부 판단용)
+# ------------------------------------------
+# load_graph 가 읽은 / save_graph 가 저장한 객체만 "디스크 그래프 파일 그대로"로 기록합니다.
+# 기간 스냅샷, 국가 부분 그래프, prefix 처럼 새로 만든 HeteroData 는 기록이 없고,
+# 읽은 뒤 파일이 다시 쓰인 이전 그래프(query_service 재로드 중)는 서명이 달라 None 입니다.
+# -> graph_index / brand_counts / country_index 는 이런 그래프의 결과를 저장 파일에 덮어쓰지 않습니다.
+# ==========================================
+_SOURCES = {}   # id(data) -> (weakref, 파일 서명)
+_SOURCES_LOCK = threading.Lock()
+
+def file_signature(pt_path):
+    """그래프 파일 경로 + .pt / mmap manifest 의 크기·수정시각"""
+    pt_path = os.path.abspath(pt_path)
+    return {'path': pt_path, 'pt': _signature(pt_path),
+            'mmap': _signature(os.path.join(mmap_dir(pt_path), MANIFEST_FILE))}
+
+def _register_source(data, pt_path):
+    with _SOURCES_LOCK:
+        for key in [k for k, (ref, _) in _SOURCES.items() if ref() is None]:
+            del _SOURCES[key]
+        _SOURCES[id(data)] = (weakref.ref(data), file_signature(pt_path))
+
+def source_of(data):
+    """data 가 디스크 그래프 파일 그대로이면 그 파일 서명, 아니면 None"""
+    with _SOURCES_LOCK:
+        entry = _SOURCES.get(id(data))
+    if entry is None or entry[0]() is not data:
+        return None
+    signature = entry[1]
+    return signature if file_signature(signature['path']) == signature else None
+
+# ==========================================
+# 🕸️ 그래프 (HeteroData: num_nodes + edge_index (+ edge_time), 부분 그래프는 n_id 포함)
+# ==========================================
+def save_graph(data, path=GRAPH_PATH):
+    torch.save(data, path)
+    arrays = {}
+    meta = {'num_nodes': {nt: int(data[nt].num_nodes) for nt in data.node_types},
+            'edge_types': [list(et) for et in data.edge_types]}
+    for et in data.edge_types:
+        arrays['/'.join(et)] = data[et].edge_index
+        if 'edge_time' in data[et]:
+            arrays['edge_time/' + '/'.join(et)] = data[et].edge_time
+    for nt in data.node_types:
+        if 'n_id' in data[nt]:
+            arrays[f'n_id/{nt}'] = data[nt].n_id
+    save_arrays(path, arrays, meta)
+    _register_source(data, path)
+
+def load_graph(path=GRAPH_PATH):
+    opened = open_arrays(path)
+    if opened is None:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"❌ 그래프 데이터가 없습니다: {path} (graph_generator.py를 먼저 실행하세요)")
+        data = _torch_load(path)
+        _register_source(data, path)
+        return data
+
+    from torch_geometric.data import HeteroData
+    arrays, meta = opened
+    data = HeteroData()
+    for nt, n in meta['num_nodes'].items():
+        data[nt].num_nodes = n
+    for et in meta['edge_types']:
+        data[tuple(et)].edge_index = torch.from_numpy(arrays['/'.join(et)])
+        if 'edge_time/' + '/'.join(et) in arrays:
+            data[tuple(et)].edge_time = torch.from_numpy(arrays['edge_time/' + '/'.join(et)])
+    for nt in meta['num_nodes']:
+        if f'n_id/{nt}' in arrays:
+            data[nt].n_id = torch.from_numpy(arrays[f'n_id/{nt}'])
+    _register_source(data, path)
+    return data
+
+# ==========================================
+# 🧬 임베딩 ({노드 타입: [N, dim] 텐서})
+# ==========================================
+def save_embeddings(embeddings, path=EMBEDDING_PATH):
+    torch.save(embeddings, path)
+    save_arrays(path, dict(embeddings))
+
+def load_embeddings(path=EMBEDDING_PATH):
+    opened = open_arrays(path)
+    if opened is None:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"❌ 임베딩 파일이 없습니다: {path}")
+        return _torch_load(path)
+    arrays, _ = opened
+    return {nt: torch.from_numpy(arr) for nt, arr in arrays.items()}
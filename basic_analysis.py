@@ -1,13 +1,13 @@
 import pandas as pd
 import os
-import re
 import sys
 from collections import defaultdict
 from io import StringIO
-import matplotlib.pyplot as plt
-from matplotlib import font_manager, rc
-import seaborn as sns
-import platform
+import argparse
+import data_ingest
+import plot_utils
+import cleaning
+import frame_schema
 
 # --- 설정 ---
 DATA_DIR = './data/'
@@ -26,38 +26,20 @@ NICE_CLASS_DESC = {
     '45': '법률/보안', '기타': '기타'
 }
 
-# --- 시각화 설정 (한글 폰트 강력 적용) ---
-def set_korean_font():
-    """
-    운영체제별 폰트 파일 경로를 직접 지정하여 한글 깨짐을 방지합니다.
-    """
-    system_name = platform.system()
-    
-    if system_name == 'Windows':
-        # 윈도우: 맑은 고딕 파일 경로 직접 지정
-        font_path = "C:/Windows/Fonts/malgun.ttf"
-        if os.path.exists(font_path):
-            font_name = font_manager.FontProperties(fname=font_path).get_name()
-            rc('font', family=font_name)
-        else:
-            plt.rc('font', family='Malgun Gothic') # 파일 없으면 시스템 이름 사용
-            
-    elif system_name == 'Darwin': # Mac
-        plt.rc('font', family='AppleGothic')
-        
-    else: # Linux
-        plt.rc('font', family='NanumGothic')
-    
-    plt.rc('axes', unicode_minus=False) # 마이너스 기호 깨짐 방지
-    sns.set(font_scale=1.1) 
-    # seaborn 스타일 설정 후 폰트 재적용 필요할 수 있음
-    sns.set_style("whitegrid")
-    
-    # Seaborn 설정 후 폰트가 초기화되는 경우가 있어 다시 적용
-    if system_name == 'Windows' and os.path.exists(font_path):
-        rc('font', family=font_name)
-    elif system_name == 'Darwin':
-        rc('font', family='AppleGothic')
+# --- 시각화 설정 ---
+# matplotlib/seaborn 은 그림을 그릴 때만 임포트합니다. (폰트 경로/등록은 plot_utils 캐시를 공유)
+_seaborn_ready = False
+
+def _plotting():
+    """(plt, sns) - 처음 한 번만 seaborn 스타일 적용 (스타일 적용이 폰트를 초기화하므로 폰트를 함께 지정)"""
+    global _seaborn_ready
+    plt = plot_utils.pyplot()
+    import seaborn as sns
+    if not _seaborn_ready:
+        sns.set_theme(style="whitegrid", font=plot_utils.font_name(), font_scale=1.1,
+                      rc={'axes.unicode_minus': False})
+        _seaborn_ready = True
+    return plt, sns
 
 # pandas 설정
 pd.set_option('display.max_rows', None)
@@ -66,7 +48,7 @@ pd.set_option('display.width', 1000)
 pd.set_option('display.colheader_justify', 'left')
 pd.set_option('display.precision', 2)
 
-def load_all_data(data_dir):
+def load_all_data(data_dir, workers=None):
     all_dfs = []
     if not os.path.exists(data_dir):
         print(f"경로 없음: {data_dir}")
@@ -76,17 +58,19 @@ def load_all_data(data_dir):
     country_map = {f: f.split('_')[0].replace('DATA.xlsx', '').replace('.xlsx', '') for f in file_list}
 
     print("### 1. 데이터 로드 및 통합 시작 ###")
-    for file_name in file_list:
-        file_path = os.path.join(data_dir, file_name)
+    file_paths = [os.path.join(data_dir, f) for f in file_list]
+    frames = data_ingest.load_workbooks(file_paths, workers=workers)
+    
+    for file_name, file_path in zip(file_list, file_paths):
         country_name = country_map.get(file_name, 'Unknown')
         
-        try:
-            df = pd.read_excel(file_path)
-            df['국가'] = country_name
-            all_dfs.append(df)
-            print(f"-> 로드 완료: {file_name} (총 {len(df)} 행)")
-        except Exception as e:
-            print(f"-> 오류 발생: {file_name} 로드 실패 - {e}")
+        if file_path not in frames:
+            print(f"-> 오류 발생: {file_name} 로드 실패")
+            continue
+        df = frames[file_path]
+        df['국가'] = country_name
+        all_dfs.append(df)
+        print(f"-> 로드 완료: {file_name} (총 {len(df)} 행)")
 
     if all_dfs:
         combined_df = pd.concat(all_dfs, ignore_index=True)
@@ -103,44 +87,49 @@ def preprocess_data(df):
     df['출원일자'] = pd.to_datetime(df['출원일자'], errors='coerce')
     print(f"-> '출원일자' 컬럼을 datetime 형식으로 변환 완료. (변환 불가한 값: {df['출원일자'].isna().sum()}개)")
     
-    df['주요_류'] = df['류'].astype(str).apply(lambda x: x.split('//')[0].strip())
-    df['주요_류'] = df['주요_류'].str.extract(r'(\d+)').fillna('기타').astype(str)
+    df['주요_류'] = cleaning.main_class_series(df['류'])
     print("-> '류' 컬럼 정제하여 '주요_류' 컬럼 생성 완료.")
     
     # [수정] inplace=True 제거하여 Pandas FutureWarning 해결
     df['상표명칭'] = df['상표명칭'].fillna('(상표명칭 정보 없음)')
     print("-> '상표명칭' 컬럼 결측치 처리 완료.")
     
+    # 국가/류/유사군은 categorical, 문자열은 string[pyarrow] 로 압축
+    before = df.memory_usage(deep=True)
+    df = frame_schema.apply_schema(df, frame_schema.BASIC_SCHEMA)
+    frame_schema.memory_report(before, df)
+    
     return df
 
 
-def analyze_time_series(df):
+def analyze_time_series(df, plot=True):
     print("\n### 3. 시계열 트렌드 분석 ###")
     
     df_ts = df.dropna(subset=['출원일자']).copy()
     df_ts['출원연도'] = df_ts['출원일자'].dt.year
     
     df_ts = df_ts[(df_ts['출원연도'] >= 2000) & (df_ts['출원연도'] <= 2025)]
-    yearly_counts = df_ts.groupby(['출원연도', '국가']).size().reset_index(name='출원수')
+    yearly_counts = df_ts.groupby(['출원연도', '국가'], observed=True).size().reset_index(name='출원수')
     
     print("💡 국가별 출원 건수 Top 5 연도 (터미널 출력 생략)")
     
     # --- 시각화 ---
-    try:
-        set_korean_font() # 폰트 강제 적용
-        plt.figure(figsize=(12, 6))
-        sns.lineplot(data=yearly_counts, x='출원연도', y='출원수', hue='국가', marker='o', linewidth=2.5)
-        plt.title('국가별 연도별 상표 출원 추이 (2000~)', fontsize=16)
-        plt.xlabel('연도')
-        plt.ylabel('출원 건수')
-        plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        plt.savefig(os.path.join(OUTPUT_DIR, '1_time_series_trend.png'), dpi=150)
-        plt.close()
-        print(f"   [Graph Saved] 1_time_series_trend.png")
-    except Exception as e:
-        print(f"   [Graph Error] 시계열 그래프 실패: {e}")
+    if plot:
+        try:
+            plt, sns = _plotting()
+            plt.figure(figsize=(12, 6))
+            sns.lineplot(data=yearly_counts, x='출원연도', y='출원수', hue='국가', marker='o', linewidth=2.5)
+            plt.title('국가별 연도별 상표 출원 추이 (2000~)', fontsize=16)
+            plt.xlabel('연도')
+            plt.ylabel('출원 건수')
+            plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+            plt.grid(True, alpha=0.3)
+            plt.tight_layout()
+            plt.savefig(os.path.join(OUTPUT_DIR, '1_time_series_trend.png'), dpi=150)
+            plt.close()
+            print(f"   [Graph Saved] 1_time_series_trend.png")
+        except Exception as e:
+            print(f"   [Graph Error] 시계열 그래프 실패: {e}")
 
     # CAGR 계산 로직 유지
     max_year = yearly_counts['출원연도'].max()
@@ -160,36 +149,38 @@ def analyze_time_series(df):
     print(f"\n💡 최근 5년 CAGR ({start_year}년 대비 {max_year}년):\n", pd.DataFrame(cagr_results))
 
 
-def analyze_category(df):
+def analyze_category(df, plot=True):
     print("\n### 4. 산업 및 분류 분석 (주요_류 기준) ###")
     
-    country_class_counts = df.groupby('국가')['주요_류'].value_counts(normalize=True).mul(100).rename('비중(%)').reset_index()
+    country_class_counts = df.groupby('국가', observed=True)['주요_류'].value_counts(normalize=True).mul(100).rename('비중(%)').reset_index()
+    country_class_counts = country_class_counts[country_class_counts['비중(%)'] > 0]   # categorical 의 미출현 류 제외
     country_class_counts['류_설명'] = country_class_counts['주요_류'].astype(str).map(NICE_CLASS_DESC).fillna('기타')
-    top_classes = country_class_counts.groupby('국가').head(5).sort_values(by=['국가', '비중(%)'], ascending=[True, False])
+    top_classes = country_class_counts.groupby('국가', observed=True).head(5).sort_values(by=['국가', '비중(%)'], ascending=[True, False])
 
     print("💡 국가별 상위 5개 주요_류 비중 (터미널 출력 생략)")
     
     # --- 시각화 ---
-    try:
-        set_korean_font()
-        plt.figure(figsize=(14, 8))
-        top_classes['Label'] = top_classes['주요_류'] + '. ' + top_classes['류_설명']
+    if plot:
+        try:
+            plt, sns = _plotting()
+            plt.figure(figsize=(14, 8))
+            top_classes['Label'] = top_classes['주요_류'].astype(str) + '. ' + top_classes['류_설명']
         
-        # [수정] hue를 명시하여 Seaborn 경고 해결
-        sns.barplot(data=top_classes, x='비중(%)', y='국가', hue='Label', palette='viridis')
+            # [수정] hue를 명시하여 Seaborn 경고 해결
+            sns.barplot(data=top_classes, x='비중(%)', y='국가', hue='Label', palette='viridis')
         
-        plt.title('국가별 Top 5 주요 류(산업) 비중 비교', fontsize=16)
-        plt.xlabel('비중 (%)')
-        plt.legend(title='주요 류 (NICE Class)', bbox_to_anchor=(1.05, 1), loc='upper left')
-        plt.tight_layout()
-        plt.savefig(os.path.join(OUTPUT_DIR, '2_category_top5.png'), dpi=150)
-        plt.close()
-        print(f"   [Graph Saved] 2_category_top5.png")
-    except Exception as e:
-        print(f"   [Graph Error] 카테고리 그래프 실패: {e}")
+            plt.title('국가별 Top 5 주요 류(산업) 비중 비교', fontsize=16)
+            plt.xlabel('비중 (%)')
+            plt.legend(title='주요 류 (NICE Class)', bbox_to_anchor=(1.05, 1), loc='upper left')
+            plt.tight_layout()
+            plt.savefig(os.path.join(OUTPUT_DIR, '2_category_top5.png'), dpi=150)
+            plt.close()
+            print(f"   [Graph Saved] 2_category_top5.png")
+        except Exception as e:
+            print(f"   [Graph Error] 카테고리 그래프 실패: {e}")
 
 
-def analyze_comparison(df):
+def analyze_comparison(df, plot=True):
     print("\n### 5. 글로벌 비교 분석 ###")
     
     diversity_data = []
@@ -204,70 +195,74 @@ def analyze_comparison(df):
     diversity_df = pd.DataFrame(diversity_data).sort_values(by='고유_류_개수', ascending=False)
     print("💡 국가별 포트폴리오 다양성:\n", diversity_df)
     
-    df['지정상품_개수'] = df['지정상품'].astype(str).apply(lambda x: len(re.split(r'//|,|\n', x)))
-    avg_goods = df.groupby('국가')['지정상품_개수'].mean().sort_values(ascending=False).reset_index(name='평균_지정상품_수')
+    df['지정상품_개수'] = frame_schema.compact_int(cleaning.goods_count_series(df['지정상품']))
+    avg_goods = df.groupby('국가', observed=True)['지정상품_개수'].mean().sort_values(ascending=False).reset_index(name='평균_지정상품_수')
     
     # --- 시각화 ---
-    try:
-        set_korean_font()
-        fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+    if plot:
+        try:
+            plt, sns = _plotting()
+            fig, axes = plt.subplots(1, 2, figsize=(14, 6))
         
-        # [수정] hue=country, legend=False 추가하여 Seaborn 경고 해결
-        sns.barplot(data=diversity_df, x='국가', y='고유_류_개수', ax=axes[0], hue='국가', palette='Blues_d', legend=False)
-        axes[0].set_title('국가별 포트폴리오 다양성 (출원된 류의 종류 수)')
-        axes[0].set_ylabel('고유 류 개수')
+            # [수정] hue=country, legend=False 추가하여 Seaborn 경고 해결
+            sns.barplot(data=diversity_df, x='국가', y='고유_류_개수', ax=axes[0], hue='국가', palette='Blues_d', legend=False)
+            axes[0].set_title('국가별 포트폴리오 다양성 (출원된 류의 종류 수)')
+            axes[0].set_ylabel('고유 류 개수')
         
-        # [수정] hue=country, legend=False 추가
-        sns.barplot(data=avg_goods, x='국가', y='평균_지정상품_수', ax=axes[1], hue='국가', palette='Greens_d', legend=False)
-        axes[1].set_title('출원 1건당 평균 지정상품 개수')
-        axes[1].set_ylabel('개수')
+            # [수정] hue=country, legend=False 추가
+            sns.barplot(data=avg_goods, x='국가', y='평균_지정상품_수', ax=axes[1], hue='국가', palette='Greens_d', legend=False)
+            axes[1].set_title('출원 1건당 평균 지정상품 개수')
+            axes[1].set_ylabel('개수')
         
-        plt.tight_layout()
-        plt.savefig(os.path.join(OUTPUT_DIR, '3_comparison_diversity_goods.png'), dpi=150)
-        plt.close()
-        print(f"   [Graph Saved] 3_comparison_diversity_goods.png")
-    except Exception as e:
-        print(f"   [Graph Error] 비교 분석 그래프 실패: {e}")
+            plt.tight_layout()
+            plt.savefig(os.path.join(OUTPUT_DIR, '3_comparison_diversity_goods.png'), dpi=150)
+            plt.close()
+            print(f"   [Graph Saved] 3_comparison_diversity_goods.png")
+        except Exception as e:
+            print(f"   [Graph Error] 비교 분석 그래프 실패: {e}")
 
 
-def analyze_text(df):
+def analyze_text(df, plot=True):
     print("\n### 6. 텍스트 마이닝 (Text Mining & NLP) ###")
     
-    df['상표명_길이'] = df['상표명칭'].astype(str).apply(lambda x: len(re.sub(r'\s|\(|\)', '', x)))
-    length_summary = df.groupby('국가')['상표명_길이'].agg(['mean', 'median', 'min', 'max']).sort_values(by='mean', ascending=False)
+    df['상표명_길이'] = frame_schema.compact_int(cleaning.name_length_series(df['상표명칭']))
+    length_summary = df.groupby('국가', observed=True)['상표명_길이'].agg(['mean', 'median', 'min', 'max']).sort_values(by='mean', ascending=False)
     print("💡 국가별 상표명 길이 요약 통계:\n", length_summary)
 
     # --- 시각화 ---
-    try:
-        set_korean_font()
-        plt.figure(figsize=(10, 6))
+    if plot:
+        try:
+            plt, sns = _plotting()
+            plt.figure(figsize=(10, 6))
         
-        q95 = df['상표명_길이'].quantile(0.95)
-        filtered_df = df[df['상표명_길이'] <= q95]
+            q95 = df['상표명_길이'].quantile(0.95)
+            filtered_df = df[df['상표명_길이'] <= q95]
         
-        # [수정] hue=country, legend=False 추가
-        sns.boxplot(data=filtered_df, x='국가', y='상표명_길이', hue='국가', palette='Set2', legend=False)
+            # [수정] hue=country, legend=False 추가
+            sns.boxplot(data=filtered_df, x='국가', y='상표명_길이', hue='국가', palette='Set2', legend=False)
         
-        plt.title('국가별 상표명 길이 분포 (Outlier 일부 제외)', fontsize=16)
-        plt.ylabel('글자 수 (공백제외)')
-        plt.grid(True, axis='y', alpha=0.3)
-        plt.tight_layout()
-        plt.savefig(os.path.join(OUTPUT_DIR, '4_text_name_length_dist.png'), dpi=150)
-        plt.close()
-        print(f"   [Graph Saved] 4_text_name_length_dist.png")
-    except Exception as e:
-        print(f"   [Graph Error] 텍스트 분석 그래프 실패: {e}")
+            plt.title('국가별 상표명 길이 분포 (Outlier 일부 제외)', fontsize=16)
+            plt.ylabel('글자 수 (공백제외)')
+            plt.grid(True, axis='y', alpha=0.3)
+            plt.tight_layout()
+            plt.savefig(os.path.join(OUTPUT_DIR, '4_text_name_length_dist.png'), dpi=150)
+            plt.close()
+            print(f"   [Graph Saved] 4_text_name_length_dist.png")
+        except Exception as e:
+            print(f"   [Graph Error] 텍스트 분석 그래프 실패: {e}")
     
     print("\n(키워드 분석 텍스트 출력은 로그 파일 확인 요망)")
 
 
 # --- 메인 실행 함수 ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="국가별 상표 기초 분석")
+    parser.add_argument('--no-plot', action='store_true', help="텍스트 결과만 저장 (matplotlib/seaborn 을 로드하지 않음)")
+    args = parser.parse_args()
+    plot = not args.no_plot
     
     if not os.path.exists(OUTPUT_DIR):
         os.makedirs(OUTPUT_DIR)
-    
-    set_korean_font() # 시작 전 폰트 설정
 
     original_stdout = sys.stdout
     string_buffer = StringIO()
@@ -279,10 +274,10 @@ if __name__ == "__main__":
         if not all_data.empty:
             processed_data = preprocess_data(all_data)
 
-            analyze_time_series(processed_data)
-            analyze_category(processed_data)
-            analyze_comparison(processed_data)
-            analyze_text(processed_data)
+            analyze_time_series(processed_data, plot)
+            analyze_category(processed_data, plot)
+            analyze_comparison(processed_data, plot)
+            analyze_text(processed_data, plot)
             
             print("\n--- 분석 및 시각화 완료 ---")
 
@@ -297,4 +292,5 @@ if __name__ == "__main__":
         sys.stdout = original_stdout
         
         print(f"\n✅ 분석 결과 텍스트가 '{LOG_FILE}'에 저장되었습니다.")
-        print(f"✅ 시각화 도표들이 '{os.path.abspath(OUTPUT_DIR)}' 폴더에 저장되었습니다.")
\ No newline at end of file
+        if plot:
+            print(f"✅ 시각화 도표들이 '{os.path.abspath(OUTPUT_DIR)}' 폴더에 저장되었습니다.")
\ No newline at end of file
@@ -0,0 +1,139 @@
+import os
+import time
+import argparse
+import numpy as np
+import torch
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import node_vocab
+import artifact_store
+import brand_counts
+import country_index
+from graph_index import gather_ranges
+
+# ==========================================
+# 📦 전체 브랜드 신사업(류) 추천 일괄 생성 (야간 배치용)
+# ------------------------------------------
+# predict_expansion / analyze_ai_recommendations 는 브랜드 1개씩 class_embs @ comp_emb 를 계산합니다.
+# 여기서는 브랜드 임베딩을 chunk 단위로 잘라 (chunk x dim) @ (dim x 류 수) 한 번에 점수를 내고,
+# 이미 출원한 류는 brand_counts(브랜드 x 류 희소 CSR)로 마스킹한 뒤 배치 topk 를 취합니다.
+# 결과는 chunk 마다 Parquet 로 바로 써서 메모리는 chunk 크기만큼만 사용합니다.
+#   python batch_recommend.py                 # 한국 브랜드 전체
+#   python batch_recommend.py --all --top-k 10
+#   python batch_recommend.py --slice 한국     # 국가별 부분 그래프 + 그 그래프로 학습한 임베딩
+# 출력 컬럼: brand_id, brand, rank, class_id, class, score
+# ==========================================
+GRAPH_PATH = "./outputs/graph/graph_data.pt"
+ENCODER_PATH = "./outputs/graph/label_encoders.pt"
+EMBEDDING_PATH = "./outputs/graph/dgl_node_embeddings_v3.pt"
+OUTPUT_PATH = "./outputs/graph/gnn/recommendations.parquet"
+
+SCHEMA = pa.schema([
+    ('brand_id', pa.int64()),
+    ('brand', pa.string()),
+    ('rank', pa.int16()),
+    ('class_id', pa.int32()),
+    ('class', pa.string()),
+    ('score', pa.float32()),
+])
+
+def load_resources(graph_path=GRAPH_PATH, embedding_path=EMBEDDING_PATH):
+    """부분 그래프면 인코더를 n_id 로 맞춰 반환 (brand_id 는 부분 그래프 ID, brand/class 이름은 전체 그래프와 동일)"""
+    print("🔄 배치 추천 리소스 로드 중...")
+    if not os.path.exists(embedding_path):
+        raise FileNotFoundError(f"❌ 임베딩 파일이 없습니다: {embedding_path}")
+    data = artifact_store.load_graph(graph_path)
+    embeddings = artifact_store.load_embeddings(embedding_path)
+    encoders = country_index.slice_encoders(data, node_vocab.load_encoders(ENCODER_PATH))
+    return data, encoders, embeddings
+
+def country_brand_indices(data, encoders, country):
+    """국가에 상표를 가진 브랜드 ID (오름차순, 엑셀을 다시 읽지 않고 country_index 마스크로 조회)"""
+    index = country_index.of(data, encoders)
+    if country not in index.countries:
+        raise ValueError(f"❌ 그래프에 없는 국가입니다: {country} (가능: {', '.join(index.countries)})")
+    return index.brands(country)
+
+# ==========================================
+# 🧮 배치 점수 계산
+# ==========================================
+def mask_owned(scores, brand_class, brand_ids):
+    """scores[chunk, 류] 에서 각 브랜드가 이미 출원한 류를 -inf 로 (희소 행만 조회)"""
+    pos, counts = gather_ranges(brand_class.indptr, brand_ids)
+    rows = torch.repeat_interleave(torch.arange(len(brand_ids)), counts)
+    scores[rows, brand_class.indices[pos]] = float('-inf')
+    return scores
+
+def recommend_chunks(comp_embs, class_embs, brand_class, brand_ids, top_k=10, chunk_size=4096):
+    """
+    brand_ids 를 chunk_size 씩 나눠 (brand_ids, topk 류 ID, topk 점수) 를 순서대로 내보냅니다.
+    추천 가능한 류가 top_k 보다 적은 브랜드는 남는 칸의 점수가 -inf 입니다.
+    """
+    brand_ids = torch.as_tensor(brand_ids, dtype=torch.long)
+    k = min(top_k, class_embs.shape[0])
+    class_t = class_embs.t().contiguous()
+    for start in range(0, len(brand_ids), chunk_size):
+        ids = brand_ids[start:start + chunk_size]
+        scores = comp_embs.index_select(0, ids) @ class_t      # [chunk, 류 수]
+        mask_owned(scores, brand_class, ids)
+        top_scores, top_cls = torch.topk(scores, k, dim=1)
+        yield ids, top_cls, top_scores
+
+def write_recommendations(chunks, encoders, path=OUTPUT_PATH):
+    """chunk 단위로 Parquet row group 을 이어 씁니다. 반환: 기록한 행 수"""
+    comp_names = encoders['company_classes']
+    class_names = np.array(encoders['class_classes'].names, dtype=object)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    n_rows = 0
+    with pq.ParquetWriter(tmp, SCHEMA) as writer:
+        for ids, top_cls, top_scores in chunks:
+            valid = torch.isfinite(top_scores)
+            rows, ranks = valid.nonzero(as_tuple=True)
+            if len(rows) == 0: continue
+            brand_ids = ids[rows].numpy()
+            cls_ids = top_cls[rows, ranks].numpy()
+            table = pa.table({
+                'brand_id': brand_ids,
+                'brand': [comp_names[i] for i in brand_ids],
+                'rank': (ranks + 1).numpy().astype(np.int16),
+                'class_id': cls_ids.astype(np.int32),
+                'class': class_names[cls_ids],
+                'score': top_scores[rows, ranks].numpy().astype(np.float32),
+            }, schema=SCHEMA)
+            writer.write_table(table)
+            n_rows += table.num_rows
+    os.replace(tmp, path)
+    return n_rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="전체 브랜드 x 류 추천 일괄 생성 (Parquet)")
+    parser.add_argument('--all', action='store_true', help="국가 구분 없이 모든 브랜드")
+    parser.add_argument('--country', default='한국', help="대상 국가 (기본: 한국)")
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--chunk-size', type=int, default=4096, help="한 번에 점수를 계산할 브랜드 수 (메모리 상한)")
+    parser.add_argument('--output', default=OUTPUT_PATH)
+    parser.add_argument('--slice', nargs='+', metavar='COUNTRY', default=None,
+                        help="국가별 부분 그래프로 추천 (graph_generator.py --slice, gnn_training_v3_shortcut.py --country 로 생성)")
+    args = parser.parse_args()
+
+    graph_path, embedding_path = GRAPH_PATH, EMBEDDING_PATH
+    if args.slice:
+        out_dir = country_index.slice_dir(args.slice)
+        graph_path = os.path.join(out_dir, os.path.basename(GRAPH_PATH))
+        embedding_path = os.path.join(out_dir, os.path.basename(EMBEDDING_PATH))
+    data, encoders, embeddings = load_resources(graph_path, embedding_path)
+    brand_class = brand_counts.of(data)['class']
+
+    if args.all:
+        brand_ids = torch.arange(len(encoders['company_classes']))
+    else:
+        brand_ids = country_brand_indices(data, encoders, args.country)
+    print(f"🏢 대상 브랜드: {len(brand_ids):,}개, 류 {embeddings['class'].shape[0]}개, Top-{args.top_k}")
+
+    t0 = time.perf_counter()
+    chunks = recommend_chunks(embeddings['company'], embeddings['class'], brand_class,
+                              brand_ids, args.top_k, args.chunk_size)
+    n_rows = write_recommendations(chunks, encoders, args.output)
+    print(f"✅ 추천 {n_rows:,}행 저장 완료: {args.output} ({time.perf_counter() - t0:.2f}s)")
@@ -0,0 +1,48 @@
+import time
+import argparse
+import numpy as np
+import torch
+
+import ann_index
+import artifact_store
+
+# ==========================================
+# 🧪 ANN 인덱스 recall / 지연시간 측정
+# ------------------------------------------
+# exact_topk(블록 행렬곱 정확 검색)을 정답으로 두고 nprobe 별 recall@k 와 쿼리당 시간을 비교합니다.
+#   python bench_ann.py --queries 1000 --k 10
+# ==========================================
+EMBEDDING_PATH = "./outputs/graph/dgl_node_embeddings_v3.pt"
+
+def recall_at_k(approx_ids, exact_ids):
+    hits = sum(len(set(a[a >= 0]) & set(e)) for a, e in zip(approx_ids, exact_ids))
+    return hits / exact_ids.size
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ANN 인덱스 recall/지연시간 측정")
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--nlist', type=int, default=None)
+    args = parser.parse_args()
+
+    embs = artifact_store.load_embeddings(EMBEDDING_PATH)['company'].numpy()
+    t0 = time.perf_counter()
+    index = ann_index.IVFIndex.build(embs, nlist=args.nlist)
+    print(f"🔎 IVF 생성: {len(embs):,}개 브랜드, nlist={index.nlist} ({time.perf_counter() - t0:.2f}s)")
+
+    rng = np.random.default_rng(0)
+    q_ids = rng.choice(len(embs), min(args.queries, len(embs)), replace=False)
+    queries = embs[q_ids]
+
+    t0 = time.perf_counter()
+    exact_ids, _ = index.exact(queries, args.k, exclude=q_ids)
+    t_exact = (time.perf_counter() - t0) / len(q_ids) * 1000
+    print(f"{'nprobe':>8}{'recall@' + str(args.k):>12}{'ms/query':>10}")
+    print(f"{'exact':>8}{1.0:>12.3f}{t_exact:>10.3f}")
+
+    for nprobe in [1, 2, 4, 8, 16, 32, 64]:
+        if nprobe > index.nlist: break
+        t0 = time.perf_counter()
+        ids, _ = index._search_batch(ann_index.normalize(queries), args.k, nprobe, q_ids)
+        t_q = (time.perf_counter() - t0) / len(q_ids) * 1000
+        print(f"{nprobe:>8}{recall_at_k(ids, exact_ids):>12.3f}{t_q:>10.3f}")
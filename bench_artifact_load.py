@@ -0,0 +1,46 @@
+import time
+import torch
+from torch_geometric.data import HeteroData  # noqa: F401 (임포트 시간 제외)
+
+import node_vocab
+import artifact_store
+
+# ==========================================
+# 🧪 아티팩트 로드 시간 비교 (.pt pickle vs .mmap)
+# ------------------------------------------
+# graph_generator.py / gnn_training_v3_shortcut.py 를 한 번 실행해
+# .pt 와 .mmap/ 이 함께 있는 상태에서 실행합니다.
+#   python bench_artifact_load.py
+# ==========================================
+GRAPH_PATH = "./outputs/graph/graph_data.pt"
+ENCODER_PATH = "./outputs/graph/label_encoders.pt"
+EMBEDDING_PATH = "./outputs/graph/dgl_node_embeddings_v3.pt"
+
+def _pickle_load(path):
+    try:
+        return torch.load(path, map_location='cpu', weights_only=False)
+    except TypeError:
+        return torch.load(path, map_location='cpu')
+
+def _timed(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+if __name__ == "__main__":
+    cases = [
+        ("graph_data", GRAPH_PATH, artifact_store.load_graph),
+        ("label_encoders", ENCODER_PATH, lambda p: node_vocab.load_encoders(p)['company_classes'][0]),
+        ("embeddings", EMBEDDING_PATH, artifact_store.load_embeddings),
+    ]
+    print(f"{'아티팩트':<16}{'.pt (s)':>10}{'.mmap (s)':>11}")
+    for name, path, mmap_loader in cases:
+        if artifact_store.open_arrays(path) is None:
+            print(f"{name:<16}  ⚠️ .mmap 없음 (생성 스크립트를 다시 실행하세요)")
+            continue
+        t_pt = _timed(lambda: _pickle_load(path))
+        t_mmap = _timed(lambda: mmap_loader(path))
+        print(f"{name:<16}{t_pt:>10.3f}{t_mmap:>11.4f}")
@@ -0,0 +1,81 @@
+import re
+import time
+import random
+import argparse
+import numpy as np
+import pandas as pd
+
+import cleaning
+from graph_generator import clean_class_column, clean_group_column
+from market_trend_analyzer import clean_date, clean_class
+
+# ==========================================
+# ⏱️ 정제 파이프라인 벤치마크
+# ------------------------------------------
+# 기존 행 단위 .apply 와 cleaning 벡터화 구현의 소요 시간 비교
+# (Golden / 결과 동일성 검증은 tests/test_cleaning.py -> python -m pytest tests)
+#   python bench_cleaning.py --rows 1200000
+# ==========================================
+
+def make_sample(n, seed=42):
+    rng = random.Random(seed)
+    classes = [9, '35', ' 3 // 5', 'class 25', None, '기타', 9.0, '42//09', '제 30 류']
+    groups = ['G0901 | S0101', 'g0901,G3901', None, '  ', 's1234', 'G4503\nG4504', 'S2027, S2036 |G1001']
+    dates = ['2019-01-02', '20200315', '2021.05.05', None, 'bad', '2018/11/30']
+    goods = ['a//b,c', 'x\ny', None, 'z', '가방, 지갑//벨트']
+    names = ['SAMSUNG', 'ABC 상표', '(주)하나', None, 'X_Y (Z)']
+    return pd.DataFrame({
+        '류': [rng.choice(classes) for _ in range(n)],
+        '유사군': [rng.choice(groups) for _ in range(n)],
+        '출원일자': [rng.choice(dates) for _ in range(n)],
+        '지정상품': [rng.choice(goods) for _ in range(n)],
+        '상표명칭': [rng.choice(names) for _ in range(n)],
+    })
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+def legacy_groups(col):
+    lists = col.apply(clean_group_column)
+    return lists.explode()
+
+def run_benchmark(df):
+    cases = [
+        ("류 (graph_generator)",
+         lambda: df['류'].apply(clean_class_column),
+         lambda: cleaning.clean_class_series(df['류'])),
+        ("유사군 분리+explode",
+         lambda: legacy_groups(df['유사군']),
+         lambda: cleaning.split_group_series(df['유사군'])),
+        ("류 정수 (market_trend)",
+         lambda: df['류'].apply(clean_class).astype(np.int64),
+         lambda: cleaning.clean_class_numeric(df['류'])),
+        ("출원일자",
+         lambda: df['출원일자'].apply(clean_date),
+         lambda: cleaning.clean_date_series(df['출원일자'])),
+        ("주요_류 (basic)",
+         lambda: df['류'].astype(str).apply(lambda x: x.split('//')[0].strip()).str.extract(r'(\d+)', expand=False).fillna('기타').astype(str),
+         lambda: cleaning.main_class_series(df['류'])),
+        ("지정상품_개수",
+         lambda: df['지정상품'].astype(str).apply(lambda x: len(re.split(r'//|,|\n', x))),
+         lambda: cleaning.goods_count_series(df['지정상품'])),
+        ("상표명_길이",
+         lambda: df['상표명칭'].astype(str).apply(lambda x: len(re.sub(r'\s|\(|\)', '', x))),
+         lambda: cleaning.name_length_series(df['상표명칭'])),
+    ]
+
+    print(f"\n⏱️ 벤치마크 ({len(df):,}행)")
+    print(f"{'항목':<24}{'apply(s)':>10}{'vector(s)':>11}{'배속':>8}")
+    for name, legacy_fn, vector_fn in cases:
+        _, t_old = _timed(legacy_fn)
+        _, t_new = _timed(vector_fn)
+        print(f"{name:<24}{t_old:>10.3f}{t_new:>11.3f}{t_old / max(t_new, 1e-9):>7.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="정제 파이프라인 벤치마크 (apply vs 벡터화)")
+    parser.add_argument('--rows', type=int, default=200_000)
+    args = parser.parse_args()
+
+    run_benchmark(make_sample(args.rows))
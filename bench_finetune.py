@@ -0,0 +1,101 @@
+import os
+import time
+import argparse
+import tempfile
+import torch
+import dgl
+from sklearn.metrics import roc_auc_score
+
+import artifact_store
+import graph_snapshot
+import gnn_training_v3_shortcut as training
+from negative_sampling import NegativeSampler, score_edges
+
+# ==========================================
+# 🧪 Warm-start fine-tune vs 전체 재학습
+# ------------------------------------------
+# 현재 그래프의 마지막 --new-fraction 만큼의 상표를 "이번 주 신규 출원"으로 보고
+#   1. 이전 그래프(graph_snapshot.prefix)로 전체 학습 -> 이전 모델
+#   2. 현재 그래프에서 이전 모델로 fine-tune (변경된 브랜드의 타겟 엣지만, 임베딩만, 몇 epoch)
+#   3. 현재 그래프 전체 재학습
+# 평가는 표본 밖(out-of-sample): 이전 그래프에 없던 새 (브랜드 -> 류) 엣지 중 --holdout 비율을
+# 2/3 의 학습 그래프에서 빼 두고 (학습 타겟 + 메시지 전달 모두 제외), 그 엣지 + 같은 브랜드의 음성 샘플로 AUC 를 냅니다.
+# (새 상표 -> 류 엣지는 남아 있으므로 브랜드 -> 상표 -> 류 2-hop 경로는 모델이 볼 수 있음)
+# 2와 3의 학습 시간과 AUC 를 비교합니다. (AUC drift = 2 - 3) 모델 파일은 임시 폴더에만 저장합니다.
+#   python bench_finetune.py --new-fraction 0.05 --holdout 0.2 --epochs 100 --finetune-epochs 5
+# ==========================================
+GRAPH_PATH = "./outputs/graph/graph_data.pt"
+
+def new_target_edges(g_new, g_old):
+    """현재 그래프 타겟 엣지 중 이전 그래프에 없던 (브랜드, 류) 쌍의 엣지 ID"""
+    n_class = g_new.num_nodes('class')
+    src, dst = g_new.edges(etype=training.TARGET_ETYPE)
+    old_src, old_dst = g_old.edges(etype=training.TARGET_ETYPE)
+    return torch.nonzero(~torch.isin(src * n_class + dst, old_src * n_class + old_dst)).flatten()
+
+def link_auc(h, pos_src, pos_dst, neg_src, neg_dst):
+    pos = score_edges(h['company'], h['class'], pos_src, pos_dst)
+    neg = score_edges(h['company'], h['class'], neg_src, neg_dst)
+    labels = torch.cat([torch.ones_like(pos), torch.zeros_like(neg)])
+    return roc_auc_score(labels.numpy(), torch.cat([pos, neg]).sigmoid().numpy())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm-start fine-tune 과 전체 재학습 비교")
+    parser.add_argument('--new-fraction', type=float, default=0.05, help="신규 출원으로 볼 상표 비율 (ID 뒤쪽)")
+    parser.add_argument('--holdout', type=float, default=0.2, help="평가용으로 학습에서 뺄 새 (브랜드 -> 류) 엣지 비율")
+    parser.add_argument('--epochs', type=int, default=training.EPOCHS, help="전체 학습 epoch")
+    parser.add_argument('--finetune-epochs', type=int, default=training.FINETUNE_EPOCHS)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    data = artifact_store.load_graph(GRAPH_PATH)
+    n_tm = data['trademark'].num_nodes
+    cutoff = int(n_tm * (1 - args.new_fraction))
+    g_old = training.load_and_modify_graph(data=graph_snapshot.prefix(data, cutoff))
+    g_new = training.load_and_modify_graph(data=data)
+    print(f"\n📦 이전 그래프 상표 {cutoff:,}개 -> 현재 {n_tm:,}개 (+{n_tm - cutoff:,})")
+
+    # 새 엣지 일부를 평가용으로 떼어 내고 나머지 그래프로 fine-tune / 재학습
+    new_eids = new_target_edges(g_new, g_old)
+    torch.manual_seed(args.seed)
+    holdout = new_eids[torch.randperm(len(new_eids))[:int(len(new_eids) * args.holdout)]]
+    if len(holdout) == 0:
+        raise ValueError("❌ 평가할 새 엣지가 없습니다. --new-fraction / --holdout 을 늘리세요.")
+    all_src, all_dst = g_new.edges(etype=training.TARGET_ETYPE)
+    pos_src, pos_dst = all_src[holdout], all_dst[holdout]
+    g_train = dgl.remove_edges(g_new, holdout, etype=training.TARGET_ETYPE)
+    print(f"🧪 새 (브랜드 -> 류) 엣지 {len(new_eids):,}개 중 {len(holdout):,}개를 평가용으로 제외")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, "model.pth")
+        torch.manual_seed(args.seed)
+        model_old, _ = training.train_full_graph(g_old, device, args.epochs)
+        torch.save(model_old.state_dict(), model_path)
+
+        torch.manual_seed(args.seed)
+        t0 = time.perf_counter()
+        _, h_ft = training.finetune(g_train, device, model_path, args.finetune_epochs)
+        t_ft = time.perf_counter() - t0
+
+    torch.manual_seed(args.seed)
+    t0 = time.perf_counter()
+    _, h_full = training.train_full_graph(g_train, device, args.epochs)
+    t_full = time.perf_counter() - t0
+
+    # 평가: 떼어 낸 엣지(양성) + 같은 브랜드의 음성 (현재 그래프의 모든 양성은 음성에서 제외)
+    neg_sampler = NegativeSampler(all_src, all_dst, g_new.num_nodes('company'), g_new.num_nodes('class'))
+    torch.manual_seed(args.seed)
+    neg_src, neg_dst = pos_src, torch.randint(0, g_new.num_nodes('class'), (len(holdout),))
+    keep = ~neg_sampler.is_positive(neg_src, neg_dst)
+    neg_src, neg_dst = neg_src[keep], neg_dst[keep]
+    old_sizes = {nt: g_old.num_nodes(nt) for nt in g_old.ntypes}
+    seed_eids, n_changed = training.changed_seed_edges(g_train, old_sizes)
+
+    print(f"\n{'방식':<12}{'시간 s':>10}{'AUC 홀드아웃':>14}")
+    rows = {}
+    for name, h, t in [('finetune', h_ft, t_ft), ('full', h_full, t_full)]:
+        rows[name] = link_auc(h, pos_src, pos_dst, neg_src, neg_dst)
+        print(f"{name:<12}{t:>10.1f}{rows[name]:>14.4f}")
+    print(f"\n⚡ 시간 {t_ft / t_full:.0%} (변경 브랜드 {n_changed:,}개, 타겟 엣지 {len(seed_eids):,}개)")
+    print(f"📉 AUC drift (finetune - full, 표본 밖 {len(holdout):,}개): {rows['finetune'] - rows['full']:+.4f}")
@@ -0,0 +1,74 @@
+import time
+import argparse
+import torch
+
+import graph_index
+import artifact_store
+import brand_counts
+from graph_index import FILES, BELONGS_TO, HAS_CODE
+
+# ==========================================
+# 🧪 인접 인덱스(CSR) 검증 & 벤치마크
+# ------------------------------------------
+# 기존 방식(edge_ct[0] == brand_idx + torch.isin 전체 스캔)과
+# CSR 조회 결과가 같은지 확인하고, 브랜드당 소요 시간을 비교합니다.
+# 브랜드 x 류/유사군 집계 행렬(brand_counts)도 상표 단위 집계와 같은지 확인합니다.
+#   python bench_graph_index.py --brands 300
+# ==========================================
+GRAPH_PATH = "./outputs/graph/graph_data.pt"
+
+def legacy_lookup(data, brand_idx):
+    edge_ct = data['company', 'files', 'trademark'].edge_index
+    edge_tc = data['trademark', 'belongs_to', 'class'].edge_index
+    edge_tg = data['trademark', 'has_code', 'group'].edge_index
+    tms = edge_ct[1][edge_ct[0] == brand_idx]
+    classes = edge_tc[1][torch.isin(edge_tc[0], tms)]
+    groups = edge_tg[1][torch.isin(edge_tg[0], tms)]
+    return tms, classes, groups
+
+def index_lookup(index, brand_idx):
+    tms = index.neighbors(FILES, brand_idx)
+    return tms, index.neighbors_of(BELONGS_TO, tms), index.neighbors_of(HAS_CODE, tms)
+
+def _same(a, b):
+    return torch.equal(torch.sort(a).values, torch.sort(b).values)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CSR 인접 인덱스 검증 및 벤치마크")
+    parser.add_argument('--brands', type=int, default=200)
+    args = parser.parse_args()
+
+    data = artifact_store.load_graph(GRAPH_PATH)
+
+    t0 = time.perf_counter()
+    index = graph_index.GraphIndex.build(data)
+    print(f"🗂️ 인덱스 생성: {time.perf_counter() - t0:.3f}s")
+
+    # 상표가 많은 브랜드부터 (조회 비용이 큰 경우)
+    degrees = index.degree(FILES)
+    brands = torch.argsort(degrees, descending=True)[:args.brands].tolist()
+
+    t0 = time.perf_counter()
+    legacy = [legacy_lookup(data, b) for b in brands]
+    t_old = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    fast = [index_lookup(index, b) for b in brands]
+    t_new = time.perf_counter() - t0
+
+    for b, old, new in zip(brands, legacy, fast):
+        assert all(_same(o, n) for o, n in zip(old, new)), f"브랜드 {b}: 결과 불일치"
+
+    counts = brand_counts.build(data)
+    for b, (_, classes, groups) in zip(brands, legacy):
+        for name, ids in [('class', classes), ('group', groups)]:
+            cols, vals = counts[name].row(b)
+            exp_cols, exp_vals = torch.unique(ids, return_counts=True)
+            assert torch.equal(cols, exp_cols) and torch.equal(vals.long(), exp_vals), f"브랜드 {b}: {name} 집계 불일치"
+    main = counts['class'].row_argmax(brands)
+    assert all(main[i].item() == torch.bincount(legacy[i][1]).argmax().item() for i in range(len(brands)) if len(legacy[i][1]))
+
+    n = len(brands)
+    print(f"✅ {n}개 브랜드 결과 동일 (이웃 + 브랜드 집계 행렬)")
+    print(f"⏱️ 전체 스캔: {t_old:.3f}s ({t_old / n * 1000:.2f} ms/브랜드)")
+    print(f"⏱️ CSR 조회 : {t_new:.3f}s ({t_new / n * 1000:.3f} ms/브랜드)  -> {t_old / max(t_new, 1e-9):.0f}x")
@@ -0,0 +1,71 @@
+import time
+import argparse
+import torch
+
+import resources
+import inductive_brand
+
+# ==========================================
+# 🧪 신규 브랜드 임베딩 (inductive_brand) 검증 & 벤치마크
+# ------------------------------------------
+# 학습된 기존 브랜드를 "데이터에 없는 브랜드"로 보고 보유 류/유사군만으로 임베딩을 다시 계산해
+# 학습된 임베딩과 비교합니다. (류 점수 순위 상관, 추천 top-k 일치율, 브랜드당 ms)
+# 기준선: 전체 브랜드 평균 임베딩 (이름을 몰라도 누구에게나 같은 추천)
+#   python bench_inductive.py --brands 300 --top-k 3
+# ==========================================
+
+def rank_corr(a, b):
+    """Spearman 순위 상관 (동률 없는 실수 점수)"""
+    ra = a.argsort().argsort().float()
+    rb = b.argsort().argsort().float()
+    return torch.corrcoef(torch.stack([ra, rb]))[0, 1].item()
+
+def top_set(class_embs, vec, owned, k):
+    scores = class_embs @ vec
+    scores[owned] = float('-inf')
+    return set(torch.topk(scores, k).indices.tolist())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="신규 브랜드 임베딩 검증 및 벤치마크")
+    parser.add_argument('--brands', type=int, default=300, help="평가할 기존 브랜드 수 (무작위)")
+    parser.add_argument('--top-k', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    res = resources.load()
+    if res.embeddings is None:
+        raise FileNotFoundError("❌ 임베딩이 없습니다. 먼저 gnn_training_v3_shortcut.py 를 실행하세요.")
+    comp = res.embeddings['company'].float()
+    class_embs = res.embeddings['class'].float()
+    counts = res.counts
+
+    has_class = (counts['class'].indptr[1:] - counts['class'].indptr[:-1]) > 0
+    candidates = has_class.nonzero().flatten()
+    torch.manual_seed(args.seed)
+    sample = candidates[torch.randperm(len(candidates))[:args.brands]].tolist()
+    global_mean = comp.mean(0)
+
+    stats = {'inductive': [0.0, 0.0], 'global mean': [0.0, 0.0]}
+    elapsed = 0.0
+    for b in sample:
+        cls_ids, cls_counts = counts['class'].row(b)
+        grp_ids, grp_counts = counts['group'].row(b)
+        # 출원 수만큼 반복한 ID 목록 = 신규 브랜드 입력과 같은 형식
+        cls_list = torch.repeat_interleave(cls_ids, cls_counts.long())
+        grp_list = torch.repeat_interleave(grp_ids, grp_counts.long())
+        t0 = time.perf_counter()
+        vec = inductive_brand.embed(res.embeddings, counts, cls_list, grp_list, exclude=b)   # 본인은 이웃에서 제외
+        elapsed += time.perf_counter() - t0
+        own = comp[b]
+
+        truth = top_set(class_embs, own, cls_ids, args.top_k)
+        for name, v in [('inductive', vec), ('global mean', global_mean)]:
+            stats[name][0] += rank_corr(class_embs @ v, class_embs @ own)
+            stats[name][1] += len(top_set(class_embs, v, cls_ids, args.top_k) & truth) / args.top_k
+
+    n = len(sample)
+    print(f"\n🆕 기존 브랜드 {n}개를 신규로 가정 (류 {class_embs.shape[0]}개, 브랜드 {comp.shape[0]:,}개)")
+    print(f"{'방식':<14}{'류 순위 상관':>14}{f'top-{args.top_k} 일치':>12}")
+    for name, (corr, overlap) in stats.items():
+        print(f"{name:<14}{corr / n:>14.3f}{overlap / n:>12.3f}")
+    print(f"⚡ 브랜드당 {elapsed / n * 1000:.1f}ms (이웃 평균 + fold-in {inductive_brand.FOLD_STEPS} step)")
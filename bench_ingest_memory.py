@@ -0,0 +1,58 @@
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+
+# ==========================================
+# 🧪 엑셀 변환 최대 메모리(RSS) 비교
+# ------------------------------------------
+# 모드별로 새 프로세스에서 엑셀 1개를 변환하고 최대 RSS 와 시간을 출력합니다.
+#   - read_excel : 기존 방식 (pd.read_excel 로 시트 전체 -> 전체 Arrow 캐시 -> DataFrame)
+#   - stream     : openpyxl 행 반복 -> 필요한 컬럼만 chunk 단위 Arrow 캐시 -> chunk 단위로 다시 읽기
+#                  (graph_generator.py --stream 의 입력 단계)
+# 캐시는 임시 폴더에 만들고 삭제합니다.
+#   python bench_ingest_memory.py --file ./data/중국_DATA.xlsx
+# ==========================================
+MODES = ['read_excel', 'stream']
+
+def run_mode(mode, path, cache_dir):
+    import data_ingest
+    data_ingest.CACHE_DIR = cache_dir
+    t0 = time.perf_counter()
+    if mode == 'read_excel':
+        rows = len(data_ingest.load_workbook(path, columns=data_ingest.STREAM_COLUMNS, stream=False))
+    else:
+        arrow_path = data_ingest.build_stream_cache(path)
+        rows = sum(len(df) for df in data_ingest.iter_cache_chunks(arrow_path, data_ingest.STREAM_COLUMNS))
+    elapsed = time.perf_counter() - t0
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024   # Linux: KB
+    print(json.dumps({'rows': rows, 'seconds': elapsed, 'peak_mb': peak_mb}))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="엑셀 변환 방식별 최대 메모리 비교")
+    parser.add_argument('--file', default="./data/중국_DATA.xlsx")
+    parser.add_argument('--modes', nargs='+', default=MODES, choices=MODES)
+    parser.add_argument('--_run', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--_cache', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args._run:
+        run_mode(args._run, args.file, args._cache)
+        sys.exit(0)
+
+    size_mb = os.path.getsize(args.file) / 2**20
+    print(f"📄 {os.path.basename(args.file)} ({size_mb:.1f}MB)")
+    print(f"{'모드':<12}{'행 수':>12}{'시간 s':>10}{'최대 RSS MB':>14}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for mode in args.modes:
+            proc = subprocess.run([sys.executable, __file__, '--file', args.file, '--_run', mode, '--_cache', cache_dir],
+                                  capture_output=True, text=True)
+            if proc.returncode != 0:
+                print(f"{mode:<12}  ⚠️ 실패: {proc.stderr.strip().splitlines()[-1]}")
+                continue
+            r = json.loads(proc.stdout.strip().splitlines()[-1])
+            print(f"{mode:<12}{r['rows']:>12,}{r['seconds']:>10.2f}{r['peak_mb']:>14.0f}")
@@ -0,0 +1,89 @@
+import time
+import argparse
+import torch
+import torch.nn.functional as F
+import dgl
+
+import gnn_training_v3_shortcut as trainer
+from gnn_training_v3_shortcut import SimpleHeteroSAGE, LinkPredictor, TARGET_ETYPE, HIDDEN_DIMS, LR
+from negative_sampling import NegativeSampler, score_edges, STRATEGIES
+
+# ==========================================
+# 🧪 Negative Sampling 벤치마크
+# ------------------------------------------
+# 기존: epoch 마다 dgl.heterograph(neg) 생성 + apply_edges 점수
+# 신규: NegativeSampler(양성 제외) + score_edges (그래프 생성 없음)
+# 전략별 epoch 시간과 음성 샘플 중 실제 양성 비율(false negative)을 출력합니다.
+#   python bench_negative_sampling.py --epochs 20
+# ==========================================
+
+def legacy_epoch(g, model, pred, optimizer, device):
+    src_type, _, dst_type = TARGET_ETYPE
+    n_edges = g.num_edges(TARGET_ETYPE)
+    neg_src = torch.randint(0, g.num_nodes(src_type), (n_edges,), device=device)
+    neg_dst = torch.randint(0, g.num_nodes(dst_type), (n_edges,), device=device)
+    neg_g = dgl.heterograph(
+        {TARGET_ETYPE: (neg_src, neg_dst)},
+        num_nodes_dict={nt: g.num_nodes(nt) for nt in g.ntypes}
+    ).to(device)
+    h = model(g)
+    pos_score = pred(g, h, TARGET_ETYPE)
+    neg_score = pred(neg_g, h, TARGET_ETYPE)
+    _step(pos_score, neg_score, optimizer)
+    return neg_src, neg_dst
+
+def sampler_epoch(g, model, sampler, optimizer, pos_src, pos_dst):
+    src_type, _, dst_type = TARGET_ETYPE
+    h = model(g)
+    neg_src, neg_dst = sampler.sample(len(pos_src), h_src=h[src_type].detach(), h_dst=h[dst_type].detach())
+    pos_score = score_edges(h[src_type], h[dst_type], pos_src, pos_dst)
+    neg_score = score_edges(h[src_type], h[dst_type], neg_src, neg_dst)
+    _step(pos_score, neg_score, optimizer)
+    return neg_src, neg_dst
+
+def _step(pos_score, neg_score, optimizer):
+    scores = torch.cat([pos_score, neg_score])
+    labels = torch.cat([torch.ones_like(pos_score), torch.zeros_like(neg_score)])
+    loss = F.binary_cross_entropy_with_logits(scores, labels)
+    optimizer.zero_grad()
+    loss.backward()
+    optimizer.step()
+
+def _timed_epochs(fn, epochs):
+    fn()  # warm-up
+    t0 = time.perf_counter()
+    out = [fn() for _ in range(epochs)]
+    return (time.perf_counter() - t0) / epochs, out
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Negative Sampling epoch 시간 비교")
+    parser.add_argument('--epochs', type=int, default=10)
+    args = parser.parse_args()
+
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    g = trainer.load_and_modify_graph().to(device)
+    src_type, _, dst_type = TARGET_ETYPE
+    pos_src, pos_dst = g.edges(etype=TARGET_ETYPE)
+    checker = NegativeSampler(pos_src, pos_dst, g.num_nodes(src_type), g.num_nodes(dst_type))
+
+    def false_negative_rate(samples):
+        hits = sum(int(checker.is_positive(s.long(), d.long()).sum()) for s, d in samples)
+        return hits / max(sum(len(s) for s, _ in samples), 1)
+
+    print(f"\n⏱️ epoch 시간 비교 ({args.epochs} epochs, 타겟 엣지 {len(pos_src):,}개)")
+    print(f"{'방식':<22}{'s/epoch':>10}{'양성 혼입':>10}")
+
+    torch.manual_seed(0)
+    model = SimpleHeteroSAGE(g, HIDDEN_DIMS, HIDDEN_DIMS).to(device)
+    pred = LinkPredictor().to(device)
+    optimizer = torch.optim.Adam(model.parameters(), lr=LR)
+    t_legacy, samples = _timed_epochs(lambda: legacy_epoch(g, model, pred, optimizer, device), args.epochs)
+    print(f"{'기존 (neg 그래프 생성)':<22}{t_legacy:>10.3f}{false_negative_rate(samples):>10.2%}")
+
+    for strategy in STRATEGIES:
+        torch.manual_seed(0)
+        model = SimpleHeteroSAGE(g, HIDDEN_DIMS, HIDDEN_DIMS).to(device)
+        optimizer = torch.optim.Adam(model.parameters(), lr=LR)
+        sampler = NegativeSampler(pos_src, pos_dst, g.num_nodes(src_type), g.num_nodes(dst_type), strategy=strategy)
+        t_new, samples = _timed_epochs(lambda: sampler_epoch(g, model, sampler, optimizer, pos_src, pos_dst), args.epochs)
+        print(f"{'신규 ' + strategy:<22}{t_new:>10.3f}{false_negative_rate(samples):>10.2%}")
@@ -0,0 +1,40 @@
+import os
+import argparse
+import tempfile
+
+import graph_index
+import render_pool
+from graph_analysis import brand_spec, load_data
+from graph_index import FILES
+
+# ==========================================
+# 🧪 시각화 렌더링 처리량 측정
+# ------------------------------------------
+# 상표 보유 수 상위 브랜드의 생태계 그래프 스펙을 만들고 워커 수별로 렌더링 처리량(장/s)을 비교합니다.
+# 이미지는 임시 폴더에 저장 후 삭제합니다.
+#   python bench_render.py --brands 16 --workers 1 2 4
+# ==========================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="시각화 렌더링 처리량 측정 (render_pool)")
+    parser.add_argument('--brands', type=int, default=8)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    parser.add_argument('--dpi', type=int, default=300)
+    args = parser.parse_args()
+
+    data, encoders = load_data()
+    comp_names = encoders['company_classes']
+    degree = graph_index.of(data).degree(FILES)
+    top = degree.topk(min(args.brands, len(degree))).indices.tolist()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        specs = []
+        for i, idx in enumerate(top):
+            spec = brand_spec(data, encoders, comp_names[idx])
+            spec.update(save_path=os.path.join(tmp, f"brand_{i}.png"), dpi=args.dpi, seed=42)
+            specs.append(spec)
+        print(f"🖼️ 브랜드 {len(specs)}개, 평균 노드 {sum(len(s['nodes']) for s in specs) / len(specs):.0f}개, dpi {args.dpi}")
+
+        for workers in dict.fromkeys(args.workers):
+            print(f"\n⏱️ 워커 {workers}개")
+            render_pool.render_all(specs, workers=workers, verbose=False)
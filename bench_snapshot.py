@@ -0,0 +1,82 @@
+import time
+import argparse
+import torch
+
+import graph_snapshot
+import artifact_store
+from graph_index import FILES
+
+# ==========================================
+# 🧪 기간 스냅샷 검증 & 벤치마크
+# ------------------------------------------
+# 전체 그래프에서 연도별 스냅샷을 만들며 두 방식을 비교합니다.
+#   - mask     : 기간 내 상표 마스크를 만들어 엣지 타입마다 전체 엣지를 필터링 (O(E) / 스냅샷)
+#   - snapshot : 출원일자 순으로 미리 정렬한 엣지 배열의 구간 슬라이스 (graph_snapshot.snapshot)
+# 두 결과의 엣지 집합이 같은지 확인하고 스냅샷당 소요 시간을 출력합니다.
+#   python bench_snapshot.py --window-years 1
+# ==========================================
+GRAPH_PATH = "./outputs/graph/graph_data.pt"
+
+def mask_snapshot(data, tm_days, start, end):
+    """기존 방식: 상표 마스크 -> 엣지 타입별 전체 필터링"""
+    lo, hi = graph_snapshot.parse_day(start), graph_snapshot.parse_day(end)
+    keep = (tm_days >= lo) & (tm_days < hi)
+    edges = {}
+    for etype in data.edge_types:
+        src, dst = data[etype].edge_index
+        if etype[0] == 'trademark':
+            edges[etype] = data[etype].edge_index[:, keep[src]]
+        elif etype[2] == 'trademark':
+            edges[etype] = data[etype].edge_index[:, keep[dst]]
+    return edges
+
+def _same(a, b):
+    """엣지 순서와 무관하게 같은 집합인지"""
+    if a.size(1) != b.size(1): return False
+    if a.numel() == 0: return True
+    base = int(torch.maximum(a.max(), b.max())) + 1
+    key_a, key_b = a[0].long() * base + a[1], b[0].long() * base + b[1]
+    return torch.equal(torch.sort(key_a).values, torch.sort(key_b).values)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="출원일자 기간 스냅샷 검증 및 벤치마크")
+    parser.add_argument('--window-years', type=int, default=1, help="스냅샷 1개의 기간 (년)")
+    args = parser.parse_args()
+
+    data = artifact_store.load_graph(GRAPH_PATH)
+    n_edges = sum(data[et].edge_index.size(1) for et in data.edge_types)
+    print(f"🕸️ 상표 {data['trademark'].num_nodes:,}개, 엣지 {n_edges:,}개")
+
+    t0 = time.perf_counter()
+    time_index = graph_snapshot.of(data)
+    print(f"🕰️ 출원일자 정렬 인덱스 생성 (1회): {time.perf_counter() - t0:.3f}s")
+
+    first, last = time_index.date_range()
+    y0 = int(graph_snapshot.format_day(first)[:4])
+    y1 = int(graph_snapshot.format_day(last)[:4])
+    windows = [(y, min(y + args.window_years, y1 + 1)) for y in range(y0, y1 + 1, args.window_years)]
+
+    # 상표별 출원일자 (ID 순) - mask 방식 입력
+    tm_days = torch.full((data['trademark'].num_nodes,), graph_snapshot.NO_DATE, dtype=torch.int32)
+    tm_days[data[FILES].edge_index[1]] = data[FILES].edge_time
+
+    t_mask = t_snap = 0.0
+    total = 0
+    for start, end in windows:
+        t0 = time.perf_counter()
+        old = mask_snapshot(data, tm_days, start, end)
+        t_mask += time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        snap = graph_snapshot.snapshot(data, start, end)
+        t_snap += time.perf_counter() - t0
+
+        for etype, edge_index in old.items():
+            assert _same(edge_index, snap[etype].edge_index), f"{start}~{end} {etype}: 결과 불일치"
+        total += snap[FILES].edge_index.size(1)
+    print(f"✅ 스냅샷 {len(windows)}개 결과 일치 (출원 합계 {total:,}건)")
+
+    print(f"{'방식':<10}{'스냅샷당 ms':>14}")
+    print(f"{'mask':<10}{t_mask / len(windows) * 1000:>14.2f}")
+    print(f"{'snapshot':<10}{t_snap / len(windows) * 1000:>14.2f}")
+    print(f"⚡ {t_mask / max(t_snap, 1e-9):.1f}배")
@@ -0,0 +1,75 @@
+import re
+import sys
+import time
+import argparse
+import subprocess
+
+# ==========================================
+# 🧪 분석 스크립트 시작(임포트) 시간 측정
+# ------------------------------------------
+# python -X importtime -c "import <모듈>" 을 새 프로세스로 실행해
+#   - 전체 임포트 시간, 가장 무거운 최상위 패키지
+#   - 시각화 라이브러리(matplotlib/networkx/seaborn)가 임포트 시점에 로드되는지
+# 를 출력합니다. --max-ms 를 주면 초과한 모듈이 있을 때 종료 코드 1 (회귀 확인용)
+#   python bench_startup.py
+#   python bench_startup.py --max-ms 3000 --modules gnn_korean_competitors
+# ==========================================
+MODULES = [
+    'graph_analysis',
+    'gnn_analysis_target_brand',
+    'gnn_korean_expansion',
+    'gnn_korean_competitors',
+    'gnn_korean_gap_analysis',
+    'market_trend_analyzer',
+    'basic_analysis',
+    'query_service',
+    'main',
+]
+PLOT_LIBS = ('matplotlib', 'networkx', 'seaborn')
+LINE_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+def import_profile(module):
+    """(전체 ms, {직접 임포트한 패키지: 누적 ms}, 로드된 모든 모듈 이름, 벽시계 s)"""
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          capture_output=True, text=True)
+    wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    total, direct, loaded = 0.0, {}, set()
+    for line in proc.stderr.splitlines():
+        m = LINE_RE.match(line)
+        if not m: continue
+        name, depth = m.group(4), len(m.group(3))
+        loaded.add(name)
+        if depth == 1 and name == module:     # 들여쓰기 1칸 = -c 에서 임포트한 모듈
+            total = int(m.group(2)) / 1000
+        elif depth == 3:                      # 3칸 = 모듈이 직접 임포트한 패키지
+            direct[name] = direct.get(name, 0) + int(m.group(2)) / 1000
+    return total, direct, loaded, wall
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="분석 스크립트 임포트 시간 측정 (-X importtime)")
+    parser.add_argument('--modules', nargs='+', default=MODULES)
+    parser.add_argument('--top', type=int, default=3, help="무거운 최상위 패키지 몇 개를 보여줄지")
+    parser.add_argument('--max-ms', type=float, default=None, help="모듈 임포트 시간 상한 (초과 시 종료 코드 1)")
+    args = parser.parse_args()
+
+    print(f"{'모듈':<28}{'import ms':>10}{'wall s':>8}  시각화 로드  무거운 패키지")
+    over = []
+    for module in args.modules:
+        try:
+            total, direct, loaded, wall = import_profile(module)
+        except RuntimeError as e:
+            print(f"{module:<28}  ⚠️ 임포트 실패: {e}")
+            continue
+        heavy = sorted(direct.items(), key=lambda kv: -kv[1])[:args.top]
+        plot_loaded = [lib for lib in PLOT_LIBS if lib in loaded]
+        print(f"{module:<28}{total:>10.0f}{wall:>8.2f}  {'⚠️ ' + ','.join(plot_loaded) if plot_loaded else '없음':<10}  "
+              + ", ".join(f"{k} {v:.0f}ms" for k, v in heavy))
+        if args.max_ms is not None and total > args.max_ms:
+            over.append(module)
+
+    if over:
+        print(f"\n❌ 임포트 시간 상한({args.max_ms:.0f}ms) 초과: {', '.join(over)}")
+        sys.exit(1)
@@ -0,0 +1,141 @@
+import torch
+
+from object_cache import LatestCache
+from graph_index import FILES, BELONGS_TO, HAS_CODE, gather_ranges, save_artifact, load_or_build_artifact
+
+# ==========================================
+# 📊 브랜드 x 류 / 브랜드 x 유사군 출원 수 (2-hop 집계, 희소 CSR)
+# ------------------------------------------
+# (Brand -> Trademark) @ (Trademark -> Class) 를 학습/분석 스크립트마다 다시 계산하고,
+# 갭 분석에서는 .to_dense() 로 [브랜드 수 x 류 수] 전체를 만들었습니다.
+# 그래프 생성 시 한 번만 계산해 CSR(indptr, indices, values)로 저장하고,
+# 소비하는 쪽은 행 단위 조회/집계만 사용합니다. (밀집 행렬로 바꾸지 않음)
+#   counts = brand_counts.of(data)
+#   cols, vals = counts['class'].row(brand_idx)    -> 브랜드가 출원한 류와 출원 수
+#   counts['group'].row_argmax(brand_indices)      -> 브랜드별 최다 유사군
+# ==========================================
+BRAND_COUNTS_PATH = "./outputs/graph/brand_counts.pt"
+
+TARGETS = {'class': BELONGS_TO, 'group': HAS_CODE}
+
+class CountMatrix:
+    """행 = 브랜드, 열 = 류/유사군, 값 = 출원(상표) 수. 0 이 아닌 칸만 저장"""
+    def __init__(self, indptr, indices, values, shape):
+        self.indptr = indptr    # int64 [행 수 + 1]
+        self.indices = indices  # int64 [nnz], 행 안에서 열 번호 오름차순
+        self.values = values    # int32 [nnz]
+        self.shape = tuple(shape)
+
+    @classmethod
+    def from_edges(cls, edge_ab, edge_bc, n_a, n_b, n_c):
+        """A->B, B->C 엣지로 A x C 경로 수 행렬을 만듭니다. (희소 곱, 결과도 희소)"""
+        adj_ab = torch.sparse_coo_tensor(edge_ab, torch.ones(edge_ab.size(1)), (n_a, n_b))
+        adj_bc = torch.sparse_coo_tensor(edge_bc, torch.ones(edge_bc.size(1)), (n_b, n_c))
+        adj_ac = torch.sparse.mm(adj_ab, adj_bc).coalesce()  # 행 우선 정렬
+        rows, cols = adj_ac.indices()
+        indptr = torch.zeros(n_a + 1, dtype=torch.long)
+        torch.cumsum(torch.bincount(rows, minlength=n_a), dim=0, out=indptr[1:])
+        values = adj_ac.values().round().to(torch.int32)
+        return cls(indptr, cols.contiguous(), values, (n_a, n_c))
+
+    @property
+    def nnz(self):
+        return self.indices.numel()
+
+    def row(self, r):
+        """브랜드 1개 -> (열 번호, 출원 수)"""
+        r = int(r)
+        start, end = self.indptr[r], self.indptr[r + 1]
+        return self.indices[start:end], self.values[start:end]
+
+    def edges(self):
+        """0 이 아닌 칸 전체를 (행, 열) 엣지로 반환 (행 우선 순서)"""
+        rows = torch.repeat_interleave(torch.arange(self.shape[0]), self.indptr[1:] - self.indptr[:-1])
+        return rows, self.indices
+
+    def _segments(self, rows):
+        if rows is None:
+            rows = torch.arange(self.shape[0])
+        rows = torch.as_tensor(rows, dtype=torch.long).reshape(-1)
+        pos, counts = gather_ranges(self.indptr, rows)
+        seg = torch.repeat_interleave(torch.arange(len(rows)), counts)
+        return rows, pos, seg
+
+    def row_sum(self, rows=None):
+        """행별 합계 (브랜드별 총 출원 수)"""
+        if rows is None:   # 전체 행: 누적합의 행 경계 차이
+            csum = torch.cat([torch.zeros(1, dtype=torch.long), torch.cumsum(self.values.long(), 0)])
+            return csum[self.indptr[1:]] - csum[self.indptr[:-1]]
+        rows, pos, seg = self._segments(rows)
+        out = torch.zeros(len(rows), dtype=torch.long)
+        return out.index_add_(0, seg, self.values[pos].long())
+
+    def row_argmax(self, rows=None):
+        """행별 최다 열 (동률이면 번호가 작은 열, 빈 행은 0 -> 밀집 argmax 와 동일)"""
+        rows, pos, seg = self._segments(rows)
+        vals = self.values[pos].long()
+        cols = self.indices[pos]
+        row_max = torch.zeros(len(rows), dtype=torch.long).scatter_reduce_(0, seg, vals, reduce='amax')
+        is_max = vals == row_max[seg]
+        best = torch.full((len(rows),), self.shape[1], dtype=torch.long)
+        best.scatter_reduce_(0, seg[is_max], cols[is_max], reduce='amin')
+        best[best == self.shape[1]] = 0
+        return best
+
+    def matvec(self, weights):
+        """(브랜드 x 열) @ weights[열 수] -> 브랜드별 가중합 (희소 곱, 밀집 행렬 없음)"""
+        weights = weights.float()
+        hit = torch.nonzero(weights[self.indices]).flatten()   # 가중치가 0 이 아닌 열의 칸만
+        rows = torch.searchsorted(self.indptr, hit, right=True) - 1
+        out = torch.zeros(self.shape[0])
+        return out.index_add_(0, rows, self.values[hit].float() * weights[self.indices[hit]])
+
+    def to_entry(self):
+        return {'indptr': self.indptr, 'indices': self.indices, 'values': self.values, 'shape': self.shape}
+
+    @classmethod
+    def from_entry(cls, entry):
+        return cls(entry['indptr'], entry['indices'], entry['values'], entry['shape'])
+
+def build(data):
+    """graph -> {'class': CountMatrix, 'group': CountMatrix}"""
+    n_comp = data['company'].num_nodes
+    n_tm = data['trademark'].num_nodes
+    edge_ct = data[FILES].edge_index
+    counts = {}
+    for name, etype in TARGETS.items():
+        if etype not in data.edge_types:
+            continue
+        counts[name] = CountMatrix.from_edges(
+            edge_ct, data[etype].edge_index, n_comp, n_tm, data[etype[2]].num_nodes)
+    return counts
+
+def save(counts, signature, path=BRAND_COUNTS_PATH):
+    payload = {'signature': signature}
+    payload.update({name: m.to_entry() for name, m in counts.items()})
+    torch.save(payload, path)
+
+def load(path=BRAND_COUNTS_PATH):
+    try:
+        payload = torch.load(path, weights_only=False)
+    except TypeError:
+        payload = torch.load(path)
+    signature = payload.pop('signature')
+    return {name: CountMatrix.from_entry(e) for name, e in payload.items()}, signature
+
+def build_and_save(data, path=None):
+    """graph_generator 에서 그래프 저장 직후 호출"""
+    return save_artifact(data, BRAND_COUNTS_PATH, lambda: build(data), save, "브랜드 집계 행렬", path)
+
+def load_or_build(data, path=None):
+    """
+    저장된 집계가 현재 그래프 파일과 맞으면 재사용, 아니면 새로 만듭니다.
+    기간 스냅샷/국가 부분 그래프처럼 디스크 그래프가 아니면 메모리에서만 계산 (저장 파일을 덮어쓰지 않음)
+    """
+    return load_or_build_artifact(data, BRAND_COUNTS_PATH, lambda: build(data), load, save, "브랜드 집계 행렬", path)
+
+_CACHE = LatestCache()
+
+def of(data):
+    """분석 스크립트용: 그래프 객체별로 집계 행렬을 한 번만 읽어 재사용합니다."""
+    return _CACHE.get(data, lambda: load_or_build(data))
@@ -0,0 +1,115 @@
+import torch
+
+import graph_index
+from graph_index import FILES, BELONGS_TO, HAS_CODE
+from batch_recommend import recommend_chunks
+
+# ==========================================
+# 🔎 브랜드 질의 (출력 없이 dict/list 반환)
+# ------------------------------------------
+# query_service(HTTP)와 main.py(CLI)가 함께 사용합니다.
+# res 는 resources.Resources 스냅샷 (그래프, 인코더, 임베딩, 인덱스)
+#   - brand_stats / gap_analysis : 브랜드 1개 (CSR 인덱스 + 희소 집계 행 조회)
+#   - expansion_batch / competitors_batch : 브랜드 여러 개를 한 번의 행렬곱/ANN 검색으로
+# ==========================================
+
+def resolve_brands(res, names):
+    """브랜드 이름 목록 -> (ID 목록, 찾지 못한 이름 목록). 중복 이름은 한 번만"""
+    ids, missing, seen = [], [], set()
+    for name in names:
+        if name in seen: continue
+        seen.add(name)
+        idx = res.brand_index(name)
+        if idx is None:
+            missing.append(name)
+        else:
+            ids.append(idx)
+    return ids, missing
+
+def _top_named(ids, counts, names, k):
+    k = min(k, len(ids))
+    if k == 0: return []
+    vals, local = torch.topk(counts, k)
+    return [{'name': names[ids[i].item()], 'count': int(v)} for v, i in zip(vals, local)]
+
+def brand_stats(res, brand_idx):
+    counts = res.counts
+    cls_ids, cls_counts = counts['class'].row(brand_idx)
+    grp_ids, grp_counts = counts['group'].row(brand_idx)
+    return {
+        'trademarks': int(res.index.degree(FILES, [brand_idx])[0]),
+        'top_classes': _top_named(cls_ids, cls_counts, res.encoders['class_classes'], 3),
+        'top_groups': _top_named(grp_ids, grp_counts, res.encoders['group_classes'], 5),
+    }
+
+def gap_analysis(res, brand_idx, top_k=5):
+    """gnn_korean_gap_analysis.analyze_gap_strategy 와 같은 계산 (출력 없이 dict 반환)"""
+    class_names = res.encoders['class_classes']
+    group_names = res.encoders['group_classes']
+    counts = res.counts
+    my_cls_ids, _ = counts['class'].row(brand_idx)
+    if len(my_cls_ids) == 0:
+        return {'main_class': None, 'gaps': [], 'my_strong': []}
+    main_class_idx = counts['class'].row_argmax([brand_idx]).item()
+
+    market_tms = res.index.neighbors(graph_index.reverse(BELONGS_TO), main_class_idx)
+    market_groups = res.index.neighbors_of(HAS_CODE, market_tms)
+    candidates = torch.bincount(market_groups, minlength=len(group_names))
+    my_groups, my_group_counts = counts['group'].row(brand_idx)
+    candidates[my_groups] = -1
+
+    gap_vals, gap_idx = torch.topk(candidates, min(top_k, len(candidates)))
+    gaps = [{'name': group_names[i.item()], 'market_count': int(v)}
+            for v, i in zip(gap_vals, gap_idx) if v.item() > 0]
+    strong = torch.argsort(my_group_counts, descending=True, stable=True)[:3]
+    return {
+        'main_class': class_names[main_class_idx],
+        'gaps': gaps,
+        'my_strong': [group_names[my_groups[i].item()] for i in strong if my_group_counts[i].item() > 0],
+    }
+
+def expansion_batch(res, brand_ids, top_k, chunk_size=4096):
+    """브랜드 여러 개의 신사업 추천을 한 번에 (batch_recommend 와 같은 점수/마스킹)"""
+    class_names = res.encoders['class_classes']
+    results = []
+    for _, top_cls, top_scores in recommend_chunks(res.embeddings['company'], res.embeddings['class'],
+                                                   res.counts['class'], brand_ids, top_k, chunk_size):
+        results += [[{'class': class_names[c], 'score': float(s)}
+                     for c, s in zip(cls_row.tolist(), score_row.tolist()) if s != float('-inf')]
+                    for cls_row, score_row in zip(top_cls, top_scores)]
+    return results
+
+def competitors_batch(res, brand_ids, top_k):
+    """브랜드 여러 개의 유사(경쟁) 브랜드를 한 번에 (ANN 인덱스, 본인 제외)"""
+    if len(brand_ids) == 0: return []
+    comp_names = res.encoders['company_classes']
+    ids, scores = res.ann.search(res.embeddings['company'][brand_ids], k=top_k, exclude=brand_ids)
+    return [[{'brand': comp_names[int(i)], 'brand_id': int(i), 'score': float(s)}
+             for i, s in zip(id_row, score_row) if i >= 0]
+            for id_row, score_row in zip(ids, scores)]
+
+def unseen_brand(res, classes=(), groups=()):
+    """데이터에 없는 브랜드: 보유(출원 예정) 류/유사군 이름 -> {'vector', 'class_ids', 'unknown'} (inductive_brand)"""
+    import inductive_brand
+    class_ids, unknown = inductive_brand.lookup(res.encoders['class_classes'], classes)
+    group_ids, unknown_groups = inductive_brand.lookup(res.encoders['group_classes'], groups)
+    if len(class_ids) == 0 and len(group_ids) == 0:
+        raise ValueError(f"알 수 없는 류/유사군입니다: {', '.join(unknown + unknown_groups) or '(없음)'}")
+    vec = inductive_brand.embed(res.embeddings, res.counts, class_ids, group_ids)
+    return {'vector': vec, 'class_ids': class_ids, 'unknown': unknown + unknown_groups}
+
+def expansion_unseen(res, unseen, top_k):
+    """unseen_brand 벡터의 신사업 추천 (입력한 류는 제외, expansion_batch 와 같은 형식)"""
+    class_names = res.encoders['class_classes']
+    scores = res.embeddings['class'].float() @ unseen['vector']
+    scores[unseen['class_ids']] = float('-inf')
+    top_scores, top_cls = torch.topk(scores, min(top_k, len(scores)))
+    return [{'class': class_names[c], 'score': float(s)}
+            for c, s in zip(top_cls.tolist(), top_scores.tolist()) if s != float('-inf')]
+
+def competitors_unseen(res, unseen, top_k):
+    """unseen_brand 벡터와 유사한 기존 브랜드 (ANN 인덱스)"""
+    comp_names = res.encoders['company_classes']
+    ids, scores = res.ann.search(unseen['vector'][None, :], k=top_k)
+    return [{'brand': comp_names[int(i)], 'brand_id': int(i), 'score': float(s)}
+            for i, s in zip(ids[0], scores[0]) if i >= 0]
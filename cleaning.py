@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# 🧹 벡터화 정제 함수 모음
+# ------------------------------------------
+# 기존 .apply(행 단위 파이썬 함수) 정제 로직과 동일한 결과를
+# pandas 문자열 연산(str.extract / str.split + explode / 일괄 to_datetime)으로 계산합니다.
+#   - graph_generator.clean_class_column  -> clean_class_series
+#   - graph_generator.clean_group_column  -> split_group_series
+#   - market_trend_analyzer.clean_class   -> clean_class_numeric
+#   - market_trend_analyzer.clean_date    -> clean_date_series
+#   - basic_analysis 주요_류/지정상품_개수/상표명_길이 -> main_class_series / goods_count_series / name_length_series
+# ==========================================
+UNKNOWN_GROUP = "Unknown_Group"
+UNKNOWN_BRAND = "Unknown_Brand"   # 상표명칭 결측 (graph_generator 브랜드 노드)
+GROUP_SEPARATORS = r'[|,\s]+'
+
+def _as_series(values):
+    return values if isinstance(values, pd.Series) else pd.Series(values)
+
+def _per_unique(s, fn):
+    """
+    고유값에만 fn(Series -> Series)을 적용한 뒤 take로 펼칩니다.
+    류/유사군/날짜처럼 중복이 많은 컬럼은 120만 행이어도 고유값은 수천 개 수준입니다.
+    """
+    codes, uniques = pd.factorize(s, use_na_sentinel=False)
+    mapped = fn(pd.Series(uniques, dtype=object)).to_numpy()
+    return pd.Series(mapped[codes], index=s.index)
+
+def clean_class_series(values):
+    """'류' 정제: 첫 번째 숫자열(문자열), 결측/숫자 없음은 "0" """
+    s = _as_series(values).astype(str)
+    return _per_unique(s, lambda u: u.str.extract(r'(\d+)', expand=False).fillna("0"))
+
+def clean_class_numeric(values):
+    """'류' 정제: 첫 번째 숫자열(정수), 결측/숫자 없음은 0"""
+    return clean_class_series(values).astype(np.int64)
+
+def _split_codes(uniques):
+    tokens = uniques.str.upper().str.split(GROUP_SEPARATORS, regex=True).explode()
+    return tokens[tokens.str.len() > 0]
+
+def split_group_series(values):
+    """
+    '유사군' 정제 + 확장(Explode)
+    예: "G1234 | S5678" -> 같은 인덱스로 ["G1234", "S5678"] 두 행
+    결측치나 코드가 없는 행은 "Unknown_Group" 한 행으로 남깁니다.
+    반환값은 원본 인덱스를 유지한 Series 이며, 원본 행 순서/코드 순서를 보존합니다.
+    """
+    s = _as_series(values)
+    raw = s.to_numpy(dtype=object)
+    valid = ~pd.isna(raw)
+
+    # 고유 문자열만 분리한 뒤 (행 -> 고유값 -> 토큰) 순서로 펼칩니다.
+    codes = np.full(len(s), -1, dtype=np.int64)
+    codes[valid], uniques = pd.factorize(pd.Series(raw[valid]).astype(str))
+    tokens = _split_codes(pd.Series(uniques, dtype=object))
+
+    tok_owner = tokens.index.to_numpy(dtype=np.int64)          # 토큰 -> 고유값 번호
+    tok_count = np.bincount(tok_owner, minlength=len(uniques))  # 고유값별 토큰 수
+    tok_start = np.concatenate([[0], np.cumsum(tok_count)[:-1]]) if len(uniques) else np.zeros(0, dtype=np.int64)
+    tok_values = tokens.to_numpy(dtype=object)
+
+    # 행별 토큰 수 (코드가 없는 행은 Unknown_Group 1개)
+    row_count = np.where(codes >= 0, tok_count[np.maximum(codes, 0)] if len(uniques) else 0, 0)
+    empty = row_count == 0
+    row_count = np.where(empty, 1, row_count)
+
+    row_pos = np.repeat(np.arange(len(s)), row_count)
+    offset = np.arange(len(row_pos)) - np.repeat(np.cumsum(row_count) - row_count, row_count)
+    out = np.empty(len(row_pos), dtype=object)
+    filled = ~empty[row_pos]
+    src = tok_start[codes[row_pos[filled]]] + offset[filled]
+    out[filled] = tok_values[src]
+    out[~filled] = UNKNOWN_GROUP
+    return pd.Series(out, index=s.index[row_pos])
+
+def clean_date_series(values):
+    """출원일자 일괄 변환 (행마다 to_datetime을 부르지 않음). 변환 불가 값은 NaT"""
+    s = _as_series(values)
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s
+    try:
+        codes, uniques = pd.factorize(s)
+        parsed = pd.to_datetime(pd.Series(uniques, dtype=object), format='mixed', errors='coerce')
+        return pd.Series(pd.DatetimeIndex(parsed).take(codes, allow_fill=True, fill_value=pd.NaT), index=s.index)
+    except (TypeError, ValueError):
+        # 혼재 타입 때문에 일괄 변환이 실패하는 경우에만 행 단위로 처리
+        return pd.to_datetime(s.map(_clean_date_scalar), errors='coerce')
+
+def _clean_date_scalar(value):
+    try:
+        return pd.to_datetime(value, format='mixed', errors='coerce')
+    except Exception:
+        return pd.NaT
+
+def main_class_series(values):
+    """basic_analysis '주요_류': '//' 앞 첫 류의 숫자열, 없으면 '기타'"""
+    def _main(u):
+        head = u.str.split('//', n=1).str[0].str.strip()
+        return head.str.extract(r'(\d+)', expand=False).fillna('기타').astype(str)
+    return _per_unique(_as_series(values).astype(str), _main)
+
+def goods_count_series(values):
+    """basic_analysis '지정상품_개수': 구분자(//, 쉼표, 줄바꿈)로 나눈 조각 수"""
+    s = _as_series(values).astype(str)
+    return _per_unique(s, lambda u: u.str.count(r'//|,|\n') + 1).astype(np.int64)
+
+def name_length_series(values):
+    """basic_analysis '상표명_길이': 공백과 괄호를 제외한 글자 수"""
+    s = _as_series(values).astype(str)
+    return _per_unique(s, lambda u: u.str.len() - u.str.count(r'[\s()]')).astype(np.int64)
@@ -0,0 +1,179 @@
+import os
+import json
+import time
+import shutil
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
+import torch
+import pyarrow as pa
+import pyarrow.parquet as pq
+from tqdm import tqdm
+
+import node_vocab
+import artifact_store
+from ann_index import normalize, topk_rows, file_signature
+
+# ==========================================
+# 🕸️ 전체 브랜드 경쟁 관계 그래프 (정확 top-k, 타일 행렬곱)
+# ------------------------------------------
+# gnn_korean_competitors 는 한국 대표 브랜드 몇 개만 경쟁사를 찾습니다.
+# 여기서는 모든 브랜드에 대해 코사인 유사도 top-k 이웃을 정확히 계산해 엣지 리스트로 저장합니다.
+#   - 정규화 임베딩을 (tile_rows x col_block) 타일로 나눠 행렬곱, 열 블록마다 top-k 를 누적 병합
+#   - 타일 하나의 점수 행렬 크기는 --budget-mb / --threads 를 넘지 않음
+#   - 행 타일을 스레드 풀에서 병렬 처리 (NumPy 행렬곱은 GIL 을 놓음)
+#   - 끝난 행 타일은 outputs/graph/competitors/ 에 바로 저장 -> 중단 후 다시 실행하면 남은 타일만 계산
+#   python competitor_graph.py --k 20 --threads 4 --budget-mb 1024
+#   python competitor_graph.py --restart          # 체크포인트 무시하고 처음부터
+# 출력 컬럼: src_id, src, dst_id, dst, rank, score
+# ==========================================
+ENCODER_PATH = "./outputs/graph/label_encoders.pt"
+EMBEDDING_PATH = "./outputs/graph/dgl_node_embeddings_v3.pt"
+CHECKPOINT_DIR = "./outputs/graph/competitors"
+EDGES_PATH = "./outputs/graph/competitor_edges.parquet"
+
+BYTES_PER_SCORE = 16   # 점수(float32) + argpartition 임시 배열(-scores 복사본, int64 인덱스)
+
+SCHEMA = pa.schema([
+    ('src_id', pa.int64()),
+    ('src', pa.string()),
+    ('dst_id', pa.int64()),
+    ('dst', pa.string()),
+    ('rank', pa.int16()),
+    ('score', pa.float32()),
+])
+
+def tile_shape(n, tile_rows, budget_mb, threads):
+    """스레드당 메모리 예산 안에서 열 블록 크기 결정"""
+    per_thread = budget_mb * (1 << 20) // max(threads, 1)
+    col_block = per_thread // (BYTES_PER_SCORE * tile_rows)
+    if col_block < 1:
+        raise ValueError(f"❌ 메모리 예산이 너무 작습니다: tile_rows={tile_rows}, budget={budget_mb}MB")
+    return min(tile_rows, n), min(col_block, n)
+
+def tile_topk(vectors, start, stop, k, col_block):
+    """vectors[start:stop] 의 top-k 이웃 (본인 제외). 열 블록마다 top-k 를 구해 누적 병합"""
+    queries = vectors[start:stop]
+    rows = np.arange(stop - start)
+    best_ids = np.full((len(rows), 0), -1, dtype=np.int64)
+    best_scores = np.full((len(rows), 0), -np.inf, dtype=np.float32)
+    for c0 in range(0, len(vectors), col_block):
+        c1 = min(c0 + col_block, len(vectors))
+        scores = queries @ vectors[c0:c1].T
+        self_rows = rows[(rows + start >= c0) & (rows + start < c1)]
+        scores[self_rows, self_rows + start - c0] = -np.inf
+        ids, sc = topk_rows(scores, k)
+        cand_ids = np.concatenate([best_ids, ids + c0], axis=1)
+        cand_scores = np.concatenate([best_scores, sc], axis=1)
+        pick, best_scores = topk_rows(cand_scores, k)
+        best_ids = np.take_along_axis(cand_ids, pick, axis=1)
+    return best_ids, best_scores
+
+# ==========================================
+# 💾 체크포인트
+# ==========================================
+def _part_path(ckpt_dir, start):
+    return os.path.join(ckpt_dir, f"part_{start:010d}.npz")
+
+def _prepare_checkpoint(ckpt_dir, manifest, restart=False):
+    """manifest(임베딩 서명, k, 타일 크기)가 같으면 기존 타일을 이어 쓰고, 다르면 비움"""
+    manifest_path = os.path.join(ckpt_dir, "manifest.json")
+    if os.path.exists(manifest_path) and not restart:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            if json.load(f) == manifest:
+                return
+        print("ℹ️ 임베딩/설정이 바뀌어 체크포인트를 초기화합니다.")
+    shutil.rmtree(ckpt_dir, ignore_errors=True)
+    os.makedirs(ckpt_dir, exist_ok=True)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+def _save_part(ckpt_dir, start, ids, scores):
+    path = _part_path(ckpt_dir, start)
+    tmp = path + ".tmp.npz"
+    np.savez(tmp, ids=ids, scores=scores)
+    os.replace(tmp, path)
+
+def compute_neighbors(vectors, k=20, tile_rows=1024, budget_mb=1024, threads=None,
+                      ckpt_dir=CHECKPOINT_DIR, manifest=None, restart=False):
+    """모든 행의 top-k 이웃을 타일 단위로 계산해 ckpt_dir 에 저장. 반환: 타일 시작 행 목록"""
+    vectors = normalize(vectors)
+    n = len(vectors)
+    k = min(k, n - 1)
+    threads = threads or min(8, os.cpu_count() or 1)
+    tile_rows, col_block = tile_shape(n, tile_rows, budget_mb, threads)
+    manifest = dict(manifest or {}, rows=n, k=k, tile_rows=tile_rows)
+    _prepare_checkpoint(ckpt_dir, manifest, restart)
+
+    starts = list(range(0, n, tile_rows))
+    todo = [s for s in starts if not os.path.exists(_part_path(ckpt_dir, s))]
+    print(f"🧮 브랜드 {n:,}개, top-{k} | 타일 {tile_rows}x{col_block}, 스레드 {threads} | "
+          f"남은 타일 {len(todo)}/{len(starts)}")
+    if not todo:
+        return starts
+
+    def run(start):
+        ids, scores = tile_topk(vectors, start, min(start + tile_rows, n), k, col_block)
+        _save_part(ckpt_dir, start, ids, scores)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [pool.submit(run, s) for s in todo]
+        for fut in tqdm(as_completed(futures), total=len(futures), desc="Tiles"):
+            fut.result()
+    return starts
+
+# ==========================================
+# 📤 엣지 리스트
+# ==========================================
+def write_edges(starts, comp_names, ckpt_dir=CHECKPOINT_DIR, path=EDGES_PATH):
+    """타일 체크포인트를 행 순서대로 Parquet 엣지 리스트로 합칩니다. 반환: 엣지 수"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    n_edges = 0
+    with pq.ParquetWriter(tmp, SCHEMA) as writer:
+        for start in starts:
+            with np.load(_part_path(ckpt_dir, start)) as part:
+                ids, scores = part['ids'], part['scores']
+            valid = np.isfinite(scores)
+            rows, ranks = np.nonzero(valid)
+            if len(rows) == 0: continue
+            src = rows + start
+            dst = ids[rows, ranks]
+            table = pa.table({
+                'src_id': src,
+                'src': [comp_names[i] for i in src],
+                'dst_id': dst,
+                'dst': [comp_names[i] for i in dst],
+                'rank': (ranks + 1).astype(np.int16),
+                'score': scores[rows, ranks].astype(np.float32),
+            }, schema=SCHEMA)
+            writer.write_table(table)
+            n_edges += table.num_rows
+    os.replace(tmp, path)
+    return n_edges
+
+def load_edges(path=EDGES_PATH, columns=None, min_score=None):
+    """경쟁 관계 엣지 리스트를 DataFrame 으로 로드 (min_score 로 필터 가능)"""
+    filters = [('score', '>=', min_score)] if min_score is not None else None
+    return pq.read_table(path, columns=columns, filters=filters).to_pandas()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="전체 브랜드 경쟁 관계(top-k 유사 브랜드) 엣지 리스트 생성")
+    parser.add_argument('--k', type=int, default=20)
+    parser.add_argument('--tile-rows', type=int, default=1024, help="타일 하나의 브랜드(행) 수")
+    parser.add_argument('--budget-mb', type=int, default=1024, help="전체 스레드의 점수 행렬 메모리 예산 (MB)")
+    parser.add_argument('--threads', type=int, default=None)
+    parser.add_argument('--restart', action='store_true', help="체크포인트를 지우고 처음부터 계산")
+    parser.add_argument('--output', default=EDGES_PATH)
+    args = parser.parse_args()
+
+    if not os.path.exists(EMBEDDING_PATH):
+        raise FileNotFoundError(f"❌ 임베딩 파일이 없습니다: {EMBEDDING_PATH}")
+    embs = artifact_store.load_embeddings(EMBEDDING_PATH)['company'].numpy()
+    encoders = node_vocab.load_encoders(ENCODER_PATH)
+
+    t0 = time.perf_counter()
+    starts = compute_neighbors(embs, args.k, args.tile_rows, args.budget_mb, args.threads,
+                               manifest=file_signature(EMBEDDING_PATH), restart=args.restart)
+    n_edges = write_edges(starts, encoders['company_classes'], path=args.output)
+    print(f"✅ 경쟁 관계 엣지 {n_edges:,}개 저장 완료: {args.output} ({time.perf_counter() - t0:.2f}s)")
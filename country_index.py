@@ -0,0 +1,193 @@
+import os
+import numpy as np
+import torch
+
+from object_cache import LatestCache
+from graph_index import FILES, FILED_IN, save_artifact, load_or_build_artifact
+
+# ==========================================
+# 🌏 국가 소속 인덱스 (상표 -> 국가, 브랜드 -> 국가 비트마스크)
+# ------------------------------------------
+# 한국 브랜드를 고를 때마다 한국_DATA.xlsx 를 통째로 다시 읽고 브랜드 이름으로 대조했습니다.
+# 그래프의 (상표 -> 출원 국가) FILED_IN 엣지에서 그래프 생성 시 한 번만 계산해 저장합니다.
+# (국가 정보의 출처는 이 엣지 하나 - 비트마스크/brands()/subgraph() 가 모두 같은 엣지를 사용)
+#   trademark_country : int8 [상표 수]   countries(= country 노드 ID) 의 인덱스, 국가 엣지가 없는 상표는 -1
+#   company_mask      : int64 [브랜드 수] 비트 i = countries[i] 에 상표가 1건 이상
+#   idx = country_index.of(data, encoders)
+#   idx.brands('한국')        -> 한국 상표를 가진 브랜드 ID (오름차순)
+#   idx.brand_mask('미국')    -> bool [브랜드 수]
+# 상표명칭 결측 placeholder(Unknown_Brand)는 어느 나라 브랜드로도 보지 않습니다. (기존 엑셀 조회의 dropna 와 동일)
+#
+# 국가 유도 부분 그래프: subgraph(data, encoders, ['한국']) -> 한국 상표 + 연결된 노드만 남긴 HeteroData
+#   graph_generator.py --slice 한국 -> slices/한국/graph_data.pt (학습 --country, 분석 resources.load(country=...))
+#   slice_encoders(data, encoders) -> n_id 로 전체 그래프 이름을 골라 부분 그래프 ID 순서로 맞춘 인코더
+# ==========================================
+COUNTRY_INDEX_PATH = "./outputs/graph/country_index.pt"
+SLICE_DIR = "./outputs/graph/slices"
+MAX_COUNTRIES = 63   # int64 비트마스크
+
+class CountryIndex:
+    def __init__(self, countries, trademark_country, company_mask):
+        self.countries = list(countries)
+        self.trademark_country = trademark_country
+        self.company_mask = company_mask
+
+    @classmethod
+    def build(cls, data, encoders):
+        """graph(FILED_IN 엣지) + 인코더(국가/브랜드 이름, data 와 같은 ID 공간) -> CountryIndex"""
+        import cleaning
+        _require_countries(data, encoders)
+        countries = list(encoders['country_classes'])
+        if len(countries) > MAX_COUNTRIES:
+            raise ValueError(f"❌ 국가 수({len(countries)})가 비트마스크 한도({MAX_COUNTRIES})를 넘습니다.")
+
+        tm, cn = data[FILED_IN].edge_index.numpy()
+        tm_country = np.full(data['trademark'].num_nodes, -1, dtype=np.int8)
+        tm_country[tm] = cn
+
+        src, dst = data[FILES].edge_index.numpy()
+        has_country = tm_country[dst] >= 0
+        mask = np.zeros(data['company'].num_nodes, dtype=np.int64)
+        np.bitwise_or.at(mask, src[has_country], np.left_shift(1, tm_country[dst[has_country]].astype(np.int64)))
+        unknown = encoders['company_classes'].get(cleaning.UNKNOWN_BRAND)
+        if unknown is not None and unknown < len(mask):
+            mask[unknown] = 0
+        return cls(countries, torch.from_numpy(tm_country), torch.from_numpy(mask))
+
+    def bit(self, country):
+        return 1 << self.countries.index(country) if country in self.countries else 0
+
+    def brand_mask(self, country):
+        """bool [브랜드 수] (없는 국가면 전부 False)"""
+        return (self.company_mask & self.bit(country)) != 0
+
+    def brands(self, country):
+        """해당 국가에 상표를 가진 브랜드 ID (오름차순 LongTensor)"""
+        return self.brand_mask(country).nonzero().flatten()
+
+    def trademark_mask(self, country):
+        if country not in self.countries:
+            return torch.zeros(len(self.trademark_country), dtype=torch.bool)
+        return self.trademark_country == self.countries.index(country)
+
+    def brand_countries(self, brand_idx):
+        """브랜드 1개 -> 상표를 출원한 국가 목록"""
+        m = int(self.company_mask[int(brand_idx)])
+        return [c for i, c in enumerate(self.countries) if m >> i & 1]
+
+    def to_entry(self):
+        return {'countries': self.countries, 'trademark_country': self.trademark_country,
+                'company_mask': self.company_mask}
+
+    @classmethod
+    def from_entry(cls, entry):
+        return cls(entry['countries'], entry['trademark_country'], entry['company_mask'])
+
+def _require_countries(data, encoders):
+    if FILED_IN not in data.edge_types or 'country_classes' not in encoders:
+        raise ValueError("❌ 국가 노드가 없는 그래프입니다. graph_generator.py 로 다시 생성하세요.")
+
+def save(index, signature, path=COUNTRY_INDEX_PATH):
+    torch.save({'signature': signature, **index.to_entry()}, path)
+
+def load(path=COUNTRY_INDEX_PATH):
+    try:
+        payload = torch.load(path, weights_only=False)
+    except TypeError:
+        payload = torch.load(path)
+    return CountryIndex.from_entry(payload), payload['signature']
+
+def build_and_save(data, encoders, path=None):
+    """graph_generator 에서 그래프/인코더 저장 직후 호출"""
+    return save_artifact(data, COUNTRY_INDEX_PATH, lambda: CountryIndex.build(data, encoders), save, "국가 인덱스", path)
+
+def load_or_build(data, encoders, path=None):
+    """
+    저장된 인덱스가 현재 그래프 파일과 맞으면 재사용, 아니면 FILED_IN 엣지로 새로 만듭니다.
+    디스크 그래프가 아니면 (스냅샷/부분 그래프) 메모리에서만 만들고 저장 파일을 덮어쓰지 않습니다.
+    """
+    return load_or_build_artifact(data, COUNTRY_INDEX_PATH, lambda: CountryIndex.build(data, encoders),
+                                  load, save, "국가 인덱스", path)
+
+# ==========================================
+# ✂️ 국가 유도 부분 그래프
+# ==========================================
+def subgraph(data, encoders, countries):
+    """
+    선택한 국가의 상표와, 그 상표와 연결된 브랜드/류/유사군/국가 노드만 남긴 HeteroData.
+    노드 ID는 타입별로 0부터 다시 매기며 data[ntype].n_id 에 원래 그래프의 ID(오름차순)를 남깁니다.
+    엣지 배열만 마스킹하므로 엑셀/다른 국가 데이터를 다시 읽지 않습니다.
+    """
+    from torch_geometric.data import HeteroData
+    _require_countries(data, encoders)
+    vocab = encoders['country_classes']
+    missing = [c for c in countries if c not in vocab]
+    if missing:
+        raise ValueError(f"❌ 알 수 없는 국가: {', '.join(missing)} (가능: {', '.join(vocab)})")
+
+    index = of(data, encoders)
+    keep = {nt: torch.zeros(data[nt].num_nodes, dtype=torch.bool) for nt in data.node_types}
+    for c in countries:
+        keep['trademark'] |= index.trademark_mask(c)
+
+    # 상표에 붙은 엣지의 반대쪽 노드 (브랜드/류/유사군/국가)
+    for src_type, rel, dst_type in data.edge_types:
+        src, dst = data[src_type, rel, dst_type].edge_index
+        if src_type == 'trademark':
+            keep[dst_type][dst[keep['trademark'][src]]] = True
+        elif dst_type == 'trademark':
+            keep[src_type][src[keep['trademark'][dst]]] = True
+
+    sub = HeteroData()
+    new_id = {}
+    for nt in data.node_types:
+        n_id = keep[nt].nonzero().flatten()
+        new_id[nt] = torch.full((data[nt].num_nodes,), -1, dtype=torch.long)
+        new_id[nt][n_id] = torch.arange(len(n_id))
+        sub[nt].num_nodes = len(n_id)
+        sub[nt].n_id = n_id
+    for etype in data.edge_types:
+        src_type, _, dst_type = etype
+        src, dst = data[etype].edge_index
+        m = keep[src_type][src] & keep[dst_type][dst]
+        sub[etype].edge_index = torch.stack([new_id[src_type][src[m]], new_id[dst_type][dst[m]]], dim=0)
+        if 'edge_time' in data[etype]:
+            sub[etype].edge_time = data[etype].edge_time[m]
+    return sub
+
+def slice_dir(countries):
+    """국가 목록 -> 부분 그래프 폴더 (graph_data.pt, 학습 모델/임베딩, 파생 인덱스가 함께 저장됨)"""
+    return os.path.join(SLICE_DIR, '+'.join(countries))
+
+def slice_encoders(data, encoders):
+    """
+    부분 그래프(노드 타입별 n_id)용 인코더. 전체 그래프의 이름을 n_id 로 골라 부분 그래프 ID 순서로 만들고,
+    상표 테이블도 부분 그래프의 상표 행만 남깁니다. (분석 코드는 encoders[...][ID] 를 그대로 사용)
+    n_id 가 없는 전체 그래프면 encoders 를 그대로 반환합니다.
+    """
+    from node_vocab import NodeVocab
+    from trademark_table import TrademarkTable
+    if 'n_id' not in data['company']:
+        return encoders
+    out = dict(encoders)
+    for nt in data.node_types:
+        key = f"{nt}_classes"
+        if key in encoders and len(encoders[key]) and 'n_id' in data[nt]:
+            vocab = encoders[key]
+            out[key] = NodeVocab(names=[vocab[i] for i in data[nt].n_id.tolist()])
+    tm = encoders.get('trademarks')
+    if tm is not None:
+        rows = data['trademark'].n_id.numpy()
+        comp = data['company'].n_id.numpy()
+        comp_new = np.full(len(encoders['company_classes']), -1, dtype=np.int64)
+        comp_new[comp] = np.arange(len(comp))
+        # 상표명칭 = 상표를 출원한 브랜드이므로 부분 그래프에 항상 포함됨
+        out['trademarks'] = TrademarkTable(tm.file_id[rows], tm.row_id[rows], comp_new[tm.name_id[rows]],
+                                           tm.source_files, names=out['company_classes'])
+    return out
+
+_CACHE = LatestCache()
+
+def of(data, encoders):
+    """분석 스크립트용: 그래프 객체별로 국가 인덱스를 한 번만 읽어 재사용합니다."""
+    return _CACHE.get(data, lambda: load_or_build(data, encoders))
@@ -0,0 +1,463 @@
+import os
+import glob
+import argparse
+import json
+import hashlib
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError:  # pyarrow가 없으면 캐시 없이 엑셀을 직접 읽습니다.
+    pa = None
+    pa_ipc = None
+
+# ==========================================
+# ⚙️ 설정
+# ==========================================
+DATA_DIR = "./data"
+CACHE_DIR = "./outputs/cache"
+DATA_PATTERN = "*_DATA.xlsx"
+
+# 캐시 포맷이 바뀌면 올려서 기존 캐시를 무효화합니다.
+# 2: 출원일자를 두 캐시 모두 timestamp 로 저장 (숫자 셀 20200101 -> 2020-01-01)
+CACHE_VERSION = 2
+
+# 스트리밍 변환: 큰 엑셀(예: 중국 ~100만 행)은 pd.read_excel 로 시트 전체를 object 컬럼으로 만들지 않고
+# openpyxl read-only 행 반복으로 필요한 컬럼만 chunk 단위 Arrow 배치로 씁니다. (별도 *.stream.arrow 캐시)
+STREAM_COLUMNS = ['상표명칭', '류', '유사군', '출원일자']
+STREAM_MIN_BYTES = 64 << 20      # stream=None 이면 이 크기 이상 엑셀만 스트리밍
+STREAM_CHUNK_ROWS = 100_000
+STREAM_CATEGORIES = ('류', '유사군')   # 중복이 많은 컬럼은 사전(categorical) 인코딩
+STREAM_TAG = "stream"
+
+# 표준 컬럼명: 엑셀마다 다른 컬럼명을 한 곳에서 통일합니다. (앞쪽 후보 우선)
+COLUMN_ALIASES = {
+    '상표명칭': ['상표명칭'],
+    '류': ['류', '주요_류', '상품류', 'class'],
+    '유사군': ['유사군', '유사군코드', 'similar_group'],
+    '출원일자': ['출원일자', '출원일'],
+    '지정상품': ['지정상품'],
+}
+
+# ==========================================
+# 🧹 컬럼 정규화
+# ==========================================
+def _alias_map(columns):
+    """{원본 컬럼명: 표준 컬럼명} (표준 컬럼명이 이미 있으면 별칭은 무시)"""
+    col_map = {}
+    for canonical, aliases in COLUMN_ALIASES.items():
+        if canonical in columns: continue
+        for c in aliases:
+            if c in columns and c not in col_map:
+                col_map[c] = canonical
+                break
+    return col_map
+
+def normalize_columns(df):
+    """컬럼명 공백 제거 후 별칭을 표준 컬럼명으로 변경합니다."""
+    df.columns = [str(c).strip() for c in df.columns]
+    col_map = _alias_map(list(df.columns))
+    if col_map:
+        df = df.rename(columns=col_map)
+    return df
+
+def _date_input(v):
+    """출원일자 셀 1개 -> to_datetime 입력. 숫자 셀(20200101, 20200101.0)은 yyyymmdd 문자열로 바꿔
+    나노초 epoch(1970-01-01)로 읽히지 않게 합니다."""
+    if isinstance(v, (bool, np.bool_)):
+        return str(v)
+    if isinstance(v, (int, np.integer)):
+        return str(int(v))
+    if isinstance(v, (float, np.floating)):
+        return str(int(v)) if float(v).is_integer() else str(v)
+    if isinstance(v, str):
+        return v.strip()
+    return v    # datetime / Timestamp / None
+
+def normalize_dates(values):
+    """출원일자 값 목록 -> datetime64[ns] Series. 전체 캐시와 스트리밍 캐시가 같은 규칙을 사용 (변환 불가 = NaT)"""
+    if isinstance(values, pd.Series) and pd.api.types.is_datetime64_any_dtype(values):
+        return values.reset_index(drop=True)
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    parsed = pd.to_datetime(pd.Series([_date_input(v) for v in uniques], dtype=object), format='mixed', errors='coerce')
+    return pd.Series(pd.DatetimeIndex(parsed).take(codes, allow_fill=True, fill_value=pd.NaT))
+
+def _to_arrow_friendly(df):
+    """object 컬럼(문자/숫자 혼재)을 문자열로 통일해 Arrow 타입을 고정합니다. 결측치는 유지."""
+    for c in df.columns:
+        if df[c].dtype == object:
+            s = df[c]
+            df[c] = s.where(s.isna(), s.astype(str))
+    return df
+
+def country_of(path):
+    """'한국_DATA.xlsx' -> '한국'"""
+    return os.path.basename(path).split('_')[0]
+
+# ==========================================
+# 🔑 캐시 키 (mtime + 해시)
+# ==========================================
+def _file_sha1(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        while True:
+            buf = f.read(chunk_size)
+            if not buf: break
+            h.update(buf)
+    return h.hexdigest()
+
+def _cache_paths(path, sheet=0, tag=None):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if sheet:
+        stem = f"{stem}.s{sheet}"
+    if tag:
+        stem = f"{stem}.{tag}"
+    return (os.path.join(CACHE_DIR, f"{stem}.arrow"),
+            os.path.join(CACHE_DIR, f"{stem}.meta.json"))
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_meta(meta_path, meta):
+    tmp = f"{meta_path}.{os.getpid()}.tmp"   # 프로세스별 임시 파일 (병렬 워커가 같은 메타를 써도 안전)
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp, meta_path)
+
+def _is_cache_valid(path, arrow_path, meta_path):
+    """
+    1) 크기 + mtime 이 같으면 해시 계산 없이 바로 사용
+    2) mtime만 바뀌었으면(복사/touch) 해시로 재확인 후 메타만 갱신
+    """
+    meta = _read_meta(meta_path)
+    if meta is None or meta.get('version') != CACHE_VERSION or not os.path.exists(arrow_path):
+        return False
+
+    st = os.stat(path)
+    if meta['size'] != st.st_size:
+        return False
+    if meta['mtime'] == st.st_mtime:
+        return True
+    if meta['sha1'] == _file_sha1(path):
+        meta['mtime'] = st.st_mtime
+        _write_meta(meta_path, meta)
+        return True
+    return False
+
+# ==========================================
+# 📦 캐시 생성 & 로드
+# ==========================================
+def read_workbook_raw(path, sheet=0):
+    """엑셀 원본을 읽고 컬럼명/출원일자를 정규화합니다. (캐시 미사용)"""
+    df = normalize_columns(pd.read_excel(path, sheet_name=sheet))
+    if '출원일자' in df.columns:
+        df['출원일자'] = normalize_dates(df['출원일자']).set_axis(df.index)
+    return df
+
+def build_cache(path, sheet=0):
+    """엑셀 시트 1개를 Arrow IPC(Feather v2) 파일로 변환합니다."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    arrow_path, meta_path = _cache_paths(path, sheet)
+
+    df = _to_arrow_friendly(read_workbook_raw(path, sheet))
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    # 압축 없이 저장해야 mmap으로 바로 읽을 수 있습니다.
+    # (프로세스별 임시 파일 -> os.replace 로 병렬 생성 시에도 안전)
+    tmp = f"{arrow_path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp, 'wb') as sink:
+        with pa_ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, arrow_path)
+    _write_cache_meta(path, sheet, meta_path, table.num_rows)
+    return arrow_path
+
+def _write_cache_meta(path, sheet, meta_path, rows, **extra):
+    st = os.stat(path)
+    _write_meta(meta_path, {
+        'version': CACHE_VERSION,
+        'source': os.path.basename(path),
+        'sheet': sheet,
+        'size': st.st_size,
+        'mtime': st.st_mtime,
+        'sha1': _file_sha1(path),
+        'rows': rows,
+        **extra,
+    })
+
+# ==========================================
+# 🌊 스트리밍 캐시 (openpyxl read-only, 필요한 컬럼만)
+# ==========================================
+def _stream_type(name):
+    if name == '출원일자':
+        return pa.timestamp('ns')
+    if name in STREAM_CATEGORIES:
+        return pa.dictionary(pa.int32(), pa.string())
+    return pa.string()
+
+def _use_stream(path, columns, stream):
+    """요청 컬럼이 스트리밍 캐시 컬럼 안에 있을 때만 스트리밍 (None 이면 파일 크기로 결정)"""
+    if pa is None or columns is None or not set(columns) <= set(STREAM_COLUMNS):
+        return False
+    if stream is None:
+        return os.path.getsize(path) >= STREAM_MIN_BYTES
+    return stream
+
+def _stream_array(name, values, dictionaries):
+    """chunk 한 컬럼(파이썬 값 목록) -> Arrow 배열. 문자/숫자 혼재 값은 문자열, 날짜는 timestamp"""
+    if name == '출원일자':
+        return pa.array(normalize_dates(values), type=_stream_type(name), from_pandas=True)
+    strings = [None if v is None else str(v) for v in values]
+    if name not in dictionaries:
+        return pa.array(strings, type=pa.string())
+    # 류/유사군: 파일 전체에서 커지는 사전(categorical) -> 배치마다 사전 delta 만 기록
+    lookup = dictionaries[name]
+    codes = [None if v is None else lookup.setdefault(v, len(lookup)) for v in strings]
+    return pa.DictionaryArray.from_arrays(pa.array(codes, type=pa.int32()), pa.array(list(lookup), type=pa.string()))
+
+def build_stream_cache(path, sheet=0, chunk_rows=STREAM_CHUNK_ROWS):
+    """
+    엑셀 시트 1개를 행 반복으로 읽어 STREAM_COLUMNS 만 Arrow 파일로 씁니다.
+    - 메모리에는 chunk_rows 행의 파이썬 값만 올라감 (시트 전체 DataFrame 을 만들지 않음)
+    - 빈 행은 pd.read_excel 과 같이 건너뜀 -> 행 번호(Row_ID)가 전체 캐시와 같습니다.
+    """
+    import openpyxl
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    arrow_path, meta_path = _cache_paths(path, sheet, STREAM_TAG)
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    tmp = f"{arrow_path}.{os.getpid()}.tmp"
+    try:
+        rows = wb.worksheets[sheet].iter_rows(values_only=True)
+        header = [str(c).strip() if c is not None else "" for c in next(rows, ())]
+        col_map = _alias_map(header)
+        pos = {}
+        for i, name in enumerate(col_map.get(c, c) for c in header):
+            if name in STREAM_COLUMNS and name not in pos:
+                pos[name] = i
+        cols = [c for c in STREAM_COLUMNS if c in pos]
+        schema = pa.schema([(c, _stream_type(c)) for c in cols])
+        dictionaries = {c: {} for c in cols if c in STREAM_CATEGORIES}
+
+        n_rows = 0
+        options = pa_ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+        with pa.OSFile(tmp, 'wb') as sink, pa_ipc.new_file(sink, schema, options=options) as writer:
+            buf = []
+            def flush():
+                columns = [_stream_array(c, [r[pos[c]] if pos[c] < len(r) else None for r in buf], dictionaries)
+                           for c in cols]
+                writer.write_batch(pa.record_batch(columns, schema=schema))
+                buf.clear()
+
+            for row in rows:
+                if all(v is None for v in row): continue
+                buf.append(row)
+                n_rows += 1
+                if len(buf) >= chunk_rows: flush()
+            if buf: flush()
+        os.replace(tmp, arrow_path)
+    finally:
+        wb.close()
+        if os.path.exists(tmp): os.remove(tmp)
+
+    _write_cache_meta(path, sheet, meta_path, n_rows, columns=cols, chunk_rows=chunk_rows)
+    return arrow_path
+
+def ensure_cache(path, sheet=0, columns=None, stream=None):
+    """
+    캐시가 유효하면 그대로, 아니면 새로 만들어 Arrow 파일 경로를 반환합니다.
+    columns 가 STREAM_COLUMNS 안에 있고 스트리밍 대상이면(stream=True, 또는 None + 큰 파일)
+    전체 캐시 대신 필요한 컬럼만 담은 스트리밍 캐시를 사용합니다. (전체 캐시가 이미 있으면 그것을 사용)
+    """
+    arrow_path, meta_path = _cache_paths(path, sheet)
+    if _is_cache_valid(path, arrow_path, meta_path):
+        return arrow_path
+    suffix = f" (sheet {sheet})" if sheet else ""
+    if _use_stream(path, columns, stream):
+        stream_path, stream_meta = _cache_paths(path, sheet, STREAM_TAG)
+        if _is_cache_valid(path, stream_path, stream_meta):
+            return stream_path
+        print(f"🌊 컬럼형 캐시 생성 중 (스트리밍): {os.path.basename(path)}{suffix}")
+        return build_stream_cache(path, sheet)
+    print(f"📦 컬럼형 캐시 생성 중: {os.path.basename(path)}{suffix}")
+    return build_cache(path, sheet)
+
+def _read_arrow(arrow_path, columns=None):
+    source = pa.memory_map(arrow_path, 'r')
+    table = pa_ipc.open_file(source).read_all()
+    if columns is not None:
+        table = table.select([c for c in columns if c in table.column_names])
+    return table
+
+def _table_to_frame(table):
+    df = table.to_pandas()
+    # Arrow의 null(None)을 엑셀 로드 시와 같은 NaN으로 맞춥니다.
+    for c in df.columns:
+        if df[c].dtype == object:
+            df[c] = df[c].where(df[c].notna(), np.nan)
+    return df
+
+def load_table(path, columns=None, sheet=0, stream=None):
+    """캐시된 Arrow 테이블을 memory-map으로 엽니다."""
+    return _read_arrow(ensure_cache(path, sheet, columns, stream), columns)
+
+def load_workbook(path, columns=None, stream=None):
+    """
+    엑셀 1개를 정규화된 DataFrame으로 반환합니다.
+    첫 실행에서만 엑셀을 파싱하고, 이후에는 Arrow 캐시에서 바로 읽습니다.
+    """
+    if pa is None:
+        df = read_workbook_raw(path)
+        return df[[c for c in columns if c in df.columns]] if columns is not None else df
+    return _table_to_frame(load_table(path, columns, stream=stream))
+
+def iter_cache_chunks(arrow_path, columns=None, chunk_rows=STREAM_CHUNK_ROWS):
+    """
+    Arrow 캐시를 chunk_rows 행씩 DataFrame 으로 반환 (index = 엑셀 데이터 행 번호).
+    배치를 하나씩 mmap 에서 변환하므로 파일 전체 DataFrame 을 만들지 않습니다.
+    """
+    reader = pa_ipc.open_file(pa.memory_map(arrow_path, 'r'))
+    names = reader.schema.names if columns is None else [c for c in columns if c in reader.schema.names]
+    start = 0
+    for i in range(reader.num_record_batches):
+        batch = reader.get_batch(i).select(names)
+        for offset in range(0, batch.num_rows, chunk_rows):
+            df = _table_to_frame(pa.Table.from_batches([batch.slice(offset, chunk_rows)]))
+            df.index = pd.RangeIndex(start, start + len(df))
+            start += len(df)
+            yield df
+
+def iter_workbook_chunks(path, columns=None, chunk_rows=STREAM_CHUNK_ROWS, stream=None):
+    """엑셀 1개를 chunk 단위 DataFrame 으로 (pyarrow 가 없으면 전체를 읽은 뒤 나눔)"""
+    if pa is None:
+        df = load_workbook(path, columns)
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start:start + chunk_rows]
+        return
+    yield from iter_cache_chunks(ensure_cache(path, 0, columns, stream), columns, chunk_rows)
+
+# ==========================================
+# ⚡ 병렬 로드 (프로세스 풀)
+# ==========================================
+def _ingest_task(path, sheet, columns=None, stream=None):
+    """
+    [워커] 엑셀 시트를 파싱해 Arrow 캐시로 저장하고 경로만 반환합니다.
+    DataFrame을 pickle로 넘기지 않고, 부모 프로세스가 같은 파일을 mmap으로 읽습니다.
+    """
+    t0 = time.time()
+    arrow_path = ensure_cache(path, sheet, columns, stream)
+    return arrow_path, time.time() - t0
+
+def _sheet_indices(path):
+    with pd.ExcelFile(path) as xf:   # 파일 핸들을 바로 닫음 (Windows 에서 엑셀 파일 잠금 방지)
+        return list(range(len(xf.sheet_names)))
+
+def prepare_caches(paths, columns=None, workers=None, all_sheets=False, stream=None):
+    """
+    여러 엑셀의 Arrow 캐시를 병렬로 준비하여 {(경로, 시트): Arrow 경로} 로 반환합니다.
+    - 파일(및 all_sheets=True 이면 시트) 단위로 프로세스 풀에서 동시에 파싱
+    - 실패한 파일은 경고 출력 후 건너뜀 (결과 dict 에서 제외)
+    - workers=1 이면 기존처럼 순차 처리
+    """
+    tasks = []
+    for path in paths:
+        if all_sheets:
+            try:
+                tasks += [(path, sh) for sh in _sheet_indices(path)]
+            except Exception as e:
+                print(f"⚠️ {path} 로드 실패: {e}")
+        else:
+            tasks.append((path, 0))
+
+    if workers is None:
+        workers = min(len(tasks), os.cpu_count() or 1)
+
+    sheet_paths = {}   # (path, sheet) -> arrow 경로
+    failed = set()
+
+    if workers <= 1:
+        for path, sheet in tqdm(tasks, desc="Loading Excel"):
+            if path in failed: continue
+            try:
+                sheet_paths[(path, sheet)] = ensure_cache(path, sheet, columns, stream)
+            except Exception as e:
+                print(f"⚠️ {path} 로드 실패: {e}")
+                failed.add(path)
+    else:
+        print(f"⚡ 병렬 로드: {len(tasks)}개 작업 / 워커 {workers}개")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_ingest_task, path, sheet, columns, stream): (path, sheet) for path, sheet in tasks}
+            for fut in tqdm(as_completed(futures), total=len(futures), desc="Loading Excel"):
+                path, sheet = futures[fut]
+                try:
+                    arrow_path, elapsed = fut.result()
+                    sheet_paths[(path, sheet)] = arrow_path
+                    label = f"{os.path.basename(path)}" + (f" [sheet {sheet}]" if all_sheets else "")
+                    tqdm.write(f"   ✅ {label} ({elapsed:.1f}s)")
+                except Exception as e:
+                    if path not in failed:
+                        tqdm.write(f"⚠️ {path} 로드 실패: {e}")
+                    failed.add(path)
+
+    return {k: v for k, v in sheet_paths.items() if k[0] not in failed}
+
+def load_workbooks(paths, columns=None, workers=None, all_sheets=False, stream=None):
+    """
+    여러 엑셀을 병렬로 로드하여 {경로: DataFrame} 으로 반환합니다. (캐시 준비는 prepare_caches)
+    실패한 파일은 결과 dict 에서 제외됩니다.
+    """
+    if pa is None:
+        # 캐시를 쓸 수 없으면 기존처럼 순차 로드
+        frames = {}
+        for path in tqdm(paths, desc="Loading Excel"):
+            try:
+                frames[path] = load_workbook(path, columns)
+            except Exception as e:
+                print(f"⚠️ {path} 로드 실패: {e}")
+        return frames
+
+    sheet_paths = prepare_caches(paths, columns, workers, all_sheets, stream)
+    results = {}
+    for path in paths:
+        keys = sorted(k for k in sheet_paths if k[0] == path)
+        if not keys: continue
+        tables = [_read_arrow(sheet_paths[k], columns) for k in keys]
+        table = tables[0] if len(tables) == 1 else pa.concat_tables(tables, promote_options='default')
+        results[path] = _table_to_frame(table)
+    return results
+
+def list_workbooks(data_dir=DATA_DIR, pattern=DATA_PATTERN):
+    return sorted(glob.glob(os.path.join(data_dir, pattern)))
+
+def find_workbook(country, data_dir=DATA_DIR):
+    """국가명으로 엑셀 파일을 찾습니다. (예: '한국' -> ./data/한국_DATA.xlsx)"""
+    path = os.path.join(data_dir, f"{country}_DATA.xlsx")
+    if os.path.exists(path):
+        return path
+    files = glob.glob(os.path.join(data_dir, f"*{country}*.xlsx"))
+    return files[0] if files else None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="엑셀 -> Arrow 캐시 미리 변환 (warm-up, 병렬)")
+    parser.add_argument('--stream', action='store_true', help="그래프용 컬럼만 스트리밍 캐시로 변환 (큰 엑셀 메모리 절약)")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.stream:
+        caches = prepare_caches(list_workbooks(), columns=STREAM_COLUMNS, workers=args.workers, stream=True)
+        for (f, _), arrow_path in caches.items():
+            rows = _read_meta(arrow_path[:-len(".arrow")] + ".meta.json")['rows']
+            print(f"✅ {os.path.basename(f)}: {rows:,}행 스트리밍 캐시 준비 완료")
+    else:
+        frames = load_workbooks(list_workbooks(), workers=args.workers)
+        for f, df in frames.items():
+            print(f"✅ {os.path.basename(f)}: {len(df):,}행 캐시 준비 완료")
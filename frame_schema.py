@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (string[pyarrow] dtype)
+    TEXT_DTYPE = "string[pyarrow]"
+except ImportError:  # pyarrow가 없으면 문자열 컬럼은 그대로 object
+    TEXT_DTYPE = object
+
+# ==========================================
+# 🧮 통합 DataFrame 컬럼 타입 (스키마 기반 압축)
+# ------------------------------------------
+# 국가/류/유사군처럼 값 종류가 적은 컬럼을 object 로 두면 120만 행마다 파이썬 문자열 객체를 들고 있고,
+# 파생 컬럼(개수/길이/연/월)은 int64 로 8바이트씩 차지합니다.
+#   - CATEGORY : pandas categorical (코드 + 고유값)
+#   - TEXT     : Arrow 기반 문자열 (string[pyarrow])
+#   - INT      : 값 범위에 맞는 가장 작은 정수 (결측이 있으면 nullable Int8/Int16)
+#   - DATETIME : datetime64
+# 스키마에 없는 object 컬럼은 고유값 비율로 CATEGORY / TEXT 를 자동 선택합니다.
+# ==========================================
+CATEGORY = 'category'
+TEXT = 'text'
+INT = 'int'
+DATETIME = 'datetime'
+
+CATEGORY_MAX_RATIO = 0.5   # 고유값 수 / 행 수 가 이 이하이면 categorical
+
+# market_trend_analyzer.load_all_data
+TREND_SCHEMA = {
+    'Name': TEXT, 'Date': DATETIME, 'Class': INT, 'Country': CATEGORY, 'Group': CATEGORY,
+    'Year': INT, 'Month': INT,
+}
+
+# basic_analysis (원본 컬럼 + 전처리 컬럼)
+BASIC_SCHEMA = {
+    '상표명칭': TEXT, '출원일자': DATETIME, '류': CATEGORY, '유사군': CATEGORY, '지정상품': TEXT,
+    '국가': CATEGORY, '주요_류': CATEGORY, '지정상품_개수': INT, '상표명_길이': INT,
+}
+
+def compact_int(s):
+    """정수(또는 결측 포함 실수) 컬럼 -> 값 범위에 맞는 가장 작은 정수 타입"""
+    if s.isna().any():
+        return pd.to_numeric(s.astype('Int64'), downcast='integer')
+    return pd.to_numeric(s, downcast='integer')
+
+def _is_low_cardinality(s):
+    return s.nunique(dropna=True) <= max(1, len(s) * CATEGORY_MAX_RATIO)
+
+def convert_column(s, kind):
+    if kind == CATEGORY:
+        return s if isinstance(s.dtype, pd.CategoricalDtype) else s.astype('category')
+    if kind == TEXT:
+        return s.astype(TEXT_DTYPE)
+    if kind == INT:
+        return compact_int(s)
+    if kind == DATETIME:
+        return s if pd.api.types.is_datetime64_any_dtype(s) else pd.to_datetime(s, errors='coerce')
+    raise ValueError(f"알 수 없는 컬럼 타입: {kind}")
+
+def apply_schema(df, schema):
+    """스키마대로 컬럼 타입을 바꿉니다. (스키마에 없는 object 컬럼은 자동 선택, 나머지는 그대로)"""
+    for col in df.columns:
+        kind = schema.get(col)
+        if kind is None:
+            if df[col].dtype != object: continue
+            kind = CATEGORY if _is_low_cardinality(df[col]) else TEXT
+        df[col] = convert_column(df[col], kind)
+    return df
+
+def memory_report(before, df, title="메모리 사용량"):
+    """before = 변환 전 df.memory_usage(deep=True). 컬럼별 이전/이후 크기와 dtype 출력"""
+    after = df.memory_usage(deep=True)
+    mb = 1 / 2**20
+    print(f"\n🧮 {title} (memory_usage(deep=True), {len(df):,}행)")
+    print(f"   {'컬럼':<14}{'이전 MB':>10}{'이후 MB':>10}  dtype")
+    for col in df.columns:
+        prev = before.get(col, np.nan)
+        print(f"   {str(col):<14}{prev * mb:>10.1f}{after[col] * mb:>10.1f}  {df[col].dtype}")
+    total_before, total_after = before.sum(), after.sum()
+    print(f"   {'합계':<14}{total_before * mb:>10.1f}{total_after * mb:>10.1f}  "
+          f"({total_after / max(total_before, 1):.0%})")
@@ -1,15 +1,15 @@
 import torch
-import torch.nn.functional as F
 import os
+import argparse
 import numpy as np
-import pandas as pd
-import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib import font_manager, rc
-import platform
+import node_vocab
+import render_pool
+import artifact_store
+import graph_index
+import brand_counts
+from graph_index import FILES, BELONGS_TO
 import random
-import glob
-from matplotlib.lines import Line2D # 범례 생성을 위해 추가
+import country_index
 
 # ==========================================
 # ⚙️ 설정
@@ -17,80 +17,25 @@ from matplotlib.lines import Line2D # 범례 생성을 위해 추가
 GRAPH_PATH = "./outputs/graph/graph_data.pt"
 ENCODER_PATH = "./outputs/graph/label_encoders.pt"
 EMBEDDING_PATH = "./outputs/graph/dgl_node_embeddings_v3.pt"
-DATA_DIR = "./data"
 OUTPUT_DIR = "./outputs/graph/gnn"
 
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-# 전역 폰트 변수
-GLOBAL_FONT_NAME = "sans-serif"
-
 # ==========================================
 # 🛠️ 유틸리티: 폰트 & 데이터 로드
 # ==========================================
-def init_font():
-    """시각화용 다국어 폰트 설정"""
-    global GLOBAL_FONT_NAME
-    system_name = platform.system()
-    
-    if system_name == 'Windows':
-        candidates = [
-            ("c:/Windows/Fonts/malgun.ttf", "Malgun Gothic"),
-            ("c:/Windows/Fonts/msyh.ttf", "Microsoft YaHei"),
-        ]
-    elif system_name == 'Darwin':
-        candidates = [("/System/Library/Fonts/Supplemental/AppleGothic.ttf", "AppleGothic")]
-    else:
-        candidates = [("/usr/share/fonts/truetype/nanum/NanumGothic.ttf", "NanumGothic")]
-
-    for fpath, fname in candidates:
-        if os.path.exists(fpath):
-            try:
-                font_manager.fontManager.addfont(fpath)
-                GLOBAL_FONT_NAME = font_manager.FontProperties(fname=fpath).get_name()
-                rc('font', family=GLOBAL_FONT_NAME)
-                print(f"🔤 시각화 폰트 로드: {GLOBAL_FONT_NAME}")
-                break
-            except: continue
-    plt.rcParams['axes.unicode_minus'] = False
-
 def load_resources():
     print("🔄 분석 리소스 로드 중...")
     if not os.path.exists(EMBEDDING_PATH):
         raise FileNotFoundError(f"❌ 임베딩 파일이 없습니다.")
 
-    try:
-        data = torch.load(GRAPH_PATH, map_location='cpu', weights_only=False)
-        encoders = torch.load(ENCODER_PATH, weights_only=False)
-        embeddings = torch.load(EMBEDDING_PATH, map_location='cpu')
-    except TypeError:
-        data = torch.load(GRAPH_PATH, map_location='cpu')
-        encoders = torch.load(ENCODER_PATH)
-        embeddings = torch.load(EMBEDDING_PATH, map_location='cpu')
+    data = artifact_store.load_graph(GRAPH_PATH)
+    embeddings = artifact_store.load_embeddings(EMBEDDING_PATH)
+    encoders = node_vocab.load_encoders(ENCODER_PATH)
     
     print("✅ 데이터 로드 완료!")
     return data, encoders, embeddings
 
-def get_korean_brands():
-    """'한국_DATA.xlsx'를 읽어 한국 브랜드 목록을 추출합니다."""
-    korean_file = os.path.join(DATA_DIR, "한국_DATA.xlsx")
-    
-    if not os.path.exists(korean_file):
-        files = glob.glob(os.path.join(DATA_DIR, "*한국*.xlsx"))
-        if not files:
-            raise FileNotFoundError("❌ 한국 데이터 파일을 찾을 수 없습니다.")
-        korean_file = files[0]
-    
-    print(f"🇰🇷 한국 데이터 로드 중: {os.path.basename(korean_file)}")
-    df = pd.read_excel(korean_file)
-    
-    if '상표명칭' in df.columns: target_col = '상표명칭'
-    elif '출원인' in df.columns: target_col = '출원인'
-    else: target_col = df.columns[0]
-    
-    brands = df[target_col].dropna().astype(str).unique()
-    return set(brands)
-
 # ==========================================
 # 🧠 AI 분석 엔진
 # ==========================================
@@ -100,21 +45,17 @@ def get_top_korean_brands(data, encoders, top_k=5):
     한국 브랜드 중에서 '보유 상표 수(Degree)'가 가장 많은 상위 K개 기업을 선정합니다.
     이유: 데이터가 풍부할수록 GNN 예측의 신뢰도가 높기 때문입니다.
     """
-    korean_brands_set = get_korean_brands()
     comp_names = encoders['company_classes']
     
-    korean_indices = []
-    for idx, name in enumerate(comp_names):
-        if name in korean_brands_set:
-            korean_indices.append(idx)
+    # 그래프 생성 시 저장한 국가 비트마스크 조회 (엑셀 재로드/이름 대조 없음)
+    korean_indices = country_index.of(data, encoders).brands('한국').tolist()
             
     if not korean_indices:
         print("❌ 매칭되는 한국 브랜드가 없습니다.")
         return [], []
 
     # 전체 기업의 상표 보유 수 계산
-    edge_index = data['company', 'files', 'trademark'].edge_index
-    all_degrees = torch.bincount(edge_index[0], minlength=len(comp_names))
+    all_degrees = graph_index.of(data).degree(FILES)
     
     # 한국 브랜드만 필터링
     korean_degrees = all_degrees[korean_indices]
@@ -134,15 +75,7 @@ def predict_expansion(data, encoders, embeddings, brand_idx, top_k=3):
     class_embs = embeddings['class']
     scores = torch.matmul(class_embs, comp_emb)
     
-    edge_ct = data['company', 'files', 'trademark'].edge_index
-    edge_tc = data['trademark', 'belongs_to', 'class'].edge_index
-    
-    my_tm_mask = (edge_ct[0] == brand_idx)
-    my_tm_indices = edge_ct[1][my_tm_mask]
-    
-    my_class_mask = torch.isin(edge_tc[0], my_tm_indices)
-    my_class_indices = edge_tc[1][my_class_mask]
-    my_unique_classes = torch.unique(my_class_indices)
+    my_unique_classes, _ = brand_counts.of(data)['class'].row(brand_idx)
     
     scores[my_unique_classes] = -9999.0 # 이미 보유한 류 제외
     
@@ -158,96 +91,83 @@ def predict_expansion(data, encoders, embeddings, brand_idx, top_k=3):
 # ==========================================
 # 🎨 시각화 (범례 추가됨)
 # ==========================================
-def visualize_expansion(data, encoders, brand_name, recommendations, max_nodes=15):
-    brand_idx = np.where(encoders['company_classes'] == brand_name)[0][0]
+def expansion_spec(data, encoders, brand_name, recommendations, max_nodes=15):
+    """신사업 추천 관계도 플롯 스펙 (render_pool 에서 렌더링)"""
+    brand_idx = encoders['company_classes'].index(brand_name)
     
     # 데이터 준비
-    edge_ct = data['company', 'files', 'trademark'].edge_index
-    my_tm_indices = edge_ct[1][edge_ct[0] == brand_idx].tolist()
+    index = graph_index.of(data)
+    my_tm_indices = index.neighbors(FILES, brand_idx).tolist()
     if len(my_tm_indices) > max_nodes:
         my_tm_indices = random.sample(my_tm_indices, max_nodes)
         
-    edge_tc = data['trademark', 'belongs_to', 'class'].edge_index
-    tm_names = encoders['trademark_classes']
+    tm_table = encoders['trademarks']
     class_names = encoders['class_classes']
 
-    # 그래프 생성
-    G = nx.Graph()
-    G.add_node(brand_name, type='brand', size=2500, color='#FF6B6B')
+    nodes = {brand_name: (brand_name, 'brand')}
+    edges = []
 
     # 1. 현재 보유 (실선)
     for tm_idx in my_tm_indices:
-        short_name = tm_names[tm_idx].split('_')[0][:6]
+        short_name = tm_table.display_name(tm_idx)[:6]
         tm_node = f"TM:{tm_idx}"
         
-        G.add_node(tm_node, label=short_name, type='trademark', size=600, color='#4ECDC4')
-        G.add_edge(brand_name, tm_node, style='solid', color='gray')
+        nodes[tm_node] = (short_name, 'trademark')
+        edges.append((brand_name, tm_node, 'solid'))
 
-        mask_c = (edge_tc[0] == tm_idx)
-        for c_idx in edge_tc[1][mask_c].tolist():
+        for c_idx in index.neighbors(BELONGS_TO, tm_idx).tolist():
             c_name = class_names[c_idx]
             c_node = f"Class:{c_name}"
-            if c_node not in G:
-                G.add_node(c_node, label=f"{c_name}류", type='class', size=1200, color='#FFE66D')
-            G.add_edge(tm_node, c_node, style='solid', color='gray')
+            if c_node not in nodes:
+                nodes[c_node] = (f"{c_name}류", 'class')
+            edges.append((tm_node, c_node, 'solid'))
 
     # 2. 미래 예측 (점선)
     for rank, (rec_class, score) in enumerate(recommendations):
         rec_node = f"Class:{rec_class}"
-        if rec_node in G: continue
+        if rec_node in nodes: continue
         
-        label = f"★추천{rank+1}\n{rec_class}류"
-        G.add_node(rec_node, label=label, type='recommendation', size=1500, color='#A8DADC')
-        G.add_edge(brand_name, rec_node, style='dashed', color='#FF6B6B')
+        nodes[rec_node] = (f"★추천{rank+1}\n{rec_class}류", 'recommendation')
+        edges.append((brand_name, rec_node, 'dashed'))
 
-    # 그리기
-    plt.figure(figsize=(16, 12))
-    pos = nx.spring_layout(G, k=0.9, seed=42)
-    
-    for n, d in G.nodes(data=True):
-        nx.draw_networkx_nodes(G, pos, nodelist=[n], node_color=d['color'], node_size=d['size'], alpha=0.9)
-    
-    edges = G.edges(data=True)
-    solid = [(u,v) for u,v,d in edges if d.get('style')=='solid']
-    dashed = [(u,v) for u,v,d in edges if d.get('style')=='dashed']
-    
-    nx.draw_networkx_edges(G, pos, edgelist=solid, width=1.0, edge_color='gray', alpha=0.5)
-    nx.draw_networkx_edges(G, pos, edgelist=dashed, width=2.5, edge_color='#FF6B6B', style='dashed')
-    
-    labels = {n: G.nodes[n].get('label', n) for n in G.nodes}
-    labels[brand_name] = brand_name
-    nx.draw_networkx_labels(G, pos, labels, font_size=9, font_family=GLOBAL_FONT_NAME, font_weight='bold')
-    
-    # ---------------------------------------------------------
-    # 📝 [추가됨] 범례 (Legend) 설정
-    # ---------------------------------------------------------
-    legend_elements = [
-        Line2D([0], [0], marker='o', color='w', label='Brand (분석 대상)', markerfacecolor='#FF6B6B', markersize=15),
-        Line2D([0], [0], marker='o', color='w', label='Trademark (보유 상표)', markerfacecolor='#4ECDC4', markersize=10),
-        Line2D([0], [0], marker='o', color='w', label='Current Class (현재 사업)', markerfacecolor='#FFE66D', markersize=12),
-        Line2D([0], [0], marker='o', color='w', label='AI Recommendation (추천 신사업)', markerfacecolor='#A8DADC', markersize=15),
-        Line2D([0], [0], color='gray', lw=1, label='Current Link (현황)'),
-        Line2D([0], [0], color='#FF6B6B', lw=2, linestyle='--', label='AI Predicted Link (예측)')
-    ]
-    plt.legend(handles=legend_elements, loc='upper left', prop={'size': 11, 'family': GLOBAL_FONT_NAME})
-
-    plt.title(f"Korea Brand Expansion Prediction: {brand_name}", fontsize=16, fontfamily=GLOBAL_FONT_NAME)
-    plt.axis('off')
-    
     safe_name = "".join([c if c.isalnum() else "_" for c in brand_name])
-    save_path = os.path.join(OUTPUT_DIR, f"KR_Expansion_{safe_name}.png")
-    plt.savefig(save_path, dpi=300, bbox_inches='tight')
+    return {
+        'title': f"Korea Brand Expansion Prediction: {brand_name}",
+        'save_path': os.path.join(OUTPUT_DIR, f"KR_Expansion_{safe_name}.png"),
+        'layout_k': 0.9, 'seed': 42, 'font_size': 9, 'font_weight': 'bold',
+        'nodes': [(n, label, ntype) for n, (label, ntype) in nodes.items()],
+        'node_styles': {'brand': ('#FF6B6B', 2500), 'trademark': ('#4ECDC4', 600),
+                        'class': ('#FFE66D', 1200), 'recommendation': ('#A8DADC', 1500)},
+        'edges': edges,
+        'edge_styles': {'solid': dict(width=1.0, edge_color='gray', alpha=0.5),
+                        'dashed': dict(width=2.5, edge_color='#FF6B6B', style='dashed')},
+        # 📝 범례 (Legend)
+        'legend': [
+            ('node', 'Brand (분석 대상)', '#FF6B6B', 15),
+            ('node', 'Trademark (보유 상표)', '#4ECDC4', 10),
+            ('node', 'Current Class (현재 사업)', '#FFE66D', 12),
+            ('node', 'AI Recommendation (추천 신사업)', '#A8DADC', 15),
+            ('line', 'Current Link (현황)', 'gray', 1, '-'),
+            ('line', 'AI Predicted Link (예측)', '#FF6B6B', 2, '--'),
+        ],
+    }
+
+def visualize_expansion(data, encoders, brand_name, recommendations, max_nodes=15):
+    save_path = render_pool.render(expansion_spec(data, encoders, brand_name, recommendations, max_nodes))
     print(f"🖼️ 결과 저장: {save_path}")
-    plt.close()
 
 if __name__ == "__main__":
-    init_font()
+    parser = argparse.ArgumentParser(description="한국 상위 브랜드 신사업 확장 예측")
+    parser.add_argument('--no-plot', action='store_true', help="텍스트 결과만 출력 (matplotlib/networkx 를 로드하지 않음)")
+    parser.add_argument('--render-workers', type=int, default=None, help="시각화 렌더링 프로세스 수 (기본: CPU 수, 1 이면 순차)")
+    args = parser.parse_args()
     data, encoders, embeddings = load_resources()
     
     # 1. 상위 5개 브랜드 선정
     top_indices, top_counts = get_top_korean_brands(data, encoders, top_k=5)
     
     print("\n🚀 [AI 예측 시작] 한국 상위 브랜드 신사업 확장 분석")
+    specs = []
     for idx in top_indices:
         brand_name = encoders['company_classes'][idx]
         print(f"\n🏢 분석 중: {brand_name}...")
@@ -256,6 +176,10 @@ if __name__ == "__main__":
         for r_cls, r_score in recs:
             print(f"   👉 추천: {r_cls}류 (점수: {r_score:.2f})")
             
-        visualize_expansion(data, encoders, brand_name, recs)
+        if not args.no_plot:
+            specs.append(expansion_spec(data, encoders, brand_name, recs))
+
+    # 2. 시각화는 모아서 한 번에 병렬 렌더링
+    render_pool.render_all(specs, workers=args.render_workers)
         
-    print("\n✅ 모든 분석이 완료되었습니다. ./outputs/graph/gnn 폴더를 확인하세요.")
\ No newline at end of file
+    print("\n✅ 모든 분석이 완료되었습니다. ./outputs/graph/gnn 폴더를 확인하세요.")
@@ -1,75 +1,35 @@
 import torch
 import os
+import argparse
 import numpy as np
-import pandas as pd
-import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib import font_manager, rc
-from matplotlib.lines import Line2D
-import platform
+import node_vocab
+import render_pool
+import artifact_store
+import graph_index
+import brand_counts
+from graph_index import FILES, BELONGS_TO, HAS_CODE
 import random
-import glob
+import country_index
 
 # ==========================================
 # ⚙️ 설정
 # ==========================================
 GRAPH_PATH = "./outputs/graph/graph_data.pt"
 ENCODER_PATH = "./outputs/graph/label_encoders.pt"
-DATA_DIR = "./data"
 OUTPUT_DIR = "./outputs/graph/gnn"
 
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-# 전역 폰트 변수
-GLOBAL_FONT_NAME = "sans-serif"
-
 # ==========================================
 # 🛠️ 유틸리티
 # ==========================================
-def init_font():
-    global GLOBAL_FONT_NAME
-    system_name = platform.system()
-    if system_name == 'Windows':
-        candidates = [("c:/Windows/Fonts/malgun.ttf", "Malgun Gothic"), ("c:/Windows/Fonts/msyh.ttf", "Microsoft YaHei")]
-    elif system_name == 'Darwin':
-        candidates = [("/System/Library/Fonts/Supplemental/AppleGothic.ttf", "AppleGothic")]
-    else:
-        candidates = [("/usr/share/fonts/truetype/nanum/NanumGothic.ttf", "NanumGothic")]
-
-    for fpath, fname in candidates:
-        if os.path.exists(fpath):
-            try:
-                font_manager.fontManager.addfont(fpath)
-                GLOBAL_FONT_NAME = font_manager.FontProperties(fname=fpath).get_name()
-                rc('font', family=GLOBAL_FONT_NAME)
-                print(f"🔤 시각화 폰트 로드: {GLOBAL_FONT_NAME}")
-                break
-            except: continue
-    plt.rcParams['axes.unicode_minus'] = False
-
 def load_resources():
     print("🔄 분석 리소스 로드 중...")
-    try:
-        data = torch.load(GRAPH_PATH, map_location='cpu', weights_only=False)
-        encoders = torch.load(ENCODER_PATH, weights_only=False)
-    except TypeError:
-        data = torch.load(GRAPH_PATH, map_location='cpu')
-        encoders = torch.load(ENCODER_PATH)
+    data = artifact_store.load_graph(GRAPH_PATH)
+    encoders = node_vocab.load_encoders(ENCODER_PATH)
     print("✅ 데이터 로드 완료!")
     return data, encoders
 
-def get_korean_brands():
-    korean_file = os.path.join(DATA_DIR, "한국_DATA.xlsx")
-    if not os.path.exists(korean_file):
-        files = glob.glob(os.path.join(DATA_DIR, "*한국*.xlsx"))
-        if not files: return set()
-        korean_file = files[0]
-    
-    df = pd.read_excel(korean_file)
-    target_col = '상표명칭' if '상표명칭' in df.columns else df.columns[0]
-    brands = df[target_col].dropna().astype(str).unique()
-    return set(brands)
-
 # ==========================================
 # 🧠 [NEW] 다양성 기반 브랜드 선정
 # ==========================================
@@ -82,44 +42,20 @@ def get_diverse_top_korean_brands(data, encoders, top_k=5):
     """
     print("\n🔍 한국 브랜드 산업별 대표주자 선별 중...")
     
-    korean_brands_set = get_korean_brands()
     comp_names = encoders['company_classes']
     class_names = encoders['class_classes']
     
-    # 한국 브랜드 인덱스 필터링
-    korean_indices = [i for i, name in enumerate(comp_names) if name in korean_brands_set]
+    # 그래프 생성 시 저장한 국가 비트마스크 조회 (엑셀 재로드/이름 대조 없음)
+    korean_indices = country_index.of(data, encoders).brands('한국').tolist()
     if not korean_indices: return []
 
-    # 1. 브랜드별 주력 Class 계산 (Sparse Matrix 활용)
+    # 1. 브랜드별 류 출원 수 (graph_generator 가 저장한 희소 CSR, 밀집 변환 없음)
     # (Brand -> Trademark) * (Trademark -> Class) = (Brand -> Class Count)
+    brand_class = brand_counts.of(data)['class']
     
-    # 행렬 A: Brand -> Trademark
-    edge_ct = data['company', 'files', 'trademark'].edge_index
-    n_comp = len(comp_names)
-    n_tm = data['trademark'].num_nodes
-    
-    # 텐서 생성
-    indices_ct = edge_ct
-    values_ct = torch.ones(edge_ct.size(1))
-    adj_ct = torch.sparse_coo_tensor(indices_ct, values_ct, (n_comp, n_tm))
-    
-    # 행렬 B: Trademark -> Class
-    edge_tc = data['trademark', 'belongs_to', 'class'].edge_index
-    n_class = len(class_names)
-    
-    indices_tc = edge_tc
-    values_tc = torch.ones(edge_tc.size(1))
-    adj_tc = torch.sparse_coo_tensor(indices_tc, values_tc, (n_tm, n_class))
-    
-    # 행렬 곱 (Brand x Class)
-    adj_cc = torch.sparse.mm(adj_ct, adj_tc).to_dense() # [Num_Brand, Num_Class]
-    
-    # 2. 한국 브랜드 데이터만 추출
-    korean_stats = adj_cc[korean_indices] # [Num_Korean_Brands, Num_Class]
-    
-    # 3. 각 브랜드의 Main Class와 총 상표 수 확인
-    brand_main_class_ids = torch.argmax(korean_stats, dim=1) # 각 브랜드의 주력 류 ID
-    brand_total_counts = torch.sum(korean_stats, dim=1)      # 각 브랜드의 총 상표 수
+    # 2~3. 한국 브랜드의 Main Class와 총 상표 수 확인 (해당 행만 집계)
+    brand_main_class_ids = brand_class.row_argmax(korean_indices) # 각 브랜드의 주력 류 ID
+    brand_total_counts = brand_class.row_sum(korean_indices)      # 각 브랜드의 총 상표 수
     
     # 4. 산업군(Class)별로 그룹핑하여 1등 뽑기
     # Class별로 (총 상표 수, 브랜드 로컬 인덱스) 리스트 생성
@@ -167,37 +103,30 @@ def analyze_gap_strategy(data, encoders, brand_idx, top_k=5):
     brand_name = comp_names[brand_idx]
 
     # 1. 내 상표 찾기
-    edge_ct = data['company', 'files', 'trademark'].edge_index
-    my_tm_mask = (edge_ct[0] == brand_idx)
-    my_tm_indices = edge_ct[1][my_tm_mask]
+    index = graph_index.of(data)
+    my_tm_indices = index.neighbors(FILES, brand_idx)
 
     if len(my_tm_indices) == 0: return None
 
     # 2. 나의 주력 류(Class) 찾기
-    edge_tc = data['trademark', 'belongs_to', 'class'].edge_index
-    my_cls_mask = torch.isin(edge_tc[0], my_tm_indices)
-    my_cls_indices = edge_tc[1][my_cls_mask]
+    counts = brand_counts.of(data)
+    my_cls_ids, _ = counts['class'].row(brand_idx)
     
-    if len(my_cls_indices) == 0: return None
-    main_class_idx = torch.mode(my_cls_indices).values.item()
+    if len(my_cls_ids) == 0: return None
+    main_class_idx = counts['class'].row_argmax([brand_idx]).item()
     main_class_name = class_names[main_class_idx]
     
     print(f"\n🏢 [{brand_name}]의 주력 사업: {main_class_name}류")
 
     # 3. 주력 류에 속한 전체 상표 찾기
-    class_tm_mask = (edge_tc[1] == main_class_idx)
-    global_tm_indices = edge_tc[0][class_tm_mask]
+    global_tm_indices = index.neighbors(graph_index.reverse(BELONGS_TO), main_class_idx)
     
     # 4. 전체 시장 유사군 통계
-    edge_tg = data['trademark', 'has_code', 'group'].edge_index
-    global_group_mask = torch.isin(edge_tg[0], global_tm_indices)
-    global_group_indices = edge_tg[1][global_group_mask]
+    global_group_indices = index.neighbors_of(HAS_CODE, global_tm_indices)
     global_group_counts = torch.bincount(global_group_indices, minlength=len(group_names))
     
-    # 5. 내가 가진 유사군 찾기
-    my_group_mask = torch.isin(edge_tg[0], my_tm_indices)
-    my_group_indices = edge_tg[1][my_group_mask]
-    my_unique_groups = torch.unique(my_group_indices)
+    # 5. 내가 가진 유사군 찾기 (유사군 ID, 출원 수)
+    my_unique_groups, my_group_counts = counts['group'].row(brand_idx)
     
     # 6. 갭 계산
     candidates = global_group_counts.clone()
@@ -214,15 +143,13 @@ def analyze_gap_strategy(data, encoders, brand_idx, top_k=5):
         gaps.append(g_name)
         
     # 7. [수정됨] 내가 잘하고 있는 유사군 (안전하게 Zip 사용)
-    my_counts = torch.bincount(my_group_indices, minlength=len(group_names))
-    # 내가 가진 것 중 Top 3
-    my_strong_indices = torch.argsort(my_counts, descending=True)[:3]
+    # 내가 가진 것 중 Top 3 (동률이면 유사군 ID 순)
+    my_strong_local = torch.argsort(my_group_counts, descending=True, stable=True)[:3]
     
     my_strong_groups = []
-    for idx in my_strong_indices:
-        count = my_counts[idx].item()
-        if count > 0:
-            my_strong_groups.append(group_names[idx.item()])
+    for i in my_strong_local:
+        if my_group_counts[i].item() > 0:
+            my_strong_groups.append(group_names[my_unique_groups[i].item()])
     
     return {
         'main_class': main_class_name,
@@ -233,84 +160,80 @@ def analyze_gap_strategy(data, encoders, brand_idx, top_k=5):
 # ==========================================
 # 🎨 시각화
 # ==========================================
-def visualize_gap_analysis(brand_name, analysis_result):
-    if not analysis_result: return
+def gap_spec(brand_name, analysis_result):
+    """방어 전략 지도 플롯 스펙 (render_pool 에서 렌더링). 분석 결과가 없으면 None"""
+    if not analysis_result: return None
 
     main_class = analysis_result['main_class']
     gaps = analysis_result['gaps']
     my_strong = analysis_result['my_strong']
 
-    G = nx.Graph()
     center_node = f"{main_class}류\n(주력시장)"
-    G.add_node(center_node, type='class', size=3000, color='#FFE66D')
-    
-    G.add_node(brand_name, type='me', size=2500, color='#FF6B6B')
-    G.add_edge(brand_name, center_node, style='solid')
+    nodes = [(center_node, center_node, 'class'), (brand_name, brand_name, 'me')]
+    edges = [(brand_name, center_node, 'solid')]
     
     # Safe Zone
     for g_name in my_strong:
         node_id = f"{g_name}\n(보유)"
-        G.add_node(node_id, type='safe', size=1500, color='#4ECDC4')
-        G.add_edge(center_node, node_id, style='solid', color='gray')
-        G.add_edge(brand_name, node_id, style='solid', color='gray')
+        nodes.append((node_id, node_id, 'safe'))
+        edges.append((center_node, node_id, 'solid'))
+        edges.append((brand_name, node_id, 'solid'))
 
     # Gap Zone
     for g_name in gaps:
         node_id = f"{g_name}\n(누락!)"
-        G.add_node(node_id, type='gap', size=1800, color='#FF9F1C')
-        G.add_edge(center_node, node_id, style='dashed', color='#FF9F1C')
+        nodes.append((node_id, node_id, 'gap'))
+        edges.append((center_node, node_id, 'dashed'))
 
-    plt.figure(figsize=(16, 12))
-    pos = nx.spring_layout(G, k=0.7, seed=42)
-    
-    for n, d in G.nodes(data=True):
-        nx.draw_networkx_nodes(G, pos, nodelist=[n], node_color=d['color'], node_size=d['size'], alpha=0.9)
-    
-    edges = G.edges(data=True)
-    solid = [(u,v) for u,v,d in edges if d.get('style')=='solid']
-    dashed = [(u,v) for u,v,d in edges if d.get('style')=='dashed']
-    
-    nx.draw_networkx_edges(G, pos, edgelist=solid, width=1.5, edge_color='gray', alpha=0.5)
-    nx.draw_networkx_edges(G, pos, edgelist=dashed, width=2.5, edge_color='#FF9F1C', style='dashed')
-    
-    labels = {n: n for n in G.nodes}
-    nx.draw_networkx_labels(G, pos, labels, font_size=10, font_family=GLOBAL_FONT_NAME, font_weight='bold')
-    
-    legend_elements = [
-        Line2D([0], [0], marker='o', color='w', label='Target Brand (나)', markerfacecolor='#FF6B6B', markersize=15),
-        Line2D([0], [0], marker='o', color='w', label='Main Market (주력 시장)', markerfacecolor='#FFE66D', markersize=15),
-        Line2D([0], [0], marker='o', color='w', label='Safe Zone (이미 확보함)', markerfacecolor='#4ECDC4', markersize=12),
-        Line2D([0], [0], marker='o', color='w', label='GAP / RISK (누락된 유사군)', markerfacecolor='#FF9F1C', markersize=15),
-        Line2D([0], [0], color='gray', lw=1, label='Existing Link'),
-        Line2D([0], [0], color='#FF9F1C', lw=2, linestyle='--', label='Market Trend (나는 없음)')
-    ]
-    plt.legend(handles=legend_elements, loc='upper left', prop={'size': 11, 'family': GLOBAL_FONT_NAME})
-
-    plt.title(f"Defensive Strategy: {brand_name} (Gap Analysis)", fontsize=16, fontfamily=GLOBAL_FONT_NAME)
-    plt.axis('off')
-    
     safe_name = "".join([c if c.isalnum() else "_" for c in brand_name])
-    save_path = os.path.join(OUTPUT_DIR, f"KR_GapAnalysis_{safe_name}.png")
-    plt.savefig(save_path, dpi=300, bbox_inches='tight')
+    return {
+        'title': f"Defensive Strategy: {brand_name} (Gap Analysis)",
+        'save_path': os.path.join(OUTPUT_DIR, f"KR_GapAnalysis_{safe_name}.png"),
+        'layout_k': 0.7, 'seed': 42, 'font_size': 10, 'font_weight': 'bold',
+        'nodes': nodes,
+        'node_styles': {'class': ('#FFE66D', 3000), 'me': ('#FF6B6B', 2500),
+                        'safe': ('#4ECDC4', 1500), 'gap': ('#FF9F1C', 1800)},
+        'edges': edges,
+        'edge_styles': {'solid': dict(width=1.5, edge_color='gray', alpha=0.5),
+                        'dashed': dict(width=2.5, edge_color='#FF9F1C', style='dashed')},
+        'legend': [
+            ('node', 'Target Brand (나)', '#FF6B6B', 15),
+            ('node', 'Main Market (주력 시장)', '#FFE66D', 15),
+            ('node', 'Safe Zone (이미 확보함)', '#4ECDC4', 12),
+            ('node', 'GAP / RISK (누락된 유사군)', '#FF9F1C', 15),
+            ('line', 'Existing Link', 'gray', 1, '-'),
+            ('line', 'Market Trend (나는 없음)', '#FF9F1C', 2, '--'),
+        ],
+    }
+
+def visualize_gap_analysis(brand_name, analysis_result):
+    spec = gap_spec(brand_name, analysis_result)
+    if spec is None: return
+    save_path = render_pool.render(spec)
     print(f"🖼️ 방어 전략 지도 저장: {save_path}")
-    plt.close()
 
 if __name__ == "__main__":
-    init_font()
+    parser = argparse.ArgumentParser(description="한국 상위 브랜드 갭 분석")
+    parser.add_argument('--no-plot', action='store_true', help="텍스트 결과만 출력 (matplotlib/networkx 를 로드하지 않음)")
+    parser.add_argument('--render-workers', type=int, default=None, help="시각화 렌더링 프로세스 수 (기본: CPU 수, 1 이면 순차)")
+    args = parser.parse_args()
     data, encoders = load_resources()
     
     # [변경된 함수 호출]
     top_indices = get_diverse_top_korean_brands(data, encoders, top_k=5)
     
     print("\n🚀 [AI 방어 전략 수립] 갭 분석(Gap Analysis) 시작")
-    
+    specs = []
     for idx in top_indices:
         brand_name = encoders['company_classes'][idx]
         
         # 2. 갭 분석 실행
         result = analyze_gap_strategy(data, encoders, idx, top_k=5)
         
-        # 3. 시각화
-        visualize_gap_analysis(brand_name, result)
+        if not args.no_plot:
+            specs.append(gap_spec(brand_name, result))
+
+    # 3. 시각화는 모아서 한 번에 병렬 렌더링
+    render_pool.render_all(specs, workers=args.render_workers)
         
-    print("\n✅ 모든 분석 완료. ./outputs/graph/gnn 폴더를 확인하세요.")
\ No newline at end of file
+    print("\n✅ 모든 분석 완료. ./outputs/graph/gnn 폴더를 확인하세요.")
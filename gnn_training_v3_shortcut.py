@@ -1,4 +1,6 @@
 import os
+import sys
+import argparse
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
@@ -7,6 +9,12 @@ import dgl.nn as dglnn
 import dgl.function as fn
 from sklearn.metrics import roc_auc_score
 import numpy as np
+import brand_counts
+import country_index
+import graph_snapshot
+import artifact_store
+import time
+from negative_sampling import NegativeSampler, score_edges
 
 # ==========================================
 # ⚙️ 설정
@@ -18,34 +26,29 @@ EMBEDDING_SAVE_PATH = "./outputs/graph/dgl_node_embeddings_v3.pt"
 HIDDEN_DIMS = 64
 EPOCHS = 100
 LR = 0.005
+FINETUNE_EPOCHS = 5
 
 # ==========================================
 # 🛠️ 그래프 로드 및 구조 변경 (Raw Data Direct Processing)
 # ==========================================
-def load_and_modify_graph():
+def load_and_modify_graph(since=None, until=None, data=None, graph_path=PYG_GRAPH_PATH):
+    """
+    since/until 을 주면 해당 기간 [since, until) 에 출원된 상표의 엣지만 남긴 스냅샷으로 학습합니다.
+    data(HeteroData)를 주면 파일 대신 그 그래프를 사용합니다. (디스크 그래프가 아니면 지름길 집계는 메모리에서만 계산)
+    graph_path 로 국가별 부분 그래프(slices/<국가>/graph_data.pt) 등 다른 그래프 파일을 읽을 수 있습니다.
+    """
     print("🔄 [Step 1] 원본 데이터 로드 및 지름길 계산 시작...")
     
-    if not os.path.exists(PYG_GRAPH_PATH):
-        raise FileNotFoundError(f"❌ 원본 데이터가 없습니다: {PYG_GRAPH_PATH}")
-    
-    # 1. PyG 데이터 로드 (안전하게 CPU로 로드)
-    try:
-        data = torch.load(PYG_GRAPH_PATH, map_location='cpu', weights_only=False)
-    except TypeError:
-        data = torch.load(PYG_GRAPH_PATH, map_location='cpu')
-
-    # 2. 텐서 추출 (GPU가 아닌 CPU에서 안전하게 연산)
-    print("   ↳ 엣지 데이터 추출 중 (CPU 안전 모드)...")
-    
-    # Company -> Trademark
-    edge_ct = data['company', 'files', 'trademark'].edge_index
-    src_ct = edge_ct[0] # Company ID
-    dst_ct = edge_ct[1] # Trademark ID
-    
-    # Trademark -> Class
-    edge_tc = data['trademark', 'belongs_to', 'class'].edge_index
-    src_tc = edge_tc[0] # Trademark ID
-    dst_tc = edge_tc[1] # Class ID
+    if data is None:
+        if not os.path.exists(graph_path):
+            raise FileNotFoundError(f"❌ 원본 데이터가 없습니다: {graph_path}")
+        # 1. PyG 데이터 로드 (안전하게 CPU로 로드)
+        data = artifact_store.load_graph(graph_path)
+    windowed = since is not None or until is not None
+    if windowed:
+        # 정렬된 출원일자 구간만 잘라 씀 (노드 ID/개수는 전체 그래프와 동일)
+        data = graph_snapshot.snapshot(data, since, until)
+        print(f"   ↳ 기간 스냅샷: [{since or '처음'}, {until or '끝'}) 출원 {data['company', 'files', 'trademark'].edge_index.size(1):,}건")
 
     # 노드 개수
     n_comp = data['company'].num_nodes
@@ -55,28 +58,14 @@ def load_and_modify_graph():
     print(f"   ↳ 데이터 확인: Comp({n_comp}), TM({n_tm}), Class({n_class})")
     
     # -------------------------------------------------------
-    # ⚡ [Shortcut] PyTorch CPU Sparse Matrix Multiplication
+    # ⚡ [Shortcut] 브랜드 x 류 출원 수 행렬 (graph_generator 가 미리 계산한 희소 CSR)
     # -------------------------------------------------------
-    print("   ↳ 지름길 연산 수행 중 (Sparse MM)...")
-    
-    # 행렬 A (Comp x TM)
-    indices_ct = torch.stack([src_ct, dst_ct])
-    values_ct = torch.ones(len(src_ct))
-    adj_ct = torch.sparse_coo_tensor(indices_ct, values_ct, (n_comp, n_tm))
-    
-    # 행렬 B (TM x Class)
-    indices_tc = torch.stack([src_tc, dst_tc])
-    values_tc = torch.ones(len(src_tc))
-    adj_tc = torch.sparse_coo_tensor(indices_tc, values_tc, (n_tm, n_class))
+    print("   ↳ 지름길 로드 중 (brand_counts)...")
+    # 스냅샷/메모리 그래프는 load_or_build 가 메모리에서만 계산 (저장 파일을 덮어쓰지 않음)
+    brand_class = brand_counts.load_or_build(data)['class']
     
-    # 행렬 곱: (Comp x Class)
-    # CPU Sparse MM은 매우 안정적입니다.
-    adj_cc = torch.sparse.mm(adj_ct, adj_tc).coalesce()
-    
-    # 결과 추출
-    indices_cc = adj_cc.indices()
-    new_src = indices_cc[0]
-    new_dst = indices_cc[1]
+    # 0 이 아닌 칸 = (Company -> Class) 직접 연결
+    new_src, new_dst = brand_class.edges()
     
     count = len(new_src)
     print(f"   ✨ [성공] 지름길 생성 완료: {count:,}개의 (Company->Class) 직접 연결 발견!")
@@ -118,11 +107,12 @@ def load_and_modify_graph():
 # 🧠 모델 정의
 # ==========================================
 class SimpleHeteroSAGE(nn.Module):
-    def __init__(self, g, in_feats, h_feats):
+    def __init__(self, g, in_feats, h_feats, sparse_emb=False):
         super().__init__()
+        # sparse_emb=True: 미니배치에서 사용한 행만 gradient 를 가짐 (SparseAdam 과 함께 사용)
         self.node_embeddings = nn.ModuleDict()
         for ntype in g.ntypes:
-            self.node_embeddings[ntype] = nn.Embedding(g.num_nodes(ntype), in_feats)
+            self.node_embeddings[ntype] = nn.Embedding(g.num_nodes(ntype), in_feats, sparse=sparse_emb)
         
         self.conv1 = dglnn.HeteroGraphConv({
             etype: dglnn.SAGEConv(in_feats, h_feats, 'mean')
@@ -153,6 +143,61 @@ class SimpleHeteroSAGE(nn.Module):
                 
         return h2
 
+    # -------------------------------------------------------
+    # 미니배치 (Neighbor Sampling) 용
+    # -------------------------------------------------------
+    @staticmethod
+    def _conv_block(conv, block, x_dict, residual):
+        h = conv(block, x_dict)
+        # Residual Connection: 들어오는 엣지가 없는 타입은 이전 층 값을 그대로 사용
+        for ntype in block.dsttypes:
+            if ntype not in h: h[ntype] = residual(ntype)
+        return h
+
+    def forward_blocks(self, blocks, x_dict):
+        """
+        샘플링된 2개 블록 위에서 forward(g) 와 같은 2층 전파를 수행합니다.
+        company 처럼 들어오는 엣지 타입이 없는 노드는 블록 src 에 dst 가 포함되지 않을 수 있어
+        residual 값을 임베딩에서 직접 가져옵니다. (전체 그래프 forward 와 동일한 값)
+        """
+        def dst_embedding(block, ntype):
+            return self.node_embeddings[ntype](block.dstnodes[ntype].data[dgl.NID])
+
+        h1 = self._conv_block(self.conv1, blocks[0], x_dict, lambda nt: dst_embedding(blocks[0], nt))
+        h1 = {k: F.leaky_relu(v) for k, v in h1.items()}
+        return self._conv_block(self.conv2, blocks[1], h1, lambda nt: F.leaky_relu(dst_embedding(blocks[1], nt)))
+
+    def input_features(self, input_nodes):
+        return {ntype: self.node_embeddings[ntype](nids) for ntype, nids in input_nodes.items()}
+
+    @torch.no_grad()
+    def inference(self, g, batch_size, device, num_workers=0):
+        """
+        레이어 단위 전체 이웃 추론 (배치로 나눠 계산, 결과는 forward(g) 와 동일).
+        그래프 전체 중간 텐서를 한 번에 만들지 않으므로 메모리가 batch_size 에 비례합니다.
+        """
+        x = {ntype: emb.weight.detach().cpu() for ntype, emb in self.node_embeddings.items()}
+        sampler = dgl.dataloading.MultiLayerFullNeighborSampler(1)
+        all_nodes = {ntype: torch.arange(g.num_nodes(ntype)) for ntype in g.ntypes}
+        for layer, conv in enumerate([self.conv1, self.conv2]):
+            loader = dgl.dataloading.DataLoader(
+                g, all_nodes, sampler, batch_size=batch_size,
+                shuffle=False, drop_last=False, num_workers=num_workers)
+            y = {}
+            for input_nodes, output_nodes, blocks in loader:
+                block = blocks[0].to(device)
+                h = self._conv_block(conv, block, {nt: x[nt][nids].to(device) for nt, nids in input_nodes.items()},
+                                     lambda nt: x[nt][block.dstnodes[nt].data[dgl.NID].cpu()].to(device))
+                if layer == 0:
+                    h = {k: F.leaky_relu(v) for k, v in h.items()}
+                for ntype, nids in output_nodes.items():
+                    if len(nids) == 0: continue
+                    if ntype not in y:
+                        y[ntype] = torch.zeros(g.num_nodes(ntype), h[ntype].shape[1])
+                    y[ntype][nids] = h[ntype].cpu()
+            x = y
+        return x
+
 class LinkPredictor(nn.Module):
     def forward(self, edge_subgraph, x, target_etype):
         with edge_subgraph.local_scope():
@@ -166,49 +211,41 @@ class LinkPredictor(nn.Module):
             return edge_subgraph.edges[target_etype].data['score']
 
 # ==========================================
-# 🚀 메인 실행부
+# 🏋️ 학습 루프
 # ==========================================
-if __name__ == "__main__":
-    # 1. 그래프 생성 (캐시 없이 직접 생성)
-    g = load_and_modify_graph()
-    
-    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-    print(f"⚡ 학습 장치: {device}")
-    g = g.to(device)
+TARGET_ETYPE = ('company', 'interested_in', 'class')
 
-    target_etype = ('company', 'interested_in', 'class')
-    print(f"🎯 학습 타겟: {target_etype}")
+def train_full_graph(g, device, epochs=EPOCHS, neg_strategy='uniform'):
+    """전체 그래프 학습 (기존 방식): 매 epoch 전체 노드에 대해 model(g)"""
+    g = g.to(device)
+    target_etype = TARGET_ETYPE
+    src_type, _, dst_type = target_etype
+    print(f"🎯 학습 타겟: {target_etype} (negative: {neg_strategy})")
 
     model = SimpleHeteroSAGE(g, HIDDEN_DIMS, HIDDEN_DIMS).to(device)
-    pred = LinkPredictor().to(device)
-    optimizer = torch.optim.Adam(list(model.parameters()) + list(pred.parameters()), lr=LR)
+    optimizer = torch.optim.Adam(model.parameters(), lr=LR)
+
+    n_edges = g.num_edges(target_etype)
+    if n_edges == 0:
+        raise ValueError("⚠️ 학습할 엣지가 없습니다!")
+
+    # 양성 엣지/음성 샘플러는 한 번만 준비 (epoch 마다 그래프를 새로 만들지 않음)
+    pos_src, pos_dst = g.edges(etype=target_etype)
+    neg_sampler = NegativeSampler(pos_src, pos_dst, g.num_nodes(src_type), g.num_nodes(dst_type), strategy=neg_strategy)
 
     print("\n🚀 V3 (Final Fix) 모델 학습 시작...")
+    epoch_times = []
     
-    for epoch in range(1, EPOCHS + 1):
+    for epoch in range(1, epochs + 1):
+        t0 = time.perf_counter()
         model.train()
-        
-        src_n = g.num_nodes(target_etype[0])
-        dst_n = g.num_nodes(target_etype[2])
-        n_edges = g.num_edges(target_etype)
-        
-        if n_edges == 0:
-            print("⚠️ 학습할 엣지가 없습니다!")
-            break
-
-        # Negative Sampling
-        neg_src = torch.randint(0, src_n, (n_edges,), device=device)
-        neg_dst = torch.randint(0, dst_n, (n_edges,), device=device)
-        
-        neg_g = dgl.heterograph(
-            {target_etype: (neg_src, neg_dst)},
-            num_nodes_dict={nt: g.num_nodes(nt) for nt in g.ntypes}
-        ).to(device)
 
         h = model(g)
-        
-        pos_score = pred(g, h, target_etype)
-        neg_score = pred(neg_g, h, target_etype)
+
+        # Negative Sampling (양성 제외) + 엣지 단위 점수 계산
+        neg_src, neg_dst = neg_sampler.sample(n_edges, h_src=h[src_type].detach(), h_dst=h[dst_type].detach())
+        pos_score = score_edges(h[src_type], h[dst_type], pos_src, pos_dst)
+        neg_score = score_edges(h[src_type], h[dst_type], neg_src, neg_dst)
         
         scores = torch.cat([pos_score, neg_score])
         labels = torch.cat([torch.ones_like(pos_score), torch.zeros_like(neg_score)])
@@ -217,20 +254,215 @@ if __name__ == "__main__":
         optimizer.zero_grad()
         loss.backward()
         optimizer.step()
+        epoch_times.append(time.perf_counter() - t0)
         
         if epoch % 10 == 0 or epoch == 1:
             with torch.no_grad():
                 auc = roc_auc_score(labels.cpu().numpy(), scores.sigmoid().cpu().numpy())
-                print(f"Epoch: {epoch:03d}/{EPOCHS}, Loss: {loss.item():.4f}, AUC: {auc:.4f}")
+                print(f"Epoch: {epoch:03d}/{epochs}, Loss: {loss.item():.4f}, AUC: {auc:.4f}, {epoch_times[-1]:.3f}s/epoch")
 
-    print("\n💾 V3 결과 저장 중...")
-    os.makedirs(os.path.dirname(MODEL_SAVE_PATH), exist_ok=True)
-    torch.save(model.state_dict(), MODEL_SAVE_PATH)
-    
+    print(f"⏱️ 평균 epoch 시간: {sum(epoch_times) / len(epoch_times):.3f}s")
     model.eval()
     with torch.no_grad():
         final_h = model(g)
-        final_h_cpu = {k: v.cpu() for k, v in final_h.items()}
-        torch.save(final_h_cpu, EMBEDDING_SAVE_PATH)
+    return model, {k: v.cpu() for k, v in final_h.items()}
+
+def train_minibatch(g, device, epochs=EPOCHS, fanouts=(10, 10), batch_size=1024, num_workers=0, neg_strategy='uniform',
+                    model=None, seed_eids=None):
+    """
+    미니배치 학습: 타겟 엣지 배치마다 2-hop 이웃을 fanout 만큼만 샘플링하여 블록 단위로 학습합니다.
+    - 그래프는 CPU 에 두고 샘플링, 블록만 device 로 이동 (메모리 = 배치/팬아웃에 비례)
+    - 임베딩은 sparse gradient + SparseAdam (배치에 등장한 행만 갱신)
+    - num_workers 로 샘플링을 병렬화 (코어 수에 맞춰 처리량 증가)
+    model/seed_eids 를 주면 fine-tune: 그 모델(sparse_emb=True)에서 이어서 노드 임베딩만 갱신 (conv 가중치 고정),
+    seed 타겟 엣지 주변 이웃만 샘플링하므로 epoch 비용이 그래프 크기가 아니라 seed 수에 비례합니다.
+    """
+    target_etype = TARGET_ETYPE
+    print(f"🎯 학습 타겟: {target_etype} (미니배치, fanouts={list(fanouts)}, batch={batch_size}, negative: {neg_strategy})")
+
+    pred = LinkPredictor().to(device)
+    if model is None:
+        model = SimpleHeteroSAGE(g, HIDDEN_DIMS, HIDDEN_DIMS, sparse_emb=True).to(device)
+        dense_params = [p for name, p in model.named_parameters() if not name.startswith('node_embeddings')]
+        opt_dense = torch.optim.Adam(dense_params + list(pred.parameters()), lr=LR)
+    else:
+        model = model.to(device)
+        for name, p in model.named_parameters():
+            p.requires_grad_(name.startswith('node_embeddings'))
+        opt_dense = None
+    opt_sparse = torch.optim.SparseAdam(list(model.node_embeddings.parameters()), lr=LR)
+
+    n_edges = g.num_edges(target_etype)
+    if n_edges == 0:
+        raise ValueError("⚠️ 학습할 엣지가 없습니다!")
+    train_eids = torch.arange(n_edges) if seed_eids is None else seed_eids
+
+    pos_src, pos_dst = g.edges(etype=target_etype)
+    neg_sampler = NegativeSampler(pos_src, pos_dst, g.num_nodes(target_etype[0]), g.num_nodes(target_etype[2]),
+                                  strategy=neg_strategy)
+    sampler = dgl.dataloading.as_edge_prediction_sampler(
+        dgl.dataloading.NeighborSampler(list(fanouts)),
+        negative_sampler=neg_sampler.dgl_sampler(target_etype))
+    loader = dgl.dataloading.DataLoader(
+        g, {target_etype: train_eids}, sampler,
+        batch_size=batch_size, shuffle=True, drop_last=False, num_workers=num_workers)
+
+    print("\n🚀 V3 미니배치 모델 학습 시작...")
+    epoch_times = []
+    for epoch in range(1, epochs + 1):
+        t0 = time.perf_counter()
+        model.train()
+        total_loss, n_batches = 0.0, 0
+        all_scores, all_labels = [], []
+        for input_nodes, pair_g, neg_g, blocks in loader:
+            blocks = [b.to(device) for b in blocks]
+            pair_g, neg_g = pair_g.to(device), neg_g.to(device)
+            x = model.input_features({nt: nids.to(device) for nt, nids in input_nodes.items()})
+            h = model.forward_blocks(blocks, x)
+
+            pos_score = pred(pair_g, h, target_etype)
+            neg_score = pred(neg_g, h, target_etype)
+            scores = torch.cat([pos_score, neg_score])
+            labels = torch.cat([torch.ones_like(pos_score), torch.zeros_like(neg_score)])
+            loss = F.binary_cross_entropy_with_logits(scores, labels)
+
+            opt_sparse.zero_grad()
+            if opt_dense is not None: opt_dense.zero_grad()
+            loss.backward()
+            opt_sparse.step()
+            if opt_dense is not None: opt_dense.step()
+
+            total_loss += loss.item()
+            n_batches += 1
+            if epoch % 10 == 0 or epoch == 1:
+                all_scores.append(scores.detach().sigmoid().cpu())
+                all_labels.append(labels.cpu())
+
+        epoch_times.append(time.perf_counter() - t0)
+        if epoch % 10 == 0 or epoch == 1:
+            auc = roc_auc_score(torch.cat(all_labels).numpy(), torch.cat(all_scores).numpy())
+            print(f"Epoch: {epoch:03d}/{epochs}, Loss: {total_loss / n_batches:.4f}, AUC: {auc:.4f}, {epoch_times[-1]:.3f}s/epoch")
+
+    print(f"⏱️ 평균 epoch 시간: {sum(epoch_times) / len(epoch_times):.3f}s")
+
+    print("   ↳ 전체 노드 임베딩 계산 중 (레이어 단위 배치 추론)...")
+    model.eval()
+    final_h = model.inference(g, batch_size=batch_size * 4, device=device, num_workers=num_workers)
+    return model, final_h
+
+# ==========================================
+# 🔁 Warm-start fine-tune (증분 빌드 후)
+# ------------------------------------------
+# 증분 빌드는 노드 ID를 뒤에만 추가하므로 (append-only), 저장된 모델의 임베딩 테이블 크기 = 이전 그래프의 노드 수입니다.
+#   1. dgl_gnn_model_v3.pth 를 읽어 임베딩 테이블을 현재 노드 수로 늘림 (기존 행 복사, 새 행은 초기값)
+#   2. 새 상표와 연결된 브랜드(+ 새 브랜드)의 (브랜드 -> 류) 타겟 엣지만 seed 로 몇 epoch 학습
+#      conv 가중치는 고정하고 노드 임베딩만 갱신 (전체 가중치를 다시 흔들면 기존 임베딩 품질이 오히려 떨어짐)
+#      매 epoch 전체 그래프 forward 대신 seed 엣지 주변 2-hop 이웃만 샘플링한 블록으로 계산 (train_minibatch)
+#   3. 전체 노드 임베딩을 레이어 단위 배치 추론으로 한 번 다시 계산해 저장
+# ==========================================
+def load_warm_model(g, path=MODEL_SAVE_PATH, sparse_emb=False):
+    """저장된 모델 -> 현재 그래프 크기로 늘린 모델, 이전 노드 수 {ntype: n}"""
+    state = torch.load(path, map_location='cpu')
+    model = SimpleHeteroSAGE(g, HIDDEN_DIMS, HIDDEN_DIMS, sparse_emb=sparse_emb)
+    old_sizes = {}
+    for ntype, emb in model.node_embeddings.items():
+        old = state.pop(f'node_embeddings.{ntype}.weight')
+        old_sizes[ntype] = old.size(0)
+        if old.size(0) > emb.num_embeddings:
+            raise ValueError(f"❌ 저장된 모델의 {ntype} 노드 수({old.size(0):,})가 현재 그래프보다 큽니다. 전체 학습을 실행하세요.")
+        with torch.no_grad():
+            emb.weight[:old.size(0)] = old
+    model.load_state_dict(state, strict=False)
+    return model, old_sizes
+
+def changed_seed_edges(g, old_sizes):
+    """새 상표와 연결된 브랜드 + 새 브랜드의 타겟 엣지 ID"""
+    src, dst = g.edges(etype='files')
+    changed = torch.zeros(g.num_nodes('company'), dtype=torch.bool)
+    changed[src[dst >= old_sizes['trademark']]] = True
+    changed[old_sizes['company']:] = True
+    tgt_src, _ = g.edges(etype=TARGET_ETYPE)
+    return torch.nonzero(changed[tgt_src]).flatten(), int(changed.sum())
+
+def finetune(g, device, path=MODEL_SAVE_PATH, epochs=FINETUNE_EPOCHS, neg_strategy='uniform',
+             fanouts=(10, 10), batch_size=1024, num_workers=0):
+    """저장된 모델에서 이어서 변경된 이웃만 학습. 반환: (model, 전체 노드 임베딩) / 변경이 없으면 (None, None)"""
+    model, old_sizes = load_warm_model(g, path, sparse_emb=True)
+    for ntype in g.ntypes:
+        print(f"   ↳ {ntype} 노드: {old_sizes[ntype]:,} -> {g.num_nodes(ntype):,}개 (+{g.num_nodes(ntype) - old_sizes[ntype]:,})")
+    seed_eids, n_changed = changed_seed_edges(g, old_sizes)
+    if len(seed_eids) == 0:
+        print("✅ 새로 추가된 출원이 없습니다. 임베딩을 그대로 유지합니다.")
+        return None, None
+    print(f"🔁 Warm-start: 변경 브랜드 {n_changed:,}개, 타겟 엣지 {len(seed_eids):,}/{g.num_edges(TARGET_ETYPE):,}개, {epochs} epoch")
+    return train_minibatch(g, device, epochs, fanouts, batch_size, num_workers, neg_strategy,
+                           model=model, seed_eids=seed_eids)
+
+# ==========================================
+# 🚀 메인 실행부
+# ==========================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DGL 이종 그래프 GNN 학습 (V3 Shortcut)")
+    parser.add_argument('--minibatch', action='store_true', help="이웃 샘플링 미니배치 학습 (대용량 그래프용)")
+    parser.add_argument('--fanouts', type=str, default="10,10", help="레이어별 샘플링 이웃 수 (예: 10,10)")
+    parser.add_argument('--batch-size', type=int, default=1024, help="배치당 타겟 엣지 수")
+    parser.add_argument('--num-workers', type=int, default=0, help="샘플링 워커 프로세스 수")
+    parser.add_argument('--epochs', type=int, default=None, help=f"학습 epoch 수 (기본 {EPOCHS}, --finetune 은 {FINETUNE_EPOCHS})")
+    parser.add_argument('--neg-strategy', choices=['uniform', 'degree', 'hard'], default='uniform',
+                        help="음성 샘플링 전략 (hard 는 전체 그래프 학습에서만)")
+    parser.add_argument('--finetune', action='store_true',
+                        help="증분 빌드 후: 저장된 모델에서 이어서 새 출원 주변만 몇 epoch 학습 (임베딩 갱신, 항상 이웃 샘플링 "
+                             "미니배치 - --fanouts/--batch-size/--num-workers 적용)")
+    parser.add_argument('--since', default=None, help="이 날짜(포함) 이후 출원만 학습 (예: 2020-01-01 또는 2020)")
+    parser.add_argument('--until', default=None, help="이 날짜(미포함) 이전 출원만 학습")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--graph', default=None,
+                        help=f"학습할 그래프 파일 (기본 {PYG_GRAPH_PATH}, 다른 그래프면 모델/임베딩도 같은 폴더에 저장)")
+    source.add_argument('--country', nargs='+', default=None,
+                        help="국가별 부분 그래프로 학습 (graph_generator.py --slice 로 만든 slices/<국가>/, 예: --country 한국)")
+    args = parser.parse_args()
+
+    graph_path = args.graph or PYG_GRAPH_PATH
+    if args.country:
+        graph_path = os.path.join(country_index.slice_dir(args.country), os.path.basename(PYG_GRAPH_PATH))
+        if not os.path.exists(graph_path):
+            sys.exit(f"❌ 부분 그래프가 없습니다: {graph_path} (먼저 `python graph_generator.py --slice {' '.join(args.country)}` 실행)")
+    # 다른 그래프(부분 그래프)의 학습 결과는 그 그래프 폴더에 저장 (전체 그래프 모델/임베딩을 덮어쓰지 않음)
+    if os.path.abspath(graph_path) != os.path.abspath(PYG_GRAPH_PATH):
+        out_dir = os.path.dirname(graph_path)
+        MODEL_SAVE_PATH = os.path.join(out_dir, os.path.basename(MODEL_SAVE_PATH))
+        EMBEDDING_SAVE_PATH = os.path.join(out_dir, os.path.basename(EMBEDDING_SAVE_PATH))
+
+    # 기간 학습 결과는 전체 학습 결과를 덮어쓰지 않도록 파일명에 기간을 붙임
+    if args.since or args.until:
+        suffix = f"_{args.since or 'begin'}_{args.until or 'end'}"
+        MODEL_SAVE_PATH = MODEL_SAVE_PATH.replace('.pth', f'{suffix}.pth')
+        EMBEDDING_SAVE_PATH = EMBEDDING_SAVE_PATH.replace('.pt', f'{suffix}.pt')
+
+    # 1. 그래프 생성 (캐시 없이 직접 생성)
+    g = load_and_modify_graph(args.since, args.until, graph_path=graph_path)
+    
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    print(f"⚡ 학습 장치: {device}")
+
+    fanouts = [int(f) for f in args.fanouts.split(',')]
+    t_start = time.perf_counter()
+    if args.finetune:
+        if not os.path.exists(MODEL_SAVE_PATH):
+            raise FileNotFoundError(f"❌ 이어서 학습할 모델이 없습니다: {MODEL_SAVE_PATH} (먼저 전체 학습을 실행하세요)")
+        model, final_h_cpu = finetune(g, device, MODEL_SAVE_PATH, args.epochs or FINETUNE_EPOCHS, args.neg_strategy,
+                                      fanouts, args.batch_size, args.num_workers)
+        if model is None:
+            sys.exit(0)
+    elif args.minibatch:
+        model, final_h_cpu = train_minibatch(g, device, args.epochs or EPOCHS, fanouts, args.batch_size, args.num_workers, args.neg_strategy)
+    else:
+        model, final_h_cpu = train_full_graph(g, device, args.epochs or EPOCHS, args.neg_strategy)
+    print(f"⏱️ 총 학습 시간: {time.perf_counter() - t_start:.1f}s")
+
+    print("\n💾 V3 결과 저장 중...")
+    os.makedirs(os.path.dirname(MODEL_SAVE_PATH), exist_ok=True)
+    torch.save(model.state_dict(), MODEL_SAVE_PATH)
+    artifact_store.save_embeddings(final_h_cpu, EMBEDDING_SAVE_PATH)   # .pt + mmap
         
-    print(f"✅ V3 학습 완료! 모델이 저장되었습니다.")
\ No newline at end of file
+    print(f"✅ V3 학습 완료! 모델이 저장되었습니다: {MODEL_SAVE_PATH}")
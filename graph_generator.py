@@ -1,17 +1,35 @@
 import os
+import sys
+import time
+import argparse
+import numpy as np
 import pandas as pd
 import torch
 from torch_geometric.data import HeteroData
-from sklearn.preprocessing import LabelEncoder
-from tqdm import tqdm
-import glob
 import re
+import data_ingest
+import cleaning
+import node_vocab
+import artifact_store
+import graph_index
+import brand_counts
+import country_index
+import graph_snapshot
+from node_vocab import NodeVocab
+from trademark_table import TrademarkTable, TABLE_FILE
+from graph_index import FILES, BELONGS_TO, HAS_CODE, FILED_IN
 
 # 설정
 DATA_DIR = "./data"
 OUTPUT_DIR = "./outputs/graph"
+GRAPH_PATH = os.path.join(OUTPUT_DIR, "graph_data.pt")
+ENCODER_PATH = os.path.join(OUTPUT_DIR, "label_encoders.pt")
+TRADEMARK_PATH = os.path.join(OUTPUT_DIR, TABLE_FILE)
+GRAPH_COLUMNS = ['상표명칭', '류', '유사군', '출원일자']
+VOCAB_TYPES = ['company', 'class', 'group', 'country']   # 이름 -> ID 사전을 갖는 노드 타입 (상표는 TrademarkTable)
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# 행 단위 정제 함수 (참고/검증용, 실제 파이프라인은 cleaning 모듈의 벡터화 버전 사용)
 def clean_class_column(value):
     """'류' 컬럼 정제"""
     if pd.isna(value): return "0"
@@ -30,47 +48,33 @@ def clean_group_column(value):
     if not codes: return ["Unknown_Group"]
     return codes
 
-def load_excel_files():
-    all_files = glob.glob(os.path.join(DATA_DIR, "*_DATA.xlsx"))
+def load_excel_files(workers=None, skip_rows=None):
+    """
+    엑셀을 읽어 (브랜드, 상표, 류, 유사군) 테이블로 변환합니다.
+    skip_rows={파일명: 행 수} 를 주면 각 파일에서 이미 반영된 앞부분 행은 건너뜁니다. (증분 빌드용)
+    반환 DataFrame의 attrs['source_rows'] 에 파일별 전체 행 수를 기록합니다.
+    """
+    all_files = data_ingest.list_workbooks(DATA_DIR)
     df_list = []
+    source_rows = {}
     
     print(f"📂 총 {len(all_files)}개의 엑셀 파일을 발견했습니다. 로드 중...")
     
-    for filename in tqdm(all_files, desc="Loading Excel"):
+    # 파일별 병렬 파싱 (컬럼명 정규화는 data_ingest에서 처리, 실패 파일은 경고 후 제외)
+    frames = data_ingest.load_workbooks(all_files, columns=GRAPH_COLUMNS, workers=workers)
+    
+    for filename, df in frames.items():
         try:
-            df = pd.read_excel(filename)
-            df.columns = df.columns.str.strip() # 공백 제거
-
-            # 1. 컬럼 매핑
-            col_map = {}
-            # 상표명칭 (필수)
-            if '상표명칭' in df.columns: col_map['상표명칭'] = '상표명칭'
-            
-            # 류
-            for c in ['류', '주요_류', '상품류', 'class']:
-                if c in df.columns: col_map[c] = '주요_류'; break
-            
-            # 유사군 (핵심 추가!)
-            for c in ['유사군', '유사군코드', 'similar_group']:
-                if c in df.columns: col_map[c] = '유사군'; break
-
-            df.rename(columns=col_map, inplace=True)
-            
             if '상표명칭' not in df.columns:
                 continue
 
-            # 2. 데이터프레임 생성
-            temp_df = pd.DataFrame()
-            # 브랜드(Company) 설정
-            temp_df['Company_Name'] = df['상표명칭'].fillna("Unknown_Brand")
-            # 고유 ID 생성
-            temp_df['Trademark_ID'] = df['상표명칭'].fillna("Unknown") + "_" + df.index.astype(str) + "_" + os.path.basename(filename)
-            # 류
-            temp_df['Class'] = df.get('주요_류', "0")
-            # 유사군 (없으면 Unknown 처리)
-            temp_df['Group_Raw'] = df.get('유사군', "Unknown_Group")
-            
-            df_list.append(temp_df)
+            base_name = os.path.basename(filename)
+            source_rows[base_name] = len(df)
+            if skip_rows:
+                # 인덱스(엑셀 행 번호)를 유지해야 (파일, 행) 식별자가 기존과 일치합니다.
+                df = df.iloc[skip_rows.get(base_name, 0):]
+
+            df_list.append(to_graph_rows(df, base_name))
 
         except Exception as e:
             print(f"⚠️ {filename} 로드 실패: {e}")
@@ -80,10 +84,76 @@ def load_excel_files():
     full_df = pd.concat(df_list, ignore_index=True)
     print("🧹 데이터 정제 중 (류 & 유사군)...")
     
-    full_df['Class'] = full_df['Class'].apply(clean_class_column)
+    full_df['Class'] = cleaning.clean_class_series(full_df['Class'])
+    full_df['Source_File'] = full_df['Source_File'].astype('category')
+    full_df['Country'] = full_df['Country'].astype('category')
+    full_df.attrs['source_rows'] = source_rows
     
     return full_df
 
+def to_graph_rows(df, base_name):
+    """엑셀 행(표준 컬럼) -> (브랜드, 상표 식별자, 국가, 출원일, 류, 유사군) 테이블. 류 정제는 호출하는 쪽에서"""
+    temp_df = pd.DataFrame(index=df.index)
+    # 브랜드(Company) 설정
+    temp_df['Company_Name'] = df['상표명칭'].fillna(cleaning.UNKNOWN_BRAND)
+    # 상표 식별자: (원본 파일, 행 번호) -> 문자열을 만들지 않고 정수로 보관
+    temp_df['Source_File'] = base_name
+    temp_df['Row_ID'] = df.index.to_numpy(dtype='int64')
+    # 출원 국가 (파일명 '한국_DATA.xlsx' -> '한국')
+    temp_df['Country'] = data_ingest.country_of(base_name)
+    # 출원일자 -> 1970-01-01 기준 일 수 (브랜드 -> 상표 엣지의 edge_time, 없으면 NO_DATE)
+    if '출원일자' in df.columns:
+        temp_df['Days'] = graph_snapshot.to_days(cleaning.clean_date_series(df['출원일자']))
+    else:
+        temp_df['Days'] = graph_snapshot.NO_DATE
+    # 류
+    temp_df['Class'] = df.get('류', "0")
+    # 유사군 (없으면 Unknown 처리)
+    temp_df['Group_Raw'] = df.get('유사군', "Unknown_Group")
+    return temp_df
+
+def iter_excel_chunks(source_rows, workers=None, chunk_rows=data_ingest.STREAM_CHUNK_ROWS, stream=True):
+    """
+    [스트리밍] 엑셀을 파일 -> chunk 순서로 정제된 (브랜드, 상표, 류, 유사군) 테이블로 반환합니다.
+    전체 DataFrame 을 만들지 않으며, 파일별 전체 행 수는 source_rows 에 채웁니다.
+    """
+    all_files = data_ingest.list_workbooks(DATA_DIR)
+    print(f"📂 총 {len(all_files)}개의 엑셀 파일을 발견했습니다. chunk 단위로 읽습니다...")
+    caches = data_ingest.prepare_caches(all_files, columns=GRAPH_COLUMNS, workers=workers, stream=stream)
+
+    for (filename, _), arrow_path in sorted(caches.items()):
+        base_name = os.path.basename(filename)
+        n_rows = 0
+        for df in data_ingest.iter_cache_chunks(arrow_path, GRAPH_COLUMNS, chunk_rows):
+            if '상표명칭' not in df.columns: break
+            chunk = to_graph_rows(df, base_name)
+            chunk['Class'] = cleaning.clean_class_series(chunk['Class'])
+            n_rows += len(chunk)
+            yield chunk
+        if n_rows:
+            source_rows[base_name] = n_rows
+
+def expand_groups(df):
+    """유사군 별로 행을 쪼갬 (상표 1개 - 유사군 N개 연결). Row = df 내 행 위치"""
+    group_codes = cleaning.split_group_series(df['Group_Raw'])
+    return pd.DataFrame({
+        'Row': df.index.get_indexer(group_codes.index),
+        'Group_Code': group_codes.to_numpy()
+    })
+
+def save_encoders(vocabs, source_rows, tm_table):
+    # 증분 빌드 기준점(source_rows): 파일별로 그래프에 반영된 행 수
+    # 상표 노드는 문자열 인코더 대신 정수 테이블(trademarks.arrow)로 저장합니다.
+    node_vocab.save_encoders(ENCODER_PATH, vocabs, source_rows=source_rows)
+    tm_table.save(TRADEMARK_PATH)
+
+def append_trademarks(tm_table, df, company_ids):
+    """df 의 각 행을 상표 노드로 추가하고 새 상표 노드 ID 배열을 반환합니다."""
+    files = df['Source_File'].astype('category')
+    file_map = tm_table.file_ids_for(files.cat.categories)
+    file_ids = np.asarray(file_map, dtype=np.int64)[files.cat.codes.to_numpy()]
+    return tm_table.append(file_ids, df['Row_ID'].to_numpy(), company_ids)
+
 def create_hetero_graph(df):
     print("🕸️ 그래프 데이터 구조 생성 중 (Encoding)...")
     data = HeteroData()
@@ -91,79 +161,245 @@ def create_hetero_graph(df):
     # 1. 유사군 확장 (Explode)
     # 한 상표에 유사군이 여러 개면 행을 늘려서 처리 (Graph 연결을 위해)
     print("   - 유사군 데이터 확장 중...")
-    df['Group_List'] = df['Group_Raw'].apply(clean_group_column)
-    # 유사군 별로 행을 쪼갬 (상표 1개 - 유사군 N개 연결)
-    df_groups = df.explode('Group_List')[['Trademark_ID', 'Group_List']].dropna()
-    df_groups.rename(columns={'Group_List': 'Group_Code'}, inplace=True)
-
-    # 2. 노드 인코딩
-    le_company = LabelEncoder()
-    le_trademark = LabelEncoder()
-    le_class = LabelEncoder()
-    le_group = LabelEncoder() # 추가된 인코더
+    df_groups = expand_groups(df)
 
+    # 2. 노드 인코딩 (해시 1패스, 등장 순서대로 ID 부여)
     print("   - 노드 ID 매핑 중...")
-    # 문자열 변환
-    company_names = df['Company_Name'].astype(str).values
-    tm_names = df['Trademark_ID'].astype(str).values
-    class_names = df['Class'].astype(str).values
-    group_names = df_groups['Group_Code'].astype(str).values
-    
-    # 핏 & 변환
-    # 주의: Trademark ID는 df와 df_groups 양쪽에서 일관성 유지 필요
-    le_trademark.fit(tm_names) # 전체 상표 기준 학습
-    
-    company_ids = le_company.fit_transform(company_names)
-    tm_ids_main = le_trademark.transform(tm_names)
-    class_ids = le_class.fit_transform(class_names)
+    vocabs = {}
+    vocabs['company'], company_ids = NodeVocab.from_values(df['Company_Name'].to_numpy())
+    vocabs['class'], class_ids = NodeVocab.from_values(df['Class'].to_numpy())
+    vocabs['group'], group_ids = NodeVocab.from_values(df_groups['Group_Code'].to_numpy())
+    vocabs['country'], country_ids = NodeVocab.from_values(df['Country'].to_numpy())
+
+    # 상표 노드 = 출원 1건(행 1개). ID는 테이블 행 번호
+    tm_table = TrademarkTable.empty()
+    tm_ids_main = append_trademarks(tm_table, df, company_ids)
     
-    # 그룹 데이터 쪽 상표 ID 변환
-    tm_ids_group = le_trademark.transform(df_groups['Trademark_ID'].astype(str).values)
-    group_ids = le_group.fit_transform(group_names)
+    # 그룹 데이터 쪽 상표 ID: 같은 행의 상표 ID를 그대로 사용
+    tm_ids_group = tm_ids_main[df_groups['Row'].to_numpy()]
 
     # 노드 메타데이터 저장
-    data['company'].num_nodes = len(le_company.classes_)
-    data['trademark'].num_nodes = len(le_trademark.classes_)
-    data['class'].num_nodes = len(le_class.classes_)
-    data['group'].num_nodes = len(le_group.classes_) # 추가
+    data['company'].num_nodes = len(vocabs['company'])
+    data['trademark'].num_nodes = len(tm_table)
+    data['class'].num_nodes = len(vocabs['class'])
+    data['group'].num_nodes = len(vocabs['group']) # 추가
+    data['country'].num_nodes = len(vocabs['country'])
 
     print(f"    브랜드 노드: {data['company'].num_nodes:,}개")
     print(f"    상표 노드: {data['trademark'].num_nodes:,}개")
     print(f"    류 노드: {data['class'].num_nodes:,}개")
     print(f"    유사군 노드: {data['group'].num_nodes:,}개 (New!)")
+    print(f"    국가 노드: {data['country'].num_nodes:,}개")
 
     # 3. 엣지 생성
     print("   - 엣지 연결 생성 중...")
     
     # 1) Brand -> Trademark
-    src_c = torch.tensor(company_ids, dtype=torch.long)
-    dst_t = torch.tensor(tm_ids_main, dtype=torch.long)
+    src_c = torch.from_numpy(company_ids)
+    dst_t = torch.from_numpy(tm_ids_main)
     data['company', 'files', 'trademark'].edge_index = torch.stack([src_c, dst_t], dim=0)
+    data['company', 'files', 'trademark'].edge_time = torch.from_numpy(df['Days'].to_numpy(dtype=np.int32))
 
     # 2) Trademark -> Class
-    src_t = torch.tensor(tm_ids_main, dtype=torch.long)
-    dst_cl = torch.tensor(class_ids, dtype=torch.long)
+    src_t = torch.from_numpy(tm_ids_main)
+    dst_cl = torch.from_numpy(class_ids)
     data['trademark', 'belongs_to', 'class'].edge_index = torch.stack([src_t, dst_cl], dim=0)
     
     # 3) Trademark -> Group (New Edge!)
-    src_tg = torch.tensor(tm_ids_group, dtype=torch.long)
-    dst_g = torch.tensor(group_ids, dtype=torch.long)
+    src_tg = torch.from_numpy(tm_ids_group)
+    dst_g = torch.from_numpy(group_ids)
     data['trademark', 'has_code', 'group'].edge_index = torch.stack([src_tg, dst_g], dim=0)
 
+    # 4) Trademark -> Country (출원 국가)
+    data['trademark', 'filed_in', 'country'].edge_index = torch.stack([src_t, torch.from_numpy(country_ids)], dim=0)
+
     # 4. 저장
-    torch.save({
-        'company_classes': le_company.classes_,
-        'trademark_classes': le_trademark.classes_,
-        'class_classes': le_class.classes_,
-        'group_classes': le_group.classes_
-    }, os.path.join(OUTPUT_DIR, "label_encoders.pt"))
+    save_encoders(vocabs, df.attrs.get('source_rows', {}), tm_table)
+
+    return data
+
+def append_to_hetero_graph(data, encoders, df):
+    """
+    [증분 빌드] 새로 추가된 출원(df)만 기존 그래프에 이어 붙입니다.
+    - 기존 노드 ID는 절대 바뀌지 않고, 처음 보는 브랜드/류/유사군과 새 출원(상표)만 뒤에 새 ID를 받습니다.
+    - label_encoders.pt / trademarks.arrow 도 같은 순서로 확장하여 저장합니다.
+    """
+    print(f"➕ 증분 반영 중: 신규 출원 {len(df):,}건")
+    vocabs = {ntype: encoders[f'{ntype}_classes'] for ntype in VOCAB_TYPES}
+    tm_table = encoders['trademarks']
+    before = {ntype: len(v) for ntype, v in vocabs.items()}
+    before['trademark'] = len(tm_table)
+
+    new_edges = encode_rows(vocabs, tm_table, df)
 
+    sizes = {ntype: len(v) for ntype, v in vocabs.items()}
+    sizes['trademark'] = len(tm_table)
+    for ntype, size in sizes.items():
+        data[ntype].num_nodes = size
+        print(f"    {ntype} 노드: {before[ntype]:,} -> {size:,}개 (+{size - before[ntype]:,})")
+
+    for etype, (src, dst) in new_edges.items():
+        delta = torch.stack([torch.from_numpy(src), torch.from_numpy(dst)], dim=0)
+        data[etype].edge_index = torch.cat([data[etype].edge_index, delta], dim=1)
+    data[FILES].edge_time = torch.cat([data[FILES].edge_time, torch.from_numpy(df['Days'].to_numpy(dtype=np.int32))])
+
+    source_rows = dict(encoders.get('source_rows', {}))
+    source_rows.update(df.attrs.get('source_rows', {}))
+    save_encoders(vocabs, source_rows, tm_table)
+    return data
+
+def encode_rows(vocabs, tm_table, df):
+    """
+    출원 행(df)을 기존 vocabs/tm_table 뒤에 이어 붙이고 새 엣지 {엣지 타입: (src, dst)} 를 반환합니다.
+    ID는 등장 순서대로 부여되므로 chunk 로 나눠 넣어도 한 번에 넣은 것과 같은 ID가 나옵니다.
+    """
+    df_groups = expand_groups(df)
+
+    company_ids = vocabs['company'].extend(df['Company_Name'].to_numpy())
+    tm_ids_main = append_trademarks(tm_table, df, company_ids)
+    class_ids = vocabs['class'].extend(df['Class'].to_numpy())
+    tm_ids_group = tm_ids_main[df_groups['Row'].to_numpy()]
+    group_ids = vocabs['group'].extend(df_groups['Group_Code'].to_numpy())
+    country_ids = vocabs['country'].extend(df['Country'].to_numpy())
+    return {
+        FILES: (company_ids, tm_ids_main),
+        BELONGS_TO: (tm_ids_main, class_ids),
+        HAS_CODE: (tm_ids_group, group_ids),
+        FILED_IN: (tm_ids_main, country_ids),
+    }
+
+def create_hetero_graph_streaming(chunks, source_rows):
+    """
+    [스트리밍] chunk 를 하나씩 인코딩해 그래프를 만듭니다. (create_hetero_graph 와 같은 결과)
+    메모리에는 chunk 1개 + 정수 엣지 배열만 남습니다.
+    """
+    print("🕸️ 그래프 데이터 구조 생성 중 (chunk 단위 Encoding)...")
+    vocabs = {ntype: NodeVocab([]) for ntype in VOCAB_TYPES}
+    tm_table = TrademarkTable.empty()
+    parts = {FILES: [], BELONGS_TO: [], HAS_CODE: [], FILED_IN: []}
+    days = []
+    n_rows = 0
+    for df in chunks:
+        for etype, edges in encode_rows(vocabs, tm_table, df).items():
+            parts[etype].append(edges)
+        days.append(df['Days'].to_numpy(dtype=np.int32))
+        n_rows += len(df)
+        print(f"   - {n_rows:,}행 처리 (브랜드 {len(vocabs['company']):,} / 유사군 {len(vocabs['group']):,})")
+    if n_rows == 0: raise ValueError("❌ 로드된 데이터가 없습니다.")
+
+    data = HeteroData()
+    data['company'].num_nodes = len(vocabs['company'])
+    data['trademark'].num_nodes = len(tm_table)
+    data['class'].num_nodes = len(vocabs['class'])
+    data['group'].num_nodes = len(vocabs['group'])
+    data['country'].num_nodes = len(vocabs['country'])
+    for ntype in ['company', 'trademark', 'class', 'group', 'country']:
+        print(f"    {ntype} 노드: {data[ntype].num_nodes:,}개")
+
+    for etype, pieces in parts.items():
+        src = np.concatenate([p[0] for p in pieces])
+        dst = np.concatenate([p[1] for p in pieces])
+        data[etype].edge_index = torch.stack([torch.from_numpy(src), torch.from_numpy(dst)], dim=0)
+    data[FILES].edge_time = torch.from_numpy(np.concatenate(days))
+
+    save_encoders(vocabs, source_rows, tm_table)
     return data
 
+def _load_previous_build():
+    """이전 빌드 결과(그래프, 인코더)를 읽습니다. 증분 정보가 없으면 None"""
+    if not (os.path.exists(GRAPH_PATH) and os.path.exists(ENCODER_PATH)):
+        return None, None
+    data = artifact_store.load_graph(GRAPH_PATH)
+    encoders = node_vocab.load_encoders(ENCODER_PATH)
+    if 'source_rows' not in encoders or 'trademarks' not in encoders:
+        return None, None
+    if 'country_classes' not in encoders or FILED_IN not in data.edge_types or 'edge_time' not in data[FILES]:
+        return None, None   # 국가 노드/출원일자가 없던 이전 형식 -> 전체 재생성
+    return data, encoders
+
+def build_incremental(workers=None):
+    """
+    증분 빌드. 다음 경우에는 전체 재생성으로 전환합니다.
+    - 이전 빌드가 없거나 증분 정보(source_rows)가 없는 경우
+    - 이미 반영된 파일의 행 수가 줄었거나 파일이 사라진 경우 (append 가정 위반)
+    """
+    data, encoders = _load_previous_build()
+    if data is None:
+        print("ℹ️ 이전 빌드 정보가 없어 전체 재생성합니다.")
+        return create_hetero_graph(load_excel_files(workers))
+
+    prev_rows = encoders['source_rows']
+    df = load_excel_files(workers, skip_rows=prev_rows)
+    cur_rows = df.attrs['source_rows']
+
+    shrunk = [f for f, n in prev_rows.items() if cur_rows.get(f, 0) < n]
+    if shrunk:
+        print(f"⚠️ 기존 데이터가 변경/삭제되었습니다 ({', '.join(shrunk)}). 전체 재생성합니다.")
+        return create_hetero_graph(load_excel_files(workers))
+
+    if len(df) == 0:
+        print("✅ 새로 추가된 출원이 없습니다. 그래프를 그대로 유지합니다.")
+        return data
+
+    return append_to_hetero_graph(data, encoders, df)
+
+def save_country_slice(countries):
+    """
+    [국가별 부분 그래프] 이미 만든 그래프에서 선택한 국가의 상표와 연결된 노드만 잘라 저장합니다.
+    엑셀을 다시 읽지 않으며, 결과는 slices/<국가>/graph_data.pt (+ .mmap/) 이고
+    노드 타입별 n_id 에 전체 그래프의 노드 ID가 남습니다. (이름은 country_index.slice_encoders 로 n_id 조회)
+    학습: gnn_training_v3_shortcut.py --country 한국 / 분석: main.py expansion --country 한국
+    """
+    data, encoders = artifact_store.load_graph(GRAPH_PATH), node_vocab.load_encoders(ENCODER_PATH)
+    t0 = time.perf_counter()
+    sub = country_index.subgraph(data, encoders, countries)
+    out_dir = country_index.slice_dir(countries)
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, os.path.basename(GRAPH_PATH))
+    artifact_store.save_graph(sub, path)
+    print(f"✂️ [{', '.join(countries)}] 부분 그래프 ({time.perf_counter() - t0:.2f}s)")
+    for ntype in sub.node_types:
+        print(f"    {ntype} 노드: {data[ntype].num_nodes:,} -> {sub[ntype].num_nodes:,}개")
+    print(f"💾 저장 완료: {path}")
+    return sub
+
 if __name__ == "__main__":
-    df = load_excel_files()
-    graph_data = create_hetero_graph(df)
+    parser = argparse.ArgumentParser(description="상표 데이터 -> 이종 그래프(HeteroData) 생성")
+    parser.add_argument('--incremental', action='store_true', help="새로 추가된 출원만 기존 그래프에 이어 붙입니다.")
+    parser.add_argument('--workers', type=int, default=None, help="엑셀 병렬 로드 프로세스 수")
+    parser.add_argument('--stream', action='store_true',
+                        help="필요한 컬럼만 행 단위로 읽고 chunk 단위로 그래프 생성 (큰 엑셀 메모리 절약)")
+    parser.add_argument('--chunk-rows', type=int, default=data_ingest.STREAM_CHUNK_ROWS)
+    parser.add_argument('--slice', nargs='+', metavar='COUNTRY', default=None,
+                        help="그래프를 다시 만들지 않고 기존 그래프에서 국가별 부분 그래프만 저장 (예: --slice 한국)")
+    args = parser.parse_args()
+
+    if args.slice:
+        save_country_slice(args.slice)
+        sys.exit(0)
+
+    if args.incremental:
+        graph_data = build_incremental(args.workers)
+    elif args.stream:
+        source_rows = {}
+        chunks = iter_excel_chunks(source_rows, args.workers, args.chunk_rows)
+        graph_data = create_hetero_graph_streaming(chunks, source_rows)
+    else:
+        df = load_excel_files(args.workers)
+        graph_data = create_hetero_graph(df)
     
-    save_path = os.path.join(OUTPUT_DIR, "graph_data.pt")
-    torch.save(graph_data, save_path)
-    print(f"\n💾 그래프 재생성 완료 (유사군 포함): {save_path}")
\ No newline at end of file
+    artifact_store.save_graph(graph_data, GRAPH_PATH)   # .pt + graph_data.mmap/
+    print(f"\n💾 그래프 재생성 완료 (유사군 포함): {GRAPH_PATH}")
+
+    # 분석 스크립트용 이웃 조회 인덱스 (CSR/CSC)
+    graph_index.build_and_save(graph_data)
+    print(f"💾 인접 인덱스 저장 완료: {graph_index.GRAPH_INDEX_PATH}")
+
+    # 브랜드 x 류 / 브랜드 x 유사군 출원 수 (희소 CSR, 학습 지름길 + 분석용)
+    brand_counts.build_and_save(graph_data)
+    print(f"💾 브랜드 집계 행렬 저장 완료: {brand_counts.BRAND_COUNTS_PATH}")
+
+    # 상표 -> 국가, 브랜드 -> 국가 비트마스크 (한국 브랜드 선정 등 국가 필터용)
+    country_index.build_and_save(graph_data, node_vocab.load_encoders(ENCODER_PATH))
+    print(f"💾 국가 인덱스 저장 완료: {country_index.COUNTRY_INDEX_PATH}")
+
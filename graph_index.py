@@ -0,0 +1,182 @@
+import os
+import torch
+
+import artifact_store
+from object_cache import LatestCache
+
+# ==========================================
+# 🗂️ 엣지 인접 인덱스 (CSR)
+# ------------------------------------------
+# edge_index 에서 `edge_ct[0] == brand_idx` / torch.isin(...) 으로 이웃을 찾으면
+# 쿼리마다 전체 엣지(수백만 개)를 훑어야 합니다 (O(E)).
+# 엣지 타입별로 출발 노드 기준 CSR(indptr, indices)을 한 번 만들어 두면
+# 이웃 조회는 슬라이스 한 번 (O(degree)) 입니다.
+# 역방향(CSC)은 ('trademark', 'rev_files', 'company') 처럼 rev_ 접두사 타입으로 저장합니다.
+#   index = graph_index.of(data)
+#   index.neighbors(FILES, brand_idx)          -> 브랜드의 상표들
+#   index.neighbors_of(BELONGS_TO, tm_indices) -> 상표들의 류 (상표 순서대로 이어 붙임)
+#   index.degree(FILES)                        -> 브랜드별 상표 수
+# ==========================================
+GRAPH_INDEX_PATH = "./outputs/graph/graph_index.pt"
+
+FILES = ('company', 'files', 'trademark')
+BELONGS_TO = ('trademark', 'belongs_to', 'class')
+HAS_CODE = ('trademark', 'has_code', 'group')
+FILED_IN = ('trademark', 'filed_in', 'country')
+
+def reverse(etype):
+    src, rel, dst = etype
+    rel = rel[4:] if rel.startswith('rev_') else f'rev_{rel}'
+    return (dst, rel, src)
+
+def _build_csr(src, dst, num_src):
+    """src 기준 정렬(stable) -> 같은 출발 노드 안에서는 원래 엣지 순서 유지"""
+    order = torch.argsort(src, stable=True)
+    counts = torch.bincount(src, minlength=num_src)
+    indptr = torch.zeros(num_src + 1, dtype=torch.long)
+    torch.cumsum(counts, dim=0, out=indptr[1:])
+    return indptr, dst[order].contiguous()
+
+def gather_ranges(indptr, nodes):
+    """CSR 에서 nodes 각 행의 구간 [indptr[n], indptr[n+1]) 위치를 이어 붙여 반환"""
+    nodes = torch.as_tensor(nodes, dtype=torch.long).reshape(-1)
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return torch.zeros(0, dtype=torch.long), counts
+    # 각 구간의 시작 위치를 펼친 뒤 구간 내 오프셋을 더합니다.
+    seg_begin = torch.cumsum(counts, dim=0) - counts
+    pos = torch.repeat_interleave(starts - seg_begin, counts) + torch.arange(total)
+    return pos, counts
+
+class GraphIndex:
+    def __init__(self, csr, signature):
+        self.csr = csr              # {etype: (indptr, indices)}
+        self.signature = signature  # 원본 그래프 파일 서명 (재사용 가능 여부 판단용, 디스크 그래프가 아니면 None)
+
+    @classmethod
+    def build(cls, data):
+        csr = {}
+        for etype in data.edge_types:
+            src_type, _, dst_type = etype
+            edge_index = data[etype].edge_index.long()
+            csr[etype] = _build_csr(edge_index[0], edge_index[1], data[src_type].num_nodes)
+            csr[reverse(etype)] = _build_csr(edge_index[1], edge_index[0], data[dst_type].num_nodes)
+        return cls(csr, graph_signature(data))
+
+    # ------------------------------------------
+    # 조회
+    # ------------------------------------------
+    def neighbors(self, etype, node):
+        """노드 1개의 이웃 (O(degree), 복사 없는 슬라이스)"""
+        indptr, indices = self.csr[etype]
+        node = int(node)
+        return indices[indptr[node]:indptr[node + 1]]
+
+    def neighbors_of(self, etype, nodes):
+        """여러 노드의 이웃을 이어 붙여 반환 (중복 포함 -> 빈도 집계에 그대로 사용)"""
+        indptr, indices = self.csr[etype]
+        pos, _ = gather_ranges(indptr, nodes)
+        return indices[pos]
+
+    def degree(self, etype, nodes=None):
+        indptr, _ = self.csr[etype]
+        deg = indptr[1:] - indptr[:-1]
+        return deg if nodes is None else deg[torch.as_tensor(nodes, dtype=torch.long)]
+
+    # ------------------------------------------
+    # 저장 / 로드
+    # ------------------------------------------
+    def save(self, path=GRAPH_INDEX_PATH):
+        payload = {
+            'signature': self.signature,
+            'csr': {etype: {'indptr': p, 'indices': i} for etype, (p, i) in self.csr.items()},
+        }
+        torch.save(payload, path)
+
+    @classmethod
+    def load(cls, path=GRAPH_INDEX_PATH):
+        try:
+            payload = torch.load(path, weights_only=False)
+        except TypeError:
+            payload = torch.load(path)
+        csr = {etype: (v['indptr'], v['indices']) for etype, v in payload['csr'].items()}
+        return cls(csr, payload['signature'])
+
+# ==========================================
+# 🔖 파생 아티팩트 (graph_index / brand_counts / country_index) 공통 저장 규칙
+# ------------------------------------------
+# 서명 = 그래프 파일의 경로/크기/수정시각 (+ 노드/엣지 수). 같은 크기로 다시 생성된 그래프도 구분합니다.
+# 디스크 그래프 파일 그대로인 객체만 저장 파일을 읽고/씁니다. 파일은 그래프와 같은 폴더에 둡니다.
+# (국가 부분 그래프 slices/<국가>/graph_data.pt 는 그 폴더에 따로)
+# 스냅샷/부분 그래프/이전 그래프는 메모리에서만 만들고 저장 파일을 건드리지 않습니다.
+# ==========================================
+def graph_signature(data):
+    """디스크 그래프 파일 서명 + 노드/엣지 수. 파일에서 읽은(저장한) 그래프가 아니면 None"""
+    source = artifact_store.source_of(data)
+    if source is None:
+        return None
+    return {
+        'file': source,
+        'nodes': {ntype: int(data[ntype].num_nodes) for ntype in data.node_types},
+        'edges': {etype: int(data[etype].edge_index.size(1)) for etype in data.edge_types},
+    }
+
+def artifact_path(signature, default_path):
+    """그래프 파일과 같은 폴더의 파생 아티팩트 경로"""
+    return os.path.join(os.path.dirname(signature['file']['path']), os.path.basename(default_path))
+
+def save_artifact(data, default_path, build, save, label, path=None):
+    """graph_generator 에서 그래프 저장 직후 호출: 새로 만들어 저장"""
+    signature = graph_signature(data)
+    if signature is None:
+        raise ValueError(f"❌ 저장된 그래프 파일이 아닙니다 ({label} 저장 불가). artifact_store.save_graph 후 호출하세요.")
+    value = build()
+    save(value, signature, path or artifact_path(signature, default_path))
+    return value
+
+def load_or_build_artifact(data, default_path, build, load, save, label, path=None):
+    """저장된 아티팩트가 현재 그래프 파일과 맞으면 재사용, 아니면 새로 만들어 (디스크 그래프만) 저장합니다."""
+    signature = graph_signature(data)
+    if signature is None:
+        return build()   # 스냅샷/부분 그래프/이전 그래프: 메모리에서만
+    path = path or artifact_path(signature, default_path)
+    if os.path.exists(path):
+        try:
+            value, saved = load(path)
+        except (OSError, KeyError, RuntimeError) as e:
+            print(f"⚠️ {label} 로드 실패, 다시 생성합니다: {e}")
+        else:
+            if saved == signature:
+                return value
+            print(f"ℹ️ 그래프가 변경되어 다시 생성합니다: {label}")
+    value = build()
+    try:
+        save(value, signature, path)
+    except OSError as e:
+        print(f"⚠️ {label} 저장 실패 (메모리에서만 사용): {e}")
+    return value
+
+def _load_index(path):
+    index = GraphIndex.load(path)
+    return index, index.signature
+
+def _save_index(index, signature, path):
+    index.signature = signature
+    index.save(path)
+
+def build_and_save(data, path=None):
+    """graph_generator 에서 그래프 저장 직후 호출"""
+    return save_artifact(data, GRAPH_INDEX_PATH, lambda: GraphIndex.build(data), _save_index, "인접 인덱스", path)
+
+def load_or_build(data, path=None):
+    """저장된 인덱스가 현재 그래프 파일과 맞으면 재사용, 아니면 새로 만듭니다. (디스크 그래프만 저장)"""
+    return load_or_build_artifact(data, GRAPH_INDEX_PATH, lambda: GraphIndex.build(data),
+                                  _load_index, _save_index, "인접 인덱스", path)
+
+_CACHE = LatestCache()
+
+def of(data):
+    """분석 스크립트용: 그래프 객체별로 인덱스를 한 번만 읽어 재사용합니다."""
+    return _CACHE.get(data, lambda: load_or_build(data))
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+import torch
+
+from object_cache import LatestCache
+from graph_index import FILES
+
+# ==========================================
+# 🕰️ 출원일자 기반 그래프 스냅샷
+# ------------------------------------------
+# graph_generator 가 브랜드 -> 상표(FILES) 엣지에 출원일자를 edge_time 으로 저장합니다.
+#   data[FILES].edge_time : int32 [엣지 수], 1970-01-01 기준 일 수 (날짜 없음 = NO_DATE)
+# 그래프당 한 번, 상표와 연결된 엣지 타입마다 엣지를 "상표의 출원일자" 순으로 정렬해 두면
+# 기간 [start, end) 의 엣지는 정렬 배열의 연속 구간(searchsorted 2번)이고 스냅샷은 슬라이스(복사 없음)입니다.
+# (전체 엣지 마스크/DataFrame 재필터링 없음)
+#   snap = graph_snapshot.snapshot(data, '2020-01-01', '2025-01-01')
+#   -> 노드 ID/개수는 전체 그래프와 같고, 기간 내 출원의 엣지만 남은 HeteroData
+# prefix(data, n) 은 상표 ID 앞 n개까지만 반영된 그래프(= 증분 빌드 이전 그래프)를 재현합니다.
+# ==========================================
+NO_DATE = np.iinfo(np.int32).min
+
+def to_days(dates):
+    """datetime Series/배열 -> int32 일 수 (NaT -> NO_DATE)"""
+    dates = pd.DatetimeIndex(dates)
+    days = dates.values.astype('datetime64[D]').astype(np.int64)
+    days[dates.isna()] = NO_DATE
+    return days.astype(np.int32)
+
+def parse_day(value):
+    """'2024-01-01' / 2024(연도) / Timestamp -> int 일 수 (None 은 그대로)"""
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)) and 1000 <= value <= 9999:
+        value = f"{value}-01-01"
+    return int(np.datetime64(pd.Timestamp(value).date(), 'D').astype(np.int64))
+
+def format_day(day):
+    return "날짜 없음" if day == NO_DATE else str(np.datetime64(int(day), 'D'))
+
+class TimeIndex:
+    """엣지 타입별로 상표 출원일자 순으로 정렬한 엣지 배열 (그래프당 1번 계산)"""
+    def __init__(self, tm_order, tm_days, edges):
+        self.tm_order = tm_order    # LongTensor [상표 수], 출원일자 오름차순 상표 ID (stable)
+        self.tm_days = tm_days      # int32 ndarray [상표 수], 정렬된 출원일자
+        self.edges = edges          # {etype: (edge_index [2, E] 정렬됨, int32 ndarray [E] 정렬된 출원일자)}
+
+    @classmethod
+    def build(cls, data):
+        if 'edge_time' not in data[FILES]:
+            raise ValueError("❌ 출원일자(edge_time)가 없는 그래프입니다. graph_generator.py 로 다시 생성하세요.")
+        tm = data[FILES].edge_index[1].numpy()
+        days = np.full(data['trademark'].num_nodes, NO_DATE, dtype=np.int32)
+        days[tm] = np.asarray(data[FILES].edge_time)
+
+        edges = {}
+        for etype in data.edge_types:
+            if 'trademark' not in (etype[0], etype[2]):
+                continue   # 상표와 무관한 엣지 타입은 시간 정보가 없으므로 제외
+            edge_index = data[etype].edge_index
+            edge_days = days[edge_index[0 if etype[0] == 'trademark' else 1].numpy()]
+            order = torch.from_numpy(np.argsort(edge_days, kind='stable'))
+            edges[etype] = (edge_index[:, order].contiguous(), edge_days[order.numpy()])
+        order = np.argsort(days, kind='stable')
+        return cls(torch.from_numpy(order), days[order], edges)
+
+    @staticmethod
+    def _span(sorted_days, start, end):
+        """기간 [start, end) 의 정렬 구간 (lo, hi). start 가 없으면 날짜 없는 상표도 포함"""
+        lo = 0 if start is None else int(np.searchsorted(sorted_days, parse_day(start), side='left'))
+        hi = len(sorted_days) if end is None else int(np.searchsorted(sorted_days, parse_day(end), side='left'))
+        return lo, max(lo, hi)
+
+    def trademarks(self, start=None, end=None):
+        """기간 내 상표 ID (출원일자 순)"""
+        lo, hi = self._span(self.tm_days, start, end)
+        return self.tm_order[lo:hi]
+
+    def edges_in(self, etype, start=None, end=None):
+        """기간 내 엣지 (edge_index 슬라이스, 출원일자 슬라이스)"""
+        edge_index, edge_days = self.edges[etype]
+        lo, hi = self._span(edge_days, start, end)
+        return edge_index[:, lo:hi], edge_days[lo:hi]
+
+    def date_range(self):
+        dated = self.tm_days[self.tm_days != NO_DATE]
+        return (int(dated[0]), int(dated[-1])) if len(dated) else (NO_DATE, NO_DATE)
+
+def snapshot(data, start=None, end=None):
+    """
+    기간 [start, end) 에 출원된 상표의 엣지만 남긴 HeteroData. (엣지는 출원일자 순, 원본 배열의 슬라이스)
+    노드 타입/개수는 그대로 (임베딩, 인코더를 전체 그래프와 같은 ID 로 사용)
+    FILES 엣지에는 edge_time 을 함께 남깁니다.
+    """
+    from torch_geometric.data import HeteroData
+    index = of(data)
+    snap = HeteroData()
+    for nt in data.node_types:
+        snap[nt].num_nodes = data[nt].num_nodes
+    for etype in index.edges:
+        edge_index, edge_days = index.edges_in(etype, start, end)
+        snap[etype].edge_index = edge_index
+        if etype == FILES:
+            snap[etype].edge_time = torch.from_numpy(edge_days)
+    return snap
+
+def prefix(data, n_trademarks):
+    """
+    상표 ID < n_trademarks 인 출원만 반영된 그래프.
+    노드 ID는 등장 순서대로 부여되므로 (append-only) 노드 수는 남은 엣지가 가리키는 최대 ID + 1 입니다.
+    """
+    from torch_geometric.data import HeteroData
+    kept = {}
+    for etype in data.edge_types:
+        if 'trademark' not in (etype[0], etype[2]):
+            continue
+        edge_index = data[etype].edge_index
+        m = edge_index[0 if etype[0] == 'trademark' else 1] < n_trademarks
+        kept[etype] = m
+
+    snap = HeteroData()
+    sizes = {nt: 0 for nt in data.node_types}
+    sizes['trademark'] = n_trademarks
+    for etype, m in kept.items():
+        src_type, _, dst_type = etype
+        edge_index = data[etype].edge_index[:, m]
+        snap[etype].edge_index = edge_index
+        if 'edge_time' in data[etype]:
+            snap[etype].edge_time = data[etype].edge_time[m]
+        if edge_index.size(1):
+            sizes[src_type] = max(sizes[src_type], int(edge_index[0].max()) + 1)
+            sizes[dst_type] = max(sizes[dst_type], int(edge_index[1].max()) + 1)
+    for nt in data.node_types:
+        snap[nt].num_nodes = sizes[nt]
+    return snap
+
+_CACHE = LatestCache()
+
+def of(data):
+    """그래프 객체별 TimeIndex (메모리에서만 유지, 가장 최근 객체 하나)"""
+    return _CACHE.get(data, lambda: TimeIndex.build(data))
@@ -0,0 +1,91 @@
+import torch
+import torch.nn.functional as F
+
+# ==========================================
+# 🆕 데이터에 없는 브랜드의 임베딩 (재학습 없이)
+# ------------------------------------------
+# company_classes 에 없는 브랜드(신규 고객)는 임베딩 행이 없어 추천/경쟁사 질의를 할 수 없었습니다.
+# 학습 그래프에서 브랜드 노드는 들어오는 엣지가 없으므로 (files / interested_in 은 브랜드 -> 상표/류 방향)
+# 학습된 모델의 브랜드 출력은 이웃 집계가 아니라 leaky_relu(브랜드 임베딩 행) 그대로입니다.
+# -> SAGE 컨볼루션을 다시 돌려도 새 브랜드 벡터는 나오지 않으므로, 학습 목적식으로 벡터 하나만 맞춥니다.
+#   1. 출원 예정(보유) 류/유사군 구성이 가장 비슷한 기존 브랜드 NEIGHBORS 개의 임베딩 가중 평균으로 시작
+#      (유사도 = 이웃 브랜드 출원 중 같은 류/유사군 비율, brand_counts 희소 행렬 곱 1번)
+#   2. 고정된 류 임베딩 테이블에 대해 보유 류 = 양성, 나머지 = 음성 BCE 로 FOLD_STEPS 번 갱신 (fold-in)
+# 기존 임베딩/ANN 인덱스는 바꾸지 않으며, 브랜드 1개당 수 ms 입니다.
+#   vec = inductive_brand.embed(embeddings, counts, class_ids, group_ids)
+#   -> embeddings['company'] 와 같은 공간의 벡터 [dim] (류 점수 = embeddings['class'] @ vec)
+# ==========================================
+NEIGHBORS = 20
+FOLD_STEPS = 20
+FOLD_LR = 0.1
+
+def lookup(vocab, names):
+    """이름 목록 -> (ID LongTensor, 찾지 못한 이름). 류는 '09' 처럼 앞에 0을 붙여도 찾습니다."""
+    ids, unknown = [], []
+    for name in names:
+        name = str(name).strip()
+        idx = vocab.get(name)
+        if idx is None and name.isdigit():
+            idx = vocab.get(str(int(name)))
+        if idx is None:
+            unknown.append(name)
+        else:
+            ids.append(idx)
+    return torch.tensor(ids, dtype=torch.long), unknown
+
+def _profile(ids, size):
+    """ID 목록 (중복 = 출원 수) -> 합이 1인 분포 [size]"""
+    q = torch.zeros(size)
+    if len(ids):
+        q.index_add_(0, ids, torch.ones(len(ids)))
+        q /= q.sum()
+    return q
+
+def neighbor_init(embeddings, counts, class_ids, group_ids, k=NEIGHBORS, exclude=None):
+    """
+    류/유사군 구성이 비슷한 기존 브랜드 임베딩의 가중 평균 (비슷한 브랜드가 없으면 전체 평균)
+    exclude: 이웃에서 뺄 브랜드 ID (기존 브랜드를 신규로 가정해 검증할 때 본인)
+    """
+    comp = embeddings['company']
+    sim = torch.zeros(comp.shape[0])
+    totals = torch.zeros(comp.shape[0])
+    for name, ids in (('class', class_ids), ('group', group_ids)):
+        if name not in counts or len(ids) == 0:
+            continue
+        sim += counts[name].matvec(_profile(ids, counts[name].shape[1]))
+        totals += counts[name].row_sum().float()
+    sim /= totals.clamp(min=1)
+    if exclude is not None:
+        sim[exclude] = 0
+    vals, idx = torch.topk(sim, min(k, len(sim)))
+    weights = vals.clamp(min=0)
+    if weights.sum() == 0:
+        return comp.float().mean(0)
+    return (weights[:, None] * comp[idx].float()).sum(0) / weights.sum()
+
+def embed(embeddings, counts, class_ids, group_ids=None, steps=FOLD_STEPS, lr=FOLD_LR, exclude=None):
+    """
+    보유(출원 예정) 류/유사군 ID -> 브랜드 임베딩 [dim]
+    류가 없으면 (유사군만 있으면) 이웃 평균을 그대로 반환합니다.
+    """
+    class_ids = torch.as_tensor(class_ids, dtype=torch.long)
+    group_ids = torch.as_tensor([] if group_ids is None else group_ids, dtype=torch.long)
+    if len(class_ids) == 0 and len(group_ids) == 0:
+        raise ValueError("❌ 류 또는 유사군이 1개 이상 필요합니다.")
+    h0 = neighbor_init(embeddings, counts, class_ids, group_ids, exclude=exclude)
+    if len(class_ids) == 0 or steps == 0:
+        return h0
+
+    class_embs = embeddings['class'].float()
+    labels = torch.zeros(class_embs.shape[0])
+    labels[class_ids] = 1
+    # 시작점 h0 는 학습된 출력(= leaky_relu 이후)이므로 입력 공간으로 되돌려서 시작
+    x = torch.where(h0 >= 0, h0, h0 / 0.01).clone().requires_grad_(True)
+    opt = torch.optim.Adam([x], lr=lr)
+    with torch.enable_grad():
+        for _ in range(steps):
+            loss = F.binary_cross_entropy_with_logits(class_embs @ F.leaky_relu(x), labels)
+            opt.zero_grad()
+            loss.backward()
+            opt.step()
+    return F.leaky_relu(x).detach()
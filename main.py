@@ -1,40 +1,245 @@
-import pandas as pd
 import os
+import sys
+import json
+import runpy
+import argparse
 
-# 데이터 파일이 있는 폴더 경로
-data_dir = './data/'
+# ==========================================
+# 🧭 통합 CLI
+# ------------------------------------------
+# 브랜드 질의는 아티팩트(그래프/인코더/임베딩/인덱스)를 한 번만 로드하고,
+# 요청한 브랜드 전체를 한 번에 처리합니다. (expansion/competitors 는 배치 행렬곱/ANN 검색 1회)
+#   python main.py expansion 삼성 LG --top-k 5
+#   python main.py competitors --file brands.txt --json
+#   python main.py gap                       # 브랜드를 주지 않으면 각 스크립트의 기본 선정 방식
+#   python main.py brand 삼성 --plot
+#   python main.py expansion 신규브랜드 --classes 9 35 --groups G0901   # 데이터에 없는 브랜드 (inductive_brand)
+#   python main.py expansion --country 한국   # 국가별 부분 그래프(build-graph --slice 한국, train --country 한국)만 로드
+# 파이프라인 단계는 기존 스크립트를 그대로 실행합니다. (뒤의 옵션은 그대로 전달)
+#   python main.py build-graph --incremental
+#   python main.py train --minibatch --epochs 50
+#   python main.py trends
+#   python main.py inspect                   # data/ 엑셀 파일 구조 확인
+# ==========================================
+DATA_DIR = './data/'
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# data 폴더 내의 모든 파일 목록을 가져옵니다.
-file_list = os.listdir(data_dir)
+SCRIPTS = {
+    'build-graph': 'graph_generator.py',
+    'train': 'gnn_training_v3_shortcut.py',
+    'trends': 'market_trend_analyzer.py',
+}
+UNSEEN_COMMANDS = ('expansion', 'competitors')   # 데이터에 없는 브랜드도 류/유사군으로 질의 가능
+BRAND_COMMANDS = {
+    'expansion': ("신사업(류) 추천", 3),
+    'competitors': ("유사(경쟁) 브랜드", 5),
+    'gap': ("주력 류 기준 누락 유사군", 5),
+    'brand': ("브랜드 보유 현황", 5),
+}
 
-# .xlsx 파일만 필터링합니다.
-xlsx_files = [f for f in file_list if f.endswith('.xlsx')]
+# ==========================================
+# 🔎 data/ 엑셀 파일 확인 (기존 main.py)
+# ==========================================
+def inspect_data(data_dir=DATA_DIR):
+    import pandas as pd
 
-print("--- 데이터 로드 시작 ---")
+    xlsx_files = [f for f in os.listdir(data_dir) if f.endswith('.xlsx')]
+    print("--- 데이터 로드 시작 ---")
+    for file_name in xlsx_files:
+        file_path = os.path.join(data_dir, file_name)
+        print(f"\n✅ 파일 로드 중: **{file_name}**")
+        try:
+            df = pd.read_excel(file_path)
+            print("💡 데이터프레임 정보 (df.info()):")
+            df.info()
+            print("\n💡 데이터의 처음 5줄 (df.head()):")
+            print(df.head())
+            print(f"\n📊 {file_name} 파일 로드 완료! (총 {len(df)} 행)")
+        except FileNotFoundError:
+            print(f"❌ 오류: 파일을 찾을 수 없습니다. 경로를 확인해주세요: {file_path}")
+        except Exception as e:
+            print(f"❌ 오류: 파일을 읽는 중 문제가 발생했습니다: {e}")
+    print("\n--- 데이터 로드 완료 ---")
+
+def run_script(script, argv):
+    """기존 스크립트를 __main__ 으로 실행 (옵션은 그대로 전달)"""
+    path = os.path.join(BASE_DIR, script)
+    sys.argv = [path] + list(argv)
+    runpy.run_path(path, run_name='__main__')
+
+# ==========================================
+# 🏢 브랜드 질의
+# ==========================================
+def read_brand_names(brands, file=None):
+    """명령행 브랜드 + 파일(한 줄에 하나, # 주석/빈 줄 무시)"""
+    names = list(brands)
+    if file:
+        with open(file, 'r', encoding='utf-8-sig') as f:
+            names += [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+    return names
+
+def default_targets(command, res, n):
+    """브랜드를 지정하지 않으면 각 분석 스크립트의 __main__ 과 같은 기준으로 선정"""
+    from graph_index import FILES
+    if command == 'expansion':
+        import gnn_korean_expansion
+        return gnn_korean_expansion.get_top_korean_brands(res.data, res.encoders, top_k=n)[0]
+    if command == 'competitors':
+        import gnn_korean_competitors
+        return gnn_korean_competitors.get_top_korean_brands(res.data, res.encoders, top_k=n)
+    if command == 'gap':
+        import gnn_korean_gap_analysis
+        return gnn_korean_gap_analysis.get_diverse_top_korean_brands(res.data, res.encoders, top_k=n)
+    return res.index.degree(FILES).topk(min(n, res.num_brands)).indices.tolist()
+
+def compute(command, res, brand_ids, top_k):
+    """브랜드 ID 목록 -> 같은 순서의 결과 목록"""
+    import brand_queries
+    if command == 'expansion':
+        return brand_queries.expansion_batch(res, brand_ids, top_k)
+    if command == 'competitors':
+        return brand_queries.competitors_batch(res, brand_ids, top_k)
+    if command == 'gap':
+        return [brand_queries.gap_analysis(res, idx, top_k) for idx in brand_ids]
+    return [brand_queries.brand_stats(res, idx) for idx in brand_ids]
+
+def print_result(command, name, result):
+    print(f"\n🏢 {name}")
+    if command == 'expansion':
+        for r in result:
+            print(f"   👉 추천: {r['class']}류 (점수: {r['score']:.2f})")
+    elif command == 'competitors':
+        for r in result:
+            print(f"   🤜 유사 브랜드: {r['brand']:<20} (유사도: {r['score']:.4f})")
+    elif command == 'gap':
+        if result['main_class'] is None:
+            print("   ⚠️ 보유한 류가 없습니다.")
+            return
+        print(f"   📌 주력 사업: {result['main_class']}류 | 강점 유사군: {', '.join(result['my_strong'])}")
+        for g in result['gaps']:
+            print(f"   👉 누락됨: {g['name']} (시장 출원 수: {g['market_count']}건)")
+    else:
+        print(f"   📌 보유 상표 수 : {result['trademarks']}건")
+        print(f"   📌 주력 류(Class): {', '.join(c['name'] for c in result['top_classes'])}")
+        print(f"   📌 주력 유사군   : {', '.join(g['name'] for g in result['top_groups'])}")
+
+def plot_spec(command, res, name, idx, result):
+    """기존 스크립트의 플롯 스펙 함수 재사용 (렌더링은 render_pool 에서 한 번에)"""
+    if command == 'expansion':
+        from gnn_korean_expansion import expansion_spec
+        return expansion_spec(res.data, res.encoders, name, [(r['class'], r['score']) for r in result])
+    if command == 'competitors':
+        from gnn_korean_competitors import competitor_spec
+        comps = [(r['brand'], r['score'], r['brand_id']) for r in result]
+        return competitor_spec(res.data, res.encoders, name, comps, idx)
+    if command == 'gap':
+        from gnn_korean_gap_analysis import gap_spec
+        if result['main_class'] is None: return None
+        return gap_spec(name, dict(result, gaps=[g['name'] for g in result['gaps']]))
+    from graph_analysis import brand_spec
+    return brand_spec(res.data, res.encoders, name)
+
+def compute_unseen(command, res, names, classes, groups, top_k):
+    """데이터에 없는 브랜드 -> 입력한 류/유사군으로 만든 임베딩의 결과 (브랜드마다 같은 구성)"""
+    import brand_queries
+    try:
+        unseen = brand_queries.unseen_brand(res, classes, groups)
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+    if unseen['unknown']:
+        print(f"⚠️ 알 수 없는 류/유사군은 제외합니다: {', '.join(unseen['unknown'])}")
+    if command == 'expansion':
+        result = brand_queries.expansion_unseen(res, unseen, top_k)
+    else:
+        result = brand_queries.competitors_unseen(res, unseen, top_k)
+    return {name: result for name in names}
+
+def run_brand_command(args):
+    import resources
+    from brand_queries import resolve_brands
 
-# 각 .xlsx 파일을 순회하며 로드하고 정보를 출력합니다.
-for file_name in xlsx_files:
-    file_path = os.path.join(data_dir, file_name)
-    print(f"\n✅ 파일 로드 중: **{file_name}**")
-    
     try:
-        # Pandas의 read_excel 함수를 사용하여 데이터를 DataFrame으로 로드합니다.
-        # 첫 번째 시트를 로드하며, 시트 이름이 필요하다면 sheet_name='시트이름'을 사용합니다.
-        df = pd.read_excel(file_path)
-        
-        # 데이터프레임의 기본 정보 출력
-        print("💡 데이터프레임 정보 (df.info()):")
-        df.info()
-        
-        # 데이터의 처음 5줄 출력
-        print("\n💡 데이터의 처음 5줄 (df.head()):")
-        print(df.head())
-        
-        print(f"\n📊 {file_name} 파일 로드 완료! (총 {len(df)} 행)")
-
-    except FileNotFoundError:
-        print(f"❌ 오류: 파일을 찾을 수 없습니다. 경로를 확인해주세요: {file_path}")
-    except Exception as e:
-        print(f"❌ 오류: 파일을 읽는 중 문제가 발생했습니다: {e}")
-
-print("\n--- 데이터 로드 완료 ---")
\ No newline at end of file
+        res = resources.load(country=args.country)
+    except FileNotFoundError as e:
+        sys.exit(str(e))
+    if args.command in ('expansion', 'competitors') and res.embeddings is None:
+        train = f"train --country {' '.join(args.country)}" if args.country else "train"
+        sys.exit(f"❌ 임베딩이 없습니다. 먼저 `python main.py {train}` 을 실행하세요.")
+
+    names = read_brand_names(args.brands, args.file)
+    has_profile = bool(getattr(args, 'classes', None) or getattr(args, 'groups', None))
+    missing = []
+    if names:
+        brand_ids, missing = resolve_brands(res, names)
+        for name in missing:
+            if has_profile:
+                print(f"🆕 브랜드 '{name}'은 데이터에 없어 입력한 류/유사군으로 임베딩을 계산합니다.")
+            else:
+                print(f"⚠️ 브랜드 '{name}'을 찾을 수 없습니다.")
+    else:
+        brand_ids = default_targets(args.command, res, args.default_count)
+    if not has_profile:
+        missing = []
+    if not brand_ids and not missing:
+        print("❌ 분석할 브랜드가 없습니다.")
+        return
+
+    top_k = args.top_k or BRAND_COMMANDS[args.command][1]
+    results = compute(args.command, res, brand_ids, top_k) if brand_ids else []
+    comp_names = res.encoders['company_classes']
+
+    if not args.json:
+        print(f"\n🚀 [{BRAND_COMMANDS[args.command][0]}] 브랜드 {len(brand_ids) + len(missing)}개")
+    specs = []
+    for idx, result in zip(brand_ids, results):
+        name = comp_names[idx]
+        if args.json:
+            print(json.dumps({'brand': name, 'brand_id': int(idx), 'result': result}, ensure_ascii=False))
+        else:
+            print_result(args.command, name, result)
+        if args.plot:
+            specs.append(plot_spec(args.command, res, name, idx, result))
+    if missing:
+        # 그래프에 노드가 없으므로 시각화는 생략
+        for name, result in compute_unseen(args.command, res, missing, args.classes, args.groups, top_k).items():
+            if args.json:
+                print(json.dumps({'brand': name, 'brand_id': None, 'unseen': True, 'result': result}, ensure_ascii=False))
+            else:
+                print_result(args.command, name + " (신규)", result)
+
+    if specs:
+        import render_pool
+        render_pool.render_all(specs, workers=args.render_workers)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="상표 그래프 분석 통합 CLI")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    for command, (help_text, default_k) in BRAND_COMMANDS.items():
+        p = sub.add_parser(command, help=help_text)
+        p.add_argument('brands', nargs='*', help="브랜드 이름 (여러 개 가능)")
+        p.add_argument('--file', help="브랜드 이름 목록 파일 (한 줄에 하나)")
+        p.add_argument('--top-k', type=int, default=None, help=f"브랜드별 결과 수 (기본 {default_k})")
+        p.add_argument('--default-count', type=int, default=5, help="브랜드 미지정 시 자동 선정할 브랜드 수")
+        p.add_argument('--json', action='store_true', help="브랜드별 결과를 JSON 한 줄씩 출력")
+        p.add_argument('--plot', action='store_true', help="브랜드별 시각화 이미지 저장")
+        p.add_argument('--render-workers', type=int, default=None, help="시각화 렌더링 프로세스 수 (기본: CPU 수)")
+        p.add_argument('--country', nargs='+', default=None,
+                       help="국가별 부분 그래프만 로드 (build-graph --slice 로 생성, 예: --country 한국)")
+        if command in UNSEEN_COMMANDS:
+            p.add_argument('--classes', nargs='+', default=[], help="데이터에 없는 브랜드의 보유(출원 예정) 류 (예: 9 35)")
+            p.add_argument('--groups', nargs='+', default=[], help="데이터에 없는 브랜드의 보유(출원 예정) 유사군 (예: G0901)")
+    for command, script in SCRIPTS.items():
+        sub.add_parser(command, help=f"{script} 실행 (뒤의 옵션은 그대로 전달)", add_help=False)
+    p = sub.add_parser('inspect', help="data/ 엑셀 파일 구조 확인")
+    p.add_argument('--data-dir', default=DATA_DIR)
+
+    args, extra = parser.parse_known_args()
+    if args.command in SCRIPTS:
+        run_script(SCRIPTS[args.command], extra)
+    elif extra:
+        parser.error(f"알 수 없는 옵션: {' '.join(extra)}")
+    elif args.command == 'inspect':
+        inspect_data(args.data_dir)
+    else:
+        run_brand_command(args)
@@ -1,12 +1,12 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
-import glob
 import re
-from matplotlib import font_manager, rc
-import platform
+import argparse
+import data_ingest
+import plot_utils
+import cleaning
+import frame_schema
 
 # ==========================================
 # ⚙️ 설정 & NICE 분류 정의
@@ -39,25 +39,16 @@ def get_nice_name(class_val):
     return f"{str_val}류"
 
 # ==========================================
-# 🛠️ 유틸리티: 폰트 & 데이터 로드
+# 🛠️ 유틸리티: 데이터 로드
+# ------------------------------------------
+# matplotlib/seaborn 은 각 analyze_* 의 그림 단계에서만 임포트 (plot_utils.pyplot: 폰트 캐시 + 1회 설정)
 # ==========================================
-def init_font():
-    system_name = platform.system()
-    if system_name == 'Windows':
-        candidates = [("c:/Windows/Fonts/malgun.ttf", "Malgun Gothic"), ("c:/Windows/Fonts/msyh.ttf", "Microsoft YaHei")]
-    elif system_name == 'Darwin':
-        candidates = [("/System/Library/Fonts/Supplemental/AppleGothic.ttf", "AppleGothic")]
-    else:
-        candidates = [("/usr/share/fonts/truetype/nanum/NanumGothic.ttf", "NanumGothic")]
-    
-    for fpath, fname in candidates:
-        if os.path.exists(fpath):
-            font_manager.fontManager.addfont(fpath)
-            rc('font', family=fname)
-            print(f"🔤 폰트 설정: {fname}")
-            break
-    plt.rcParams['axes.unicode_minus'] = False
+def _plotting():
+    plt = plot_utils.pyplot()
+    import seaborn as sns
+    return plt, sns
 
+# 행 단위 정제 함수 (참고/검증용, 실제 로드는 cleaning 모듈의 벡터화 버전 사용)
 def clean_date(value):
     try:
         return pd.to_datetime(value, format='mixed', errors='coerce')
@@ -69,25 +60,19 @@ def clean_class(value):
     match = re.search(r'\d+', str(value))
     return int(match.group(0)) if match else 0
 
+# data_ingest의 표준 컬럼명 -> 분석용 컬럼명
+COLUMN_MAP = {'상표명칭': 'Name', '출원일자': 'Date', '류': 'Class', '유사군': 'Group'}
+
 def load_all_data():
-    all_files = glob.glob(os.path.join(DATA_DIR, "*_DATA.xlsx"))
+    all_files = data_ingest.list_workbooks(DATA_DIR)
     df_list = []
     
     print("🔄 데이터 로드 및 통합 중...")
     for f in all_files:
         try:
-            temp = pd.read_excel(f)
-            country = os.path.basename(f).split('_')[0]
-            temp['Country'] = country
-            
-            col_map = {}
-            for c in temp.columns:
-                if '류' in c or 'class' in c.lower(): col_map[c] = 'Class'
-                elif '출원일' in c: col_map[c] = 'Date'
-                elif '유사군' in c: col_map[c] = 'Group'
-                elif '상표' in c: col_map[c] = 'Name'
-            
-            temp.rename(columns=col_map, inplace=True)
+            temp = data_ingest.load_workbook(f, columns=list(COLUMN_MAP))
+            temp = temp.rename(columns=COLUMN_MAP)
+            temp['Country'] = data_ingest.country_of(f)
             
             if 'Class' in temp.columns:
                 cols = ['Name', 'Date', 'Class', 'Country']
@@ -99,10 +84,15 @@ def load_all_data():
             print(f"⚠️ 로드 실패 ({f}): {e}")
             
     full_df = pd.concat(df_list, ignore_index=True)
-    full_df['Date'] = full_df['Date'].apply(clean_date)
-    full_df['Class'] = full_df['Class'].apply(clean_class)
+    full_df['Date'] = cleaning.clean_date_series(full_df['Date'])
+    full_df['Class'] = cleaning.clean_class_numeric(full_df['Class'])
     full_df['Year'] = full_df['Date'].dt.year
     full_df['Month'] = full_df['Date'].dt.month
+
+    # 국가/유사군 categorical, 상표명 Arrow 문자열, 류/연/월 작은 정수
+    before = full_df.memory_usage(deep=True)
+    full_df = frame_schema.apply_schema(full_df, frame_schema.TREND_SCHEMA)
+    frame_schema.memory_report(before, full_df)
     
     print(f"✅ 총 데이터: {len(full_df):,}건 로드 완료.")
     return full_df
@@ -110,12 +100,16 @@ def load_all_data():
 # ==========================================
 # 1️⃣ 국가별/글로벌 주요 상품 분야 (류) 분석
 # ==========================================
-def analyze_top_classes(df):
+def analyze_top_classes(df, plot=True):
     print("\n📊 [1] 국가별 주요 상품류(Class) 분석")
     
     # 전체 Top 10
-    plt.figure(figsize=(14, 7)) # 가로 길이 늘림
     top_global = df['Class'].value_counts().head(10)
+    for cls, cnt in top_global.items():
+        print(f"   {int(cls)}류 ({NICE_CLASS_DESC.get(str(int(cls)), '기타')}): {cnt:,}건")
+    if not plot: return
+    plt, sns = _plotting()
+    plt.figure(figsize=(14, 7)) # 가로 길이 늘림
     
     # 💡 [수정] X축 라벨에 설명 추가
     labels = [get_nice_name(c) for c in top_global.index]
@@ -166,11 +160,15 @@ def analyze_top_classes(df):
 # ==========================================
 # 2️⃣ 국가별 상표 출원 추이 분석
 # ==========================================
-def analyze_trends_by_country(df):
+def analyze_trends_by_country(df, plot=True):
     print("\n📈 [2] 국가별 연도별 출원 추이 분석")
     recent_years = sorted(df['Year'].dropna().unique())[-10:]
     trend_df = df[df['Year'].isin(recent_years)]
-    trend_data = trend_df.groupby(['Year', 'Country']).size().unstack()
+    trend_data = trend_df.groupby(['Year', 'Country'], observed=True).size().unstack()
+    if not plot:
+        print(trend_data.fillna(0).astype(int).to_string())
+        return
+    plt, _ = _plotting()
     
     trend_data.plot(kind='line', marker='o', figsize=(12, 6), linewidth=2)
     plt.title("국가별 연도별 상표 출원 추이 (최근 10년)")
@@ -183,7 +181,7 @@ def analyze_trends_by_country(df):
 # ==========================================
 # 3️⃣ 유망 분야 도출 (CAGR 성장률 기반)
 # ==========================================
-def analyze_promising_fields(df):
+def analyze_promising_fields(df, plot=True):
     print("\n🚀 [3] 급성장 유망 분야(CAGR) 도출")
     years = sorted(df['Year'].dropna().unique())
     if len(years) < 4: return
@@ -208,6 +206,8 @@ def analyze_promising_fields(df):
         nice_name = NICE_CLASS_DESC.get(str(int(cls)), '기타')
         print(f"   🏆 급성장: {int(cls)}류 ({nice_name}) - 연평균 {row['CAGR']*100:.1f}%")
         labels.append(f"{int(cls)}류\n({nice_name})")
+    if not plot: return
+    plt, _ = _plotting()
         
     plt.figure(figsize=(12, 6))
     colors = ['red' if c >= 0.1 else 'blue' for c in top_growth['CAGR']]
@@ -223,9 +223,14 @@ def analyze_promising_fields(df):
 # ==========================================
 # 4️⃣ 주요 상표 출원일자/시기별 트렌드
 # ==========================================
-def analyze_seasonality(df):
+def analyze_seasonality(df, plot=True):
     print("\n📅 [4] 월별 출원 집중도 (Seasonality) 분석")
-    monthly_counts = df.groupby('Month').size()
+    monthly_counts = df.groupby('Month', observed=True).size()
+    max_month = monthly_counts.idxmax()
+    max_val = monthly_counts.max()
+    print(f"   📌 출원이 가장 많은 달: {int(max_month)}월 ({max_val:,}건)")
+    if not plot: return
+    plt, sns = _plotting()
     
     plt.figure(figsize=(10, 5))
     sns.lineplot(x=monthly_counts.index, y=monthly_counts.values, marker='o', color='purple', linewidth=2)
@@ -235,8 +240,6 @@ def analyze_seasonality(df):
     plt.xticks(range(1, 13))
     plt.grid(True, linestyle='--', alpha=0.5)
     
-    max_month = monthly_counts.idxmax()
-    max_val = monthly_counts.max()
     plt.annotate(f'Peak: {max_month}월', xy=(max_month, max_val), xytext=(max_month, max_val*1.1),
                  arrowprops=dict(facecolor='black', shrink=0.05), ha='center')
     
@@ -247,14 +250,18 @@ def analyze_seasonality(df):
 # 🚀 메인 실행
 # ==========================================
 if __name__ == "__main__":
-    init_font()
+    parser = argparse.ArgumentParser(description="거시적 시장 트렌드 분석")
+    parser.add_argument('--no-plot', action='store_true', help="텍스트 결과만 출력 (matplotlib/seaborn 을 로드하지 않음)")
+    args = parser.parse_args()
+    plot = not args.no_plot
+
     df = load_all_data()
     
     if df is not None and not df.empty:
-        analyze_top_classes(df)
-        analyze_trends_by_country(df)
-        analyze_promising_fields(df)
-        analyze_seasonality(df)
+        analyze_top_classes(df, plot)
+        analyze_trends_by_country(df, plot)
+        analyze_promising_fields(df, plot)
+        analyze_seasonality(df, plot)
         
         print(f"\n✅ 모든 분석 완료! 결과물은 '{OUTPUT_DIR}' 폴더를 확인하세요.")
         
@@ -0,0 +1,140 @@
+import torch
+
+# ==========================================
+# ➖ 링크 예측용 Negative Sampling
+# ------------------------------------------
+# 기존 학습 루프는 매 epoch 마다 dgl.heterograph(neg_src, neg_dst) 를 새로 만들고
+# device 로 옮긴 뒤 apply_edges 로 점수를 계산했습니다. (그래프 생성 비용 x EPOCHS)
+# 음성 엣지는 (src, dst) 텐서만 있으면 되므로 그래프 없이 임베딩 내적으로 바로 점수를 냅니다.
+#   sampler = NegativeSampler(pos_src, pos_dst, n_src, n_dst, strategy='degree')
+#   neg_src, neg_dst = sampler.sample(len(pos_src), h_src=..., h_dst=...)
+#   neg_score = score_edges(h['company'], h['class'], neg_src, neg_dst)
+# 전략
+#   uniform : src/dst 모두 균등 무작위 (기존 방식)
+#   degree  : 양성 엣지의 src 는 유지, dst 를 차수^0.75 비례로 뽑음 (인기 류를 더 자주 음성으로)
+#   hard    : 후보 dst 여러 개 중 현재 모델 점수가 가장 높은 것을 음성으로 (임베딩 필요)
+# 모든 전략에서 실제 양성 엣지는 제외(재추출)합니다.
+# ==========================================
+STRATEGIES = ('uniform', 'degree', 'hard')
+DENSE_LOOKUP_LIMIT = 1 << 26   # src x dst 조합이 이 이하면 bool 비트맵(최대 64MB)으로 양성 조회
+
+def score_edges(h_src, h_dst, src, dst):
+    """그래프 생성 없이 엣지 점수(내적) 계산. LinkPredictor(u_dot_v) 와 같은 값"""
+    # index_select 가 고급 인덱싱(h[src])보다 forward/backward 모두 빠름
+    return (h_src.index_select(0, src) * h_dst.index_select(0, dst)).sum(dim=-1, keepdim=True)
+
+class NegativeSampler:
+    def __init__(self, pos_src, pos_dst, num_src, num_dst, strategy='uniform',
+                 filter_positives=True, degree_power=0.75, hard_candidates=8, max_retries=10):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"지원하지 않는 전략: {strategy} (가능: {', '.join(STRATEGIES)})")
+        self.strategy = strategy
+        self.num_src = num_src
+        self.num_dst = num_dst
+        self.filter_positives = filter_positives
+        self.hard_candidates = hard_candidates
+        self.max_retries = max_retries
+        self.device = pos_src.device
+
+        self.pos_src = pos_src.long()
+        self.pos_dst = pos_dst.long()
+        # 양성 엣지 조회: 조합 수가 작으면 bool 비트맵(O(1) gather), 크면 정렬 키 + searchsorted(O(log E))
+        keys = self.pos_src * num_dst + self.pos_dst
+        if num_src * num_dst <= DENSE_LOOKUP_LIMIT:
+            self.pos_bitmap = torch.zeros(num_src * num_dst, dtype=torch.bool, device=self.device)
+            self.pos_bitmap[keys] = True
+            self.pos_keys = None
+        else:
+            self.pos_bitmap = None
+            self.pos_keys = torch.unique(keys)
+
+        deg = torch.bincount(self.pos_dst, minlength=num_dst).float()
+        self.dst_weights = deg.pow(degree_power) + 1e-6   # 차수 0 인 노드도 드물게 뽑힘
+
+    # ------------------------------------------
+    # 양성 필터
+    # ------------------------------------------
+    def is_positive(self, src, dst):
+        keys = src * self.num_dst + dst
+        if self.pos_bitmap is not None:
+            return self.pos_bitmap[keys]
+        idx = torch.searchsorted(self.pos_keys, keys).clamp_(max=len(self.pos_keys) - 1)
+        return self.pos_keys[idx] == keys
+
+    # ------------------------------------------
+    # 전략별 추출
+    # ------------------------------------------
+    def _draw_src(self, n, pos_idx):
+        if self.strategy == 'uniform':
+            return torch.randint(0, self.num_src, (n,), device=self.device)
+        return self.pos_src[pos_idx]
+
+    def _draw_dst(self, n):
+        if self.strategy == 'uniform':
+            return torch.randint(0, self.num_dst, (n,), device=self.device)
+        return torch.multinomial(self.dst_weights, n, replacement=True).to(self.device)
+
+    @torch.no_grad()
+    def _draw_hard_dst(self, src, h_src, h_dst):
+        """후보 dst 를 차수 비례로 K개 뽑고, 양성이 아닌 것 중 현재 점수가 가장 높은 dst 선택"""
+        k = self.hard_candidates
+        cand = self._draw_dst(len(src) * k).view(-1, k)
+        scores = (h_src[src].unsqueeze(1) * h_dst[cand]).sum(dim=-1)
+        if self.filter_positives:
+            pos = self.is_positive(src.unsqueeze(1).expand(-1, k).reshape(-1), cand.reshape(-1)).view(-1, k)
+            scores = scores.masked_fill(pos, float('-inf'))
+        best = scores.argmax(dim=1)
+        return cand[torch.arange(len(src), device=self.device), best]
+
+    def sample(self, n, pos_idx=None, h_src=None, h_dst=None):
+        """
+        음성 엣지 n개 (src, dst) 반환.
+        pos_idx: degree/hard 전략에서 src 를 가져올 양성 엣지 번호 (기본: 무작위)
+        h_src/h_dst: hard 전략용 현재 임베딩
+        """
+        if pos_idx is None:
+            pos_idx = torch.randint(0, len(self.pos_src), (n,), device=self.device)
+        src = self._draw_src(n, pos_idx)
+        if self.strategy == 'hard':
+            if h_src is None or h_dst is None:
+                raise ValueError("hard 전략은 h_src/h_dst 임베딩이 필요합니다.")
+            dst = self._draw_hard_dst(src, h_src, h_dst)
+        else:
+            dst = self._draw_dst(n)
+
+        if not self.filter_positives:
+            return src, dst
+
+        # 양성과 겹친 칸만 다시 뽑고, 다시 뽑은 칸만 재검사 (끝까지 남은 칸은 제외)
+        bad = self.is_positive(src, dst).nonzero().squeeze(1)
+        for _ in range(self.max_retries):
+            if len(bad) == 0: break
+            dst[bad] = self._draw_dst(len(bad))
+            if self.strategy == 'uniform':
+                src[bad] = torch.randint(0, self.num_src, (len(bad),), device=self.device)
+            bad = bad[self.is_positive(src[bad], dst[bad])]
+        if len(bad) > 0:
+            keep = torch.ones(len(src), dtype=torch.bool, device=self.device)
+            keep[bad] = False
+            src, dst = src[keep], dst[keep]
+        return src, dst
+
+    def dgl_sampler(self, etype):
+        """DGL as_edge_prediction_sampler 의 negative_sampler 로 사용 (uniform/degree)"""
+        if self.strategy == 'hard':
+            print("⚠️ 미니배치 샘플러에서는 hard 전략 대신 degree 전략을 사용합니다. (워커에서 임베딩 접근 불가)")
+            clone = object.__new__(NegativeSampler)
+            clone.__dict__.update(self.__dict__)
+            clone.strategy = 'degree'
+            return DGLNegativeSampler(clone, etype)
+        return DGLNegativeSampler(self, etype)
+
+class DGLNegativeSampler:
+    """배치의 양성 엣지 ID -> 같은 src 의 음성 엣지 (워커 프로세스로 pickle 가능하도록 클래스로 구현)"""
+    def __init__(self, sampler, etype):
+        self.sampler = sampler
+        self.etype = etype
+
+    def __call__(self, g, eids_dict):
+        eids = eids_dict[self.etype]
+        return {self.etype: self.sampler.sample(len(eids), pos_idx=eids.to(self.sampler.device))}
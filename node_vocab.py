@@ -0,0 +1,194 @@
+import os
+import numpy as np
+import pandas as pd
+import torch
+
+import artifact_store
+
+# ==========================================
+# 🔢 노드 ID 인코더 (해시 기반, Append-only)
+# ------------------------------------------
+# - sklearn LabelEncoder 대신 pd.factorize 한 번(해시 1패스)으로 ID를 부여합니다.
+#   (정렬/searchsorted 없음, ID는 처음 등장한 순서)
+# - 기존 ID는 그대로 두고 처음 보는 이름만 뒤에 붙입니다. (증분 빌드, 기존 임베딩 유지)
+# - 저장 형식: UTF-8 바이트를 이어 붙인 문자열 테이블(uint8) + 오프셋(int64)
+#   -> 파이썬 문자열 객체 배열을 pickle 하지 않아 label_encoders.pt 가 작고 빠릅니다.
+# - 이름 -> ID 조회는 dict 기반 O(1) (처음 조회할 때 한 번만 생성)
+# ==========================================
+class NodeVocab:
+    def __init__(self, names=None):
+        self._names = None          # list[str] (필요할 때만 디코딩)
+        self._data = None           # uint8 문자열 테이블
+        self._offsets = None        # int64, 길이 N+1
+        self._index = None          # dict[str, int] (지연 생성)
+        if names is not None:
+            self._names = [str(n) for n in names]
+
+    # ------------------------------------------
+    # 생성
+    # ------------------------------------------
+    @classmethod
+    def from_values(cls, values):
+        """값 배열을 한 번에 인코딩합니다. (vocab, codes) 반환"""
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object).astype(str))
+        vocab = cls()
+        vocab._names = list(uniques)
+        return vocab, codes.astype(np.int64)
+
+    @classmethod
+    def from_table(cls, data, offsets):
+        vocab = cls()
+        vocab._data = np.asarray(data, dtype=np.uint8)
+        vocab._offsets = np.asarray(offsets, dtype=np.int64)
+        return vocab
+
+    @classmethod
+    def from_entry(cls, entry):
+        """label_encoders.pt 항목 -> NodeVocab (구버전 LabelEncoder.classes_ 배열도 지원)"""
+        if isinstance(entry, NodeVocab):
+            return entry
+        if isinstance(entry, dict) and 'offsets' in entry:
+            return cls.from_table(entry['data'], entry['offsets'])
+        return cls(entry)
+
+    # ------------------------------------------
+    # 조회
+    # ------------------------------------------
+    def __len__(self):
+        if self._names is not None:
+            return len(self._names)
+        return len(self._offsets) - 1
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        idx = int(idx)
+        if self._names is not None:
+            return self._names[idx]
+        if idx < 0: idx += len(self)
+        start, end = self._offsets[idx], self._offsets[idx + 1]
+        return self._data[start:end].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __contains__(self, name):
+        return name in self._lookup()
+
+    @property
+    def names(self):
+        if self._names is None:
+            blob = self._data.tobytes()
+            offs = self._offsets.tolist()
+            self._names = [blob[offs[i]:offs[i + 1]].decode('utf-8') for i in range(len(offs) - 1)]
+        return self._names
+
+    @property
+    def classes_(self):
+        """LabelEncoder.classes_ 와 같은 형태 (호환용)"""
+        return np.array(self.names, dtype=object)
+
+    def _lookup(self):
+        if self._index is None:
+            self._index = {name: i for i, name in enumerate(self.names)}
+        return self._index
+
+    def get(self, name, default=None):
+        """이름 -> ID (O(1)), 없으면 default"""
+        return self._lookup().get(name, default)
+
+    def index(self, name):
+        """이름 -> ID (O(1)), 없으면 KeyError"""
+        return self._lookup()[name]
+
+    # ------------------------------------------
+    # 인코딩
+    # ------------------------------------------
+    def _encode_uniques(self, values, add_missing):
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object).astype(str))
+        lookup = self._lookup()
+        names = self.names
+        ids = np.empty(len(uniques), dtype=np.int64)
+        for i, name in enumerate(uniques):
+            idx = lookup.get(name)
+            if idx is None:
+                if not add_missing:
+                    raise KeyError(name)
+                idx = len(names)
+                lookup[name] = idx
+                names.append(name)
+                self._data = self._offsets = None   # 테이블은 저장 시 다시 생성
+            ids[i] = idx
+        return ids[codes]
+
+    def extend(self, values):
+        """처음 보는 이름은 뒤에 추가하고, 모든 값의 ID를 반환합니다."""
+        return self._encode_uniques(values, add_missing=True)
+
+    def transform(self, values):
+        """등록된 이름만 ID로 변환합니다. (없으면 KeyError)"""
+        return self._encode_uniques(values, add_missing=False)
+
+    # ------------------------------------------
+    # 저장
+    # ------------------------------------------
+    def to_table(self):
+        if self._data is None:
+            encoded = [n.encode('utf-8') for n in self._names]
+            lengths = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded))
+            self._offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+            self._data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return self._data, self._offsets
+
+    def to_entry(self):
+        data, offsets = self.to_table()
+        return {'data': data, 'offsets': offsets}
+
+# ==========================================
+# 💾 label_encoders.pt 입출력
+# ==========================================
+VOCAB_KEYS = ['company_classes', 'trademark_classes', 'class_classes', 'group_classes', 'country_classes']
+
+def save_encoders(path, vocabs, **extra):
+    """vocabs: {'company': NodeVocab, ...} -> label_encoders.pt (+ label_encoders.mmap/)"""
+    payload = {f'{ntype}_classes': vocab.to_entry() for ntype, vocab in vocabs.items()}
+    payload.update(extra)
+    torch.save(payload, path)
+    # 문자열 테이블/오프셋은 배열로, 나머지(source_rows 등)는 manifest 의 JSON 으로
+    arrays = {}
+    for key in payload:
+        if key in VOCAB_KEYS:
+            arrays[f'{key}/data'] = payload[key]['data']
+            arrays[f'{key}/offsets'] = payload[key]['offsets']
+    artifact_store.save_arrays(path, arrays, extra)
+
+def _load_raw(path):
+    opened = artifact_store.open_arrays(path)
+    if opened is None:
+        try:
+            return torch.load(path, weights_only=False)
+        except TypeError:
+            return torch.load(path)
+    arrays, meta = opened
+    raw = dict(meta)
+    for key in VOCAB_KEYS:
+        if f'{key}/data' in arrays:
+            raw[key] = {'data': arrays[f'{key}/data'], 'offsets': arrays[f'{key}/offsets']}
+    return raw
+
+def load_encoders(path):
+    """
+    label_encoders.pt 를 읽어 *_classes 항목을 NodeVocab 으로 변환합니다.
+    label_encoders.mmap/ 이 최신이면 그쪽을 매핑해서 읽습니다. (문자열 테이블은 디코딩 없이 공유)
+    같은 폴더에 상표 테이블(trademarks.arrow)이 있으면 encoders['trademarks'] 로 함께 읽습니다.
+    """
+    encoders = dict(_load_raw(path))
+    for key in VOCAB_KEYS:
+        if key in encoders:
+            encoders[key] = NodeVocab.from_entry(encoders[key])
+
+    from trademark_table import TrademarkTable, TABLE_FILE
+    table_path = os.path.join(os.path.dirname(path), TABLE_FILE)
+    if os.path.exists(table_path):
+        encoders['trademarks'] = TrademarkTable.load(table_path, names=encoders.get('company_classes'))
+    return encoders
@@ -0,0 +1,31 @@
+import threading
+
+# ==========================================
+# 🧷 객체별 파생 인덱스 캐시 (가장 최근 객체 하나)
+# ------------------------------------------
+# graph_index / brand_counts / country_index / graph_snapshot / ann_index 의 of() 가 공유합니다.
+# 같은 그래프(임베딩) 객체로 다시 부르면 만들어 둔 값을 돌려주고, 다른 객체가 오면 교체합니다.
+# (다시 로드한 이전 그래프를 붙잡지 않도록 하나만 유지)
+# query_service 스레드 풀에서 동시에 불러도 조회/생성/교체가 락 하나 안에서 일어나므로
+# 다른 스레드가 만들고 있는 값을 지우지 않고, 같은 객체를 동시에 요청하면 한 번만 만듭니다.
+#   _CACHE = object_cache.LatestCache()
+#   def of(data): return _CACHE.get(data, lambda: load_or_build(data))
+# ==========================================
+
+class LatestCache:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._owner = None
+        self._value = None
+
+    def get(self, owner, build):
+        """owner 가 마지막 객체와 같으면 캐시 값, 아니면 build() 결과로 교체 (실패하면 이전 값 유지)"""
+        with self._lock:
+            if self._owner is not owner:
+                value = build()
+                self._owner, self._value = owner, value
+            return self._value
+
+    def clear(self):
+        with self._lock:
+            self._owner = self._value = None
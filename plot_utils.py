@@ -0,0 +1,95 @@
+import os
+import json
+import platform
+
+# ==========================================
+# 🎨 시각화 공통 유틸 (지연 임포트 + 폰트 캐시)
+# ------------------------------------------
+# 분석 스크립트가 모듈 맨 위에서 matplotlib / networkx 를 임포트하고 시작하자마자 init_font 를
+# 호출하면, 텍스트 결과만 볼 때도 임포트 + 폰트 등록 비용을 매번 냅니다.
+#   - pyplot(): 첫 시각화 요청 때 matplotlib 를 임포트하고 폰트를 한 번만 설정
+#   - 폰트 경로/이름은 outputs/cache/font.json 에 캐시 (후보 폰트 파일을 열어 이름을 다시 읽지 않음)
+#   - matplotlib 폰트 목록(fontlist 캐시)에 이미 있는 폰트면 addfont 로 다시 파싱하지 않음
+#   - networkx 등 그래프 라이브러리는 각 visualize_* 함수 안에서 임포트
+# ==========================================
+FONT_CACHE_PATH = "./outputs/cache/font.json"
+FONT_CANDIDATES = {
+    'Windows': ["c:/Windows/Fonts/malgun.ttf", "c:/Windows/Fonts/msyh.ttf", "c:/Windows/Fonts/msgothic.ttc"],
+    'Darwin': ["/System/Library/Fonts/Supplemental/AppleGothic.ttf"],
+    'Linux': ["/usr/share/fonts/truetype/nanum/NanumGothic.ttf"],
+}
+DEFAULT_FONT = "sans-serif"
+
+_font_name = None
+
+def _read_font_cache():
+    try:
+        with open(FONT_CACHE_PATH, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get('platform') != platform.system():
+        return None
+    if not cached.get('path') or not os.path.exists(cached['path']):
+        return None
+    return cached
+
+def _write_font_cache(path, name):
+    try:
+        os.makedirs(os.path.dirname(FONT_CACHE_PATH), exist_ok=True)
+        with open(FONT_CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump({'platform': platform.system(), 'path': path, 'name': name}, f, ensure_ascii=False)
+    except OSError:
+        pass
+
+def resolve_font():
+    """(폰트 파일 경로, 폰트 이름) - 캐시가 없을 때만 후보 폰트 파일을 열어 이름을 읽음"""
+    cached = _read_font_cache()
+    if cached is not None:
+        return cached['path'], cached['name']
+
+    from matplotlib import font_manager
+    candidates = FONT_CANDIDATES.get(platform.system(), FONT_CANDIDATES['Linux'])
+    for fpath in candidates:
+        if os.path.exists(fpath):
+            try:
+                name = font_manager.FontProperties(fname=fpath).get_name()
+            except Exception:
+                continue
+            _write_font_cache(fpath, name)
+            return fpath, name
+    return None, DEFAULT_FONT   # 찾지 못한 경우는 캐시하지 않음 (나중에 폰트를 설치할 수 있음)
+
+def _registered(font_manager, name):
+    """matplotlib 폰트 목록에 이미 있는 이름인지 (시스템 폰트 폴더에 설치된 폰트는 대부분 등록되어 있음)"""
+    return any(f.name == name for f in font_manager.fontManager.ttflist)
+
+def init_font():
+    """다국어 폰트 설정 (처음 한 번만). 반환: 폰트 이름"""
+    global _font_name
+    if _font_name is not None:
+        return _font_name
+    from matplotlib import font_manager, rc
+    import matplotlib.pyplot as plt
+
+    fpath, name = resolve_font()
+    if fpath is not None:
+        try:
+            if not _registered(font_manager, name):
+                font_manager.fontManager.addfont(fpath)
+            rc('font', family=name)
+            print(f"🔤 시각화 폰트 로드: {name}")
+        except Exception:
+            name = DEFAULT_FONT
+    plt.rcParams['axes.unicode_minus'] = False
+    _font_name = name
+    return name
+
+def pyplot():
+    """matplotlib.pyplot 을 (폰트 설정 후) 반환. 시각화 함수 첫 줄에서 호출"""
+    init_font()
+    import matplotlib.pyplot as plt
+    return plt
+
+def font_name():
+    return init_font()
@@ -0,0 +1,305 @@
+import json
+import asyncio
+import argparse
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+import resources
+from brand_queries import (brand_stats, gap_analysis, expansion_batch, competitors_batch,
+                           unseen_brand, expansion_unseen, competitors_unseen)
+
+# ==========================================
+# 🛰️ 상주 질의 서비스 (asyncio HTTP)
+# ------------------------------------------
+# 그래프/인코더/임베딩을 한 번만 로드해 메모리에 두고 브랜드 질의에 응답합니다.
+#   GET  /health
+#   GET  /stats?brand=삼성             보유 상표 수, 주력 류/유사군
+#   GET  /gap?brand=삼성&top_k=5       주력 류 기준 누락 유사군
+#   GET  /expansion?brand=삼성&top_k=3 신사업(류) 추천
+#   GET  /competitors?brand=삼성&top_k=5
+#   GET  /expansion?brand=신규&classes=9,35&groups=G0901   데이터에 없는 브랜드 (류/유사군으로 임베딩 계산)
+#   POST /reload                        아티팩트 즉시 다시 로드
+# - expansion/competitors 는 짧은 시간(--batch-wait-ms) 동안 모인 요청을 한 번의 행렬곱으로 처리
+# - 계산은 스레드 풀에서 실행하며, 리소스는 읽기 전용 스냅샷이라 동시 질의가 안전합니다.
+# - 아티팩트 파일이 바뀌면 (한 주기 동안 변화가 멈춘 뒤) 새 스냅샷을 만들어 통째로 교체합니다.
+#   python query_service.py --port 8765
+#   python query_service.py --unix /tmp/markcloud.sock
+# ==========================================
+DEFAULT_PORT = 8765
+
+class QueryError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+# ==========================================
+# 📦 마이크로 배치
+# ==========================================
+class MicroBatcher:
+    """동시에 들어온 질의를 max_wait 초 / max_batch 개까지 모아 fn(res, brand_ids, top_k) 한 번으로 처리"""
+    def __init__(self, fn, executor, max_batch=256, max_wait=0.005):
+        self.fn = fn
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue = asyncio.Queue()
+        self._tasks = set()   # 실행 중인 그룹 태스크 (참조를 잡아 두지 않으면 GC 로 사라질 수 있음)
+
+    async def submit(self, res, brand_idx, top_k):
+        fut = asyncio.get_running_loop().create_future()
+        await self.queue.put((res, brand_idx, top_k, fut))
+        return await fut
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0: break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # 다시 로드 직후에는 서로 다른 스냅샷이 섞일 수 있어 스냅샷별로 나눔
+            groups = {}
+            for item in batch:
+                groups.setdefault(id(item[0]), []).append(item)
+            for items in groups.values():
+                task = asyncio.create_task(self._run_group(items))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def drain(self):
+        """실행 중인 그룹 태스크가 끝날 때까지 대기 (종료 시)"""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _run_group(self, items):
+        res = items[0][0]
+        brand_ids = [item[1] for item in items]
+        top_k = max(item[2] for item in items)
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.fn, res, brand_ids, top_k)
+        except Exception as e:
+            for *_, fut in items:
+                if not fut.done(): fut.set_exception(e)
+            return
+        for (_, _, k, fut), result in zip(items, results):
+            if not fut.done(): fut.set_result(result[:k])
+
+# ==========================================
+# 🛰️ 서비스
+# ==========================================
+class QueryService:
+    def __init__(self, workers=4, max_batch=256, batch_wait_ms=5, reload_interval=5.0, country=None):
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.res = None
+        self.load = functools.partial(resources.load, country=country)   # country: 국가별 부분 그래프
+        self.reload_interval = reload_interval
+        self._reload_lock = asyncio.Lock()
+        self._failed_sig = None
+        self._tasks = set()   # 상주 태스크 (배처 루프, 변경 감시) - stop() 에서 취소
+        self.batchers = {
+            'expansion': MicroBatcher(expansion_batch, self.executor, max_batch, batch_wait_ms / 1000),
+            'competitors': MicroBatcher(competitors_batch, self.executor, max_batch, batch_wait_ms / 1000),
+        }
+
+    async def start(self):
+        self.res = await asyncio.get_running_loop().run_in_executor(self.executor, self.load)
+        for batcher in self.batchers.values():
+            self._spawn(batcher.run())
+        if self.reload_interval > 0:
+            self._spawn(self.watch())
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def stop(self):
+        """상주 태스크 취소 -> 진행 중인 배치 완료 대기 -> 스레드 풀 종료"""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for batcher in self.batchers.values():
+            await batcher.drain()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------
+    # Hot reload
+    # ------------------------------------------
+    async def reload(self):
+        async with self._reload_lock:
+            print("🔄 아티팩트 변경 감지, 리소스를 다시 로드합니다...")
+            loop = asyncio.get_running_loop()
+            try:
+                new_res = await loop.run_in_executor(self.executor, self.load)
+            except Exception as e:
+                self._failed_sig = resources.signature(self.res.paths)
+                print(f"⚠️ 다시 로드 실패, 기존 리소스를 계속 사용합니다: {e}")
+                return False
+            self.res = new_res   # 진행 중인 질의는 이전 스냅샷으로 끝까지 처리됨
+            self._failed_sig = None
+            return True
+
+    async def watch(self):
+        pending = None
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            sig = resources.signature(self.res.paths)
+            if sig == self.res.signature or sig == self._failed_sig:
+                pending = None
+                continue
+            if sig != pending:
+                pending = sig   # 파일을 쓰는 중일 수 있으므로 한 주기 동안 변화가 없을 때 로드
+                continue
+            await self.reload()
+            pending = None
+
+    # ------------------------------------------
+    # 라우팅
+    # ------------------------------------------
+    def _brand(self, res, query):
+        name = query.get('brand', [None])[0]
+        if not name:
+            raise QueryError(400, "brand 파라미터가 필요합니다.")
+        idx = res.brand_index(name)
+        if idx is None:
+            raise QueryError(404, f"브랜드 '{name}'을 찾을 수 없습니다.")
+        return name, idx
+
+    def _profile(self, query):
+        """classes=9,35&groups=G0901 -> (류 목록, 유사군 목록)"""
+        split = lambda key: [v for raw in query.get(key, []) for v in raw.split(',') if v.strip()]
+        return split('classes'), split('groups')
+
+    def _unseen(self, res, path, classes, groups, top_k):
+        try:
+            unseen = unseen_brand(res, classes, groups)
+        except ValueError as e:
+            raise QueryError(400, str(e))
+        fn = expansion_unseen if path == '/expansion' else competitors_unseen
+        return fn(res, unseen, top_k)
+
+    def _top_k(self, query, default):
+        try:
+            top_k = int(query.get('top_k', [default])[0])
+        except ValueError:
+            raise QueryError(400, "top_k 는 정수여야 합니다.")
+        if not 1 <= top_k <= 100:
+            raise QueryError(400, "top_k 는 1~100 사이여야 합니다.")
+        return top_k
+
+    async def dispatch(self, method, target):
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        res = self.res
+        loop = asyncio.get_running_loop()
+
+        if url.path == '/health':
+            return {'status': 'ok', 'brands': res.num_brands, 'loaded_at': res.loaded_at}
+        if url.path == '/reload':
+            if method != 'POST':
+                raise QueryError(405, "POST 만 지원합니다.")
+            return {'reloaded': await self.reload()}
+        if method != 'GET':
+            raise QueryError(405, "GET 만 지원합니다.")
+
+        if url.path == '/stats':
+            name, idx = self._brand(res, query)
+            result = await loop.run_in_executor(self.executor, brand_stats, res, idx)
+        elif url.path == '/gap':
+            name, idx = self._brand(res, query)
+            result = await loop.run_in_executor(self.executor, gap_analysis, res, idx, self._top_k(query, 5))
+        elif url.path in ('/expansion', '/competitors'):
+            if res.embeddings is None:
+                raise QueryError(503, "임베딩이 로드되지 않았습니다. (gnn_training_v3_shortcut.py 실행 필요)")
+            top_k = self._top_k(query, 3 if url.path == '/expansion' else 5)
+            classes, groups = self._profile(query)
+            name = query.get('brand', [None])[0]
+            if (classes or groups) and name and res.brand_index(name) is None:
+                # 데이터에 없는 브랜드: 배치 없이 바로 계산 (브랜드당 수 ms)
+                result = await loop.run_in_executor(self.executor, self._unseen, res, url.path, classes, groups, top_k)
+                return {'brand': name, 'unseen': True, 'result': result}
+            name, idx = self._brand(res, query)
+            result = await self.batchers[url.path[1:]].submit(res, idx, top_k)
+        else:
+            raise QueryError(404, f"알 수 없는 경로: {url.path}")
+        return {'brand': name, 'result': result}
+
+    async def handle(self, reader, writer):
+        """HTTP/1.1 (keep-alive) 최소 구현: 요청 라인 + 헤더 + Content-Length 본문"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line: break
+                try:
+                    method, target, _ = line.decode('latin-1').split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b'\r\n', b'\n', b''): break
+                    key, _, value = h.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+                if int(headers.get('content-length', 0)):
+                    await reader.readexactly(int(headers['content-length']))   # 본문은 사용하지 않음
+
+                try:
+                    status, payload = 200, await self.dispatch(method, target)
+                except QueryError as e:
+                    status, payload = e.status, {'error': str(e)}
+                except Exception as e:
+                    status, payload = 500, {'error': f"{type(e).__name__}: {e}"}
+
+                body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body)
+                await writer.drain()
+                if not keep_alive: break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+async def serve(args):
+    service = QueryService(args.workers, args.max_batch, args.batch_wait_ms, args.reload_interval, args.country)
+    await service.start()
+    try:
+        if args.unix:
+            server = await asyncio.start_unix_server(service.handle, path=args.unix)
+            print(f"🛰️ 질의 서비스 시작: unix:{args.unix}")
+        else:
+            server = await asyncio.start_server(service.handle, args.host, args.port)
+            print(f"🛰️ 질의 서비스 시작: http://{args.host}:{args.port}")
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="브랜드 분석 상주 질의 서비스")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', default=None, help="TCP 대신 Unix 소켓 경로로 서비스")
+    parser.add_argument('--workers', type=int, default=4, help="계산 스레드 수")
+    parser.add_argument('--max-batch', type=int, default=256)
+    parser.add_argument('--batch-wait-ms', type=float, default=5, help="배치를 모으는 최대 대기 시간")
+    parser.add_argument('--reload-interval', type=float, default=5, help="아티팩트 변경 확인 주기(초), 0 이면 끔")
+    parser.add_argument('--country', nargs='+', default=None, help="국가별 부분 그래프만 로드 (예: --country 한국)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        print("\n👋 질의 서비스 종료")
@@ -0,0 +1,104 @@
+import os
+import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import plot_utils
+
+# ==========================================
+# 🖼️ 시각화 렌더링 풀
+# ------------------------------------------
+# 브랜드별 관계도는 spring_layout + 그리기 + PNG 저장이 대부분의 시간을 차지합니다.
+# 분석 스크립트는 그래프/임베딩에서 작은 "플롯 스펙"(노드/엣지 목록, dict)만 만들고,
+# 실제 렌더링은 여기서 프로세스 풀(Agg 백엔드)로 병렬 처리합니다.
+#   spec = {
+#     'title', 'save_path', 'figsize', 'layout_k', 'seed',
+#     'nodes': [(id, label, type)],          'node_styles': {type: (color, size)},
+#     'edges': [(u, v, style)],              'edge_styles': {style: draw_networkx_edges 인자},
+#     'legend': [('node', label, color, markersize) | ('line', label, color, lw, linestyle)],
+#     'font_size', 'font_weight',
+#   }
+# - 노드는 타입별로 draw_networkx_nodes 한 번씩 (노드마다 호출하지 않음)
+# - 워커는 spawn 으로 시작해 torch 등 부모 프로세스 상태를 물려받지 않음 (render_pool/plot_utils 만 임포트)
+# ==========================================
+
+def _init_worker():
+    os.environ['MPLBACKEND'] = 'Agg'
+    import matplotlib
+    matplotlib.use('Agg')
+    plot_utils.init_font()
+
+def render(spec):
+    """플롯 스펙 하나를 PNG 로 저장. 반환: 저장 경로"""
+    import networkx as nx
+    from matplotlib.lines import Line2D
+    plt = plot_utils.pyplot()
+    font = plot_utils.font_name()
+
+    G = nx.Graph()
+    by_type = {}
+    for node, _, ntype in spec['nodes']:
+        G.add_node(node)
+        by_type.setdefault(ntype, []).append(node)
+    by_style = {}
+    for u, v, style in spec['edges']:
+        if G.has_edge(u, v): continue
+        G.add_edge(u, v)
+        by_style.setdefault(style, []).append((u, v))
+
+    fig = plt.figure(figsize=spec.get('figsize', (16, 12)))
+    pos = nx.spring_layout(G, k=spec.get('layout_k'), seed=spec.get('seed'))
+
+    for ntype, nodelist in by_type.items():
+        color, size = spec['node_styles'][ntype]
+        nx.draw_networkx_nodes(G, pos, nodelist=nodelist, node_color=color, node_size=size, alpha=0.9)
+    for style, edgelist in by_style.items():
+        nx.draw_networkx_edges(G, pos, edgelist=edgelist, **spec['edge_styles'][style])
+
+    labels = {node: label for node, label, _ in spec['nodes']}
+    nx.draw_networkx_labels(G, pos, labels, font_size=spec.get('font_size', 9), font_family=font,
+                            font_weight=spec.get('font_weight', 'normal'))
+
+    handles = []
+    for kind, label, color, *rest in spec.get('legend', []):
+        if kind == 'node':
+            handles.append(Line2D([0], [0], marker='o', color='w', label=label, markerfacecolor=color, markersize=rest[0]))
+        else:
+            handles.append(Line2D([0], [0], color=color, lw=rest[0], linestyle=rest[1], label=label))
+    if handles:
+        plt.legend(handles=handles, loc='upper left', prop={'size': 11, 'family': font})
+
+    plt.title(spec['title'], fontsize=spec.get('title_size', 16), fontfamily=font)
+    plt.axis('off')
+    os.makedirs(os.path.dirname(spec['save_path']) or '.', exist_ok=True)
+    plt.savefig(spec['save_path'], dpi=spec.get('dpi', 300), bbox_inches='tight')
+    plt.close(fig)
+    return spec['save_path']
+
+def render_all(specs, workers=None, verbose=True):
+    """플롯 스펙 목록을 렌더링 (workers<=1 이면 현재 프로세스에서 순차). 반환: 저장된 경로 목록"""
+    specs = [s for s in specs if s]
+    if not specs: return []
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(specs)))
+
+    t0 = time.perf_counter()
+    saved = []
+    if workers == 1:
+        for spec in specs:
+            saved.append(render(spec))
+            if verbose: print(f"🖼️ 결과 저장: {saved[-1]}")
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context('spawn'),
+                                 initializer=_init_worker) as pool:
+            futures = {pool.submit(render, spec): spec for spec in specs}
+            for fut in as_completed(futures):
+                try:
+                    saved.append(fut.result())
+                    if verbose: print(f"🖼️ 결과 저장: {saved[-1]}")
+                except Exception as e:
+                    print(f"⚠️ 렌더링 실패 ({futures[fut]['save_path']}): {e}")
+    elapsed = time.perf_counter() - t0
+    print(f"🎨 이미지 {len(saved)}장 렌더링 완료: {elapsed:.1f}s ({len(saved) / max(elapsed, 1e-9):.2f}장/s, 워커 {workers}개)")
+    return saved
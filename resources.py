@@ -0,0 +1,89 @@
+import os
+import time
+
+import node_vocab
+import artifact_store
+import graph_index
+import brand_counts
+import country_index
+import ann_index
+from trademark_table import TABLE_FILE
+
+# ==========================================
+# 📚 분석 리소스 묶음 (그래프 + 인코더 + 임베딩 + 파생 인덱스)
+# ------------------------------------------
+# 분석 스크립트는 실행할 때마다 graph_data.pt / label_encoders.pt / 임베딩을 torch.load 합니다.
+# 상주 프로세스(query_service)는 load() 로 한 번 읽어 두고 읽기 전용으로 공유합니다.
+#   - 파생 인덱스(graph_index, brand_counts, country_index, ANN)도 로드 시점에 미리 준비
+#   - signature() 로 원본 파일의 크기/수정시각을 비교해 변경 여부 확인 (hot reload)
+#   - load(country=['한국']) : 국가별 부분 그래프(slices/한국/)와 그 그래프로 학습한 임베딩만 읽음
+#     (인코더는 전체 그래프 것을 n_id 로 골라 사용 -> 결과의 브랜드/류 이름은 전체 그래프와 동일)
+# ==========================================
+GRAPH_PATH = "./outputs/graph/graph_data.pt"
+ENCODER_PATH = "./outputs/graph/label_encoders.pt"
+EMBEDDING_PATH = "./outputs/graph/dgl_node_embeddings_v3.pt"
+
+def artifact_paths(graph_path=GRAPH_PATH, encoder_path=ENCODER_PATH, embedding_path=EMBEDDING_PATH):
+    trademark_path = os.path.join(os.path.dirname(encoder_path), TABLE_FILE)
+    return [graph_path, encoder_path, trademark_path, embedding_path]
+
+def signature(paths):
+    """{경로: (크기, 수정시각)} - 파일이 없으면 None (.mmap/manifest.json 도 함께 확인)"""
+    sig = {}
+    manifests = [os.path.join(artifact_store.mmap_dir(p), artifact_store.MANIFEST_FILE) for p in paths]
+    for path in paths + manifests:
+        try:
+            st = os.stat(path)
+            sig[path] = (st.st_size, st.st_mtime_ns)
+        except FileNotFoundError:
+            sig[path] = None
+    return sig
+
+class Resources:
+    """읽기 전용 리소스 스냅샷. 다시 로드할 때는 새 객체를 만들어 통째로 교체합니다."""
+    def __init__(self, data, encoders, embeddings, paths, sig):
+        self.data = data
+        self.encoders = encoders
+        self.embeddings = embeddings
+        self.paths = paths
+        self.signature = sig
+        self.loaded_at = time.time()
+        # of() 캐시에 등록 -> 같은 data 로 호출하는 분석/시각화 함수도 이 인덱스를 재사용
+        self.index = graph_index.of(data)
+        self.counts = brand_counts.of(data)
+        self.countries = country_index.of(data, encoders)
+        self.ann = ann_index.of(embeddings, paths[-1]) if embeddings is not None else None
+        encoders['company_classes'].get('')   # 이름 -> ID 사전을 미리 만들어 둠 (스레드 간 공유)
+
+    @property
+    def num_brands(self):
+        return len(self.encoders['company_classes'])
+
+    def brand_index(self, name):
+        return self.encoders['company_classes'].get(name)
+
+def slice_paths(countries):
+    """국가 목록 -> (부분 그래프 경로, 부분 그래프 임베딩 경로)"""
+    out_dir = country_index.slice_dir(countries)
+    return (os.path.join(out_dir, os.path.basename(GRAPH_PATH)),
+            os.path.join(out_dir, os.path.basename(EMBEDDING_PATH)))
+
+def load(graph_path=GRAPH_PATH, encoder_path=ENCODER_PATH, embedding_path=EMBEDDING_PATH, country=None):
+    if country:
+        graph_path, embedding_path = slice_paths(country)
+        if not artifact_store.exists(graph_path):
+            raise FileNotFoundError(f"❌ 부분 그래프가 없습니다: {graph_path} "
+                                    f"(먼저 `python graph_generator.py --slice {' '.join(country)}` 실행)")
+    paths = artifact_paths(graph_path, encoder_path, embedding_path)
+    sig = signature(paths)
+    t0 = time.perf_counter()
+    data = artifact_store.load_graph(graph_path)
+    encoders = country_index.slice_encoders(data, node_vocab.load_encoders(encoder_path))
+    embeddings = None
+    if artifact_store.exists(embedding_path):
+        embeddings = artifact_store.load_embeddings(embedding_path)
+    else:
+        print(f"⚠️ 임베딩 파일이 없어 추천/경쟁사 질의는 사용할 수 없습니다: {embedding_path}")
+    res = Resources(data, encoders, embeddings, paths, sig)
+    print(f"✅ 리소스 로드 완료: 브랜드 {res.num_brands:,}개 ({time.perf_counter() - t0:.2f}s)")
+    return res
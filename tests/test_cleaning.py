@@ -0,0 +1,112 @@
+import os
+import re
+import sys
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import cleaning
+from graph_generator import clean_class_column, clean_group_column
+from market_trend_analyzer import clean_date, clean_class
+
+# ==========================================
+# 🧪 정제 파이프라인 Golden 검증
+# ------------------------------------------
+# 1) 고정 입력/기대값(Golden) 확인
+# 2) 기존 행 단위 .apply 결과와 cleaning 벡터화 결과가 (값 + 인덱스) 완전히 같은지 비교
+# 소요 시간 비교는 bench_cleaning.py
+# ==========================================
+
+GOLDEN_CLASS = [
+    (9, "9"), ("35", "35"), (" 3 // 5", "3"), ("class 25", "25"),
+    (None, "0"), (np.nan, "0"), ("기타", "0"), (9.0, "9"),
+]
+GOLDEN_GROUP = [
+    ("G0901 | S0101", ["G0901", "S0101"]),
+    ("g0901,G3901", ["G0901", "G3901"]),
+    ("  ", ["Unknown_Group"]),
+    (None, ["Unknown_Group"]),
+    ("s1234", ["S1234"]),
+]
+GOLDEN_MAIN_CLASS = [("03//05", "03"), (" 9 ", "9"), (None, "기타"), ("class 12 // 1", "12")]
+GOLDEN_GOODS = [("a//b,c", 3), ("x\ny", 2), (None, 1), ("z", 1)]
+GOLDEN_NAME_LEN = [("ABC 상표", 5), ("(주)하나", 3), (np.nan, 3)]
+
+def _series(values):
+    return pd.Series(values, dtype=object)
+
+def test_golden_class():
+    inputs, expected = zip(*GOLDEN_CLASS)
+    assert cleaning.clean_class_series(_series(inputs)).tolist() == list(expected)
+
+def test_golden_group():
+    inputs, expected = zip(*GOLDEN_GROUP)
+    out = cleaning.split_group_series(_series(inputs))
+    assert [out.loc[[i]].tolist() for i in range(len(inputs))] == list(expected)
+
+def test_golden_main_class():
+    inputs, expected = zip(*GOLDEN_MAIN_CLASS)
+    assert cleaning.main_class_series(_series(inputs)).tolist() == list(expected)
+
+def test_golden_goods_count():
+    inputs, expected = zip(*GOLDEN_GOODS)
+    assert cleaning.goods_count_series(_series(inputs)).tolist() == list(expected)
+
+def test_golden_name_length():
+    inputs, expected = zip(*GOLDEN_NAME_LEN)
+    assert cleaning.name_length_series(_series(inputs)).tolist() == list(expected)
+
+# ------------------------------------------
+# 기존 .apply 구현과 동일성
+# ------------------------------------------
+@pytest.fixture(scope="module")
+def sample():
+    rng = random.Random(42)
+    n = 2000
+    classes = [9, '35', ' 3 // 5', 'class 25', None, '기타', 9.0, '42//09', '제 30 류']
+    groups = ['G0901 | S0101', 'g0901,G3901', None, '  ', 's1234', 'G4503\nG4504', 'S2027, S2036 |G1001']
+    dates = ['2019-01-02', '20200315', '2021.05.05', None, 'bad', '2018/11/30']
+    goods = ['a//b,c', 'x\ny', None, 'z', '가방, 지갑//벨트']
+    names = ['SAMSUNG', 'ABC 상표', '(주)하나', None, 'X_Y (Z)']
+    return pd.DataFrame({
+        '류': [rng.choice(classes) for _ in range(n)],
+        '유사군': [rng.choice(groups) for _ in range(n)],
+        '출원일자': [rng.choice(dates) for _ in range(n)],
+        '지정상품': [rng.choice(goods) for _ in range(n)],
+        '상표명칭': [rng.choice(names) for _ in range(n)],
+    })
+
+CASES = {
+    "class": (
+        lambda df: df['류'].apply(clean_class_column),
+        lambda df: cleaning.clean_class_series(df['류'])),
+    "group": (   # 여러 코드가 든 유사군 -> explode (행 인덱스 반복)
+        lambda df: df['유사군'].apply(clean_group_column).explode(),
+        lambda df: cleaning.split_group_series(df['유사군'])),
+    "class_numeric": (
+        lambda df: df['류'].apply(clean_class).astype(np.int64),
+        lambda df: cleaning.clean_class_numeric(df['류'])),
+    "date": (
+        lambda df: df['출원일자'].apply(clean_date),
+        lambda df: cleaning.clean_date_series(df['출원일자'])),
+    "main_class": (   # basic_analysis 주요_류
+        lambda df: df['류'].astype(str).apply(lambda x: x.split('//')[0].strip())
+                           .str.extract(r'(\d+)', expand=False).fillna('기타').astype(str),
+        lambda df: cleaning.main_class_series(df['류'])),
+    "goods_count": (   # 지정상품_개수
+        lambda df: df['지정상품'].astype(str).apply(lambda x: len(re.split(r'//|,|\n', x))),
+        lambda df: cleaning.goods_count_series(df['지정상품'])),
+    "name_length": (   # 상표명_길이
+        lambda df: df['상표명칭'].astype(str).apply(lambda x: len(re.sub(r'\s|\(|\)', '', x))),
+        lambda df: cleaning.name_length_series(df['상표명칭'])),
+}
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_vectorized_matches_legacy(sample, name):
+    legacy_fn, vector_fn = CASES[name]
+    expected, got = legacy_fn(sample), vector_fn(sample)
+    assert expected.index.equals(got.index)
+    assert expected.astype(str).tolist() == got.astype(str).tolist()
@@ -0,0 +1,55 @@
+import os
+import sys
+import datetime
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import data_ingest
+
+pytest.importorskip("pyarrow")
+openpyxl = pytest.importorskip("openpyxl")
+
+# ==========================================
+# 🧪 출원일자: 전체 캐시 / 스트리밍 캐시가 같은 날짜를 내는지
+# ------------------------------------------
+# 숫자 셀(20200101)이 스트리밍 캐시에서는 2020-01-01, 전체 캐시에서는 int64 -> 1970 나노초로 읽히던 문제
+# ==========================================
+
+def _write_workbook(path, dates):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(['상표명칭', '류', '유사군', '출원일자'])
+    for i, d in enumerate(dates):
+        ws.append([f"브랜드{i}", 9, "G0901", d])
+    wb.save(path)
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_ingest, 'CACHE_DIR', str(tmp_path / "cache"))
+    return tmp_path
+
+def _both_caches(path):
+    full = data_ingest.load_workbook(path, columns=['출원일자'], stream=False)['출원일자']
+    stream = data_ingest.load_workbook(path, columns=['출원일자'], stream=True)['출원일자']
+    return full, stream
+
+@pytest.mark.parametrize("dates", [
+    [20200101, 20211231],                                          # 숫자만 (read_excel -> int64 컬럼)
+    [20200101, "2021-12-31", datetime.datetime(2019, 5, 6), None],  # 숫자/문자/날짜 혼재 (object 컬럼)
+])
+def test_numeric_date_cells_match_between_caches(cache_dir, dates):
+    path = str(cache_dir / "테스트_DATA.xlsx")
+    _write_workbook(path, dates)
+    full, stream = _both_caches(path)
+
+    assert pd.api.types.is_datetime64_any_dtype(full)
+    assert pd.api.types.is_datetime64_any_dtype(stream)
+    assert full.tolist() == stream.tolist()
+    assert full.iloc[0] == pd.Timestamp("2020-01-01")
+
+def test_normalize_dates_integer_and_float_cells():
+    out = data_ingest.normalize_dates([20200101, 20200101.0, "20200101", None, "잘못된 값"])
+    assert out.iloc[:3].tolist() == [pd.Timestamp("2020-01-01")] * 3
+    assert out.iloc[3:].isna().all()
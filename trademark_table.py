@@ -0,0 +1,83 @@
+import os
+import json
+import numpy as np
+import pyarrow as pa
+import pyarrow.ipc as pa_ipc
+
+# ==========================================
+# 🏷️ 상표(Trademark) 노드 테이블
+# ------------------------------------------
+# 예전에는 상표 노드마다 "상표명_행번호_파일명" 문자열을 만들어 인코딩/저장했고,
+# 시각화에서 다시 split('_') 하여 이름을 꺼냈습니다.
+# 이제 상표 노드 ID = 이 테이블의 행 번호이며, 각 행은 정수 3개만 가집니다.
+#   file_id : 원본 엑셀 (source_files 의 인덱스)
+#   row_id  : 엑셀 내 행 번호
+#   name_id : 상표명칭 (company_classes 의 ID, 브랜드 = 상표명칭)
+# 그래프 옆에 Arrow IPC(컬럼형)로 저장하며 memory-map으로 읽습니다.
+# ==========================================
+TABLE_FILE = "trademarks.arrow"
+
+class TrademarkTable:
+    def __init__(self, file_id, row_id, name_id, source_files, names=None):
+        self.file_id = np.asarray(file_id, dtype=np.int16)
+        self.row_id = np.asarray(row_id, dtype=np.int32)
+        self.name_id = np.asarray(name_id, dtype=np.int32)
+        self.source_files = list(source_files)
+        self.names = names   # company NodeVocab (표시 이름 조회용)
+
+    def __len__(self):
+        return len(self.row_id)
+
+    @classmethod
+    def empty(cls):
+        return cls([], [], [], [])
+
+    def file_ids_for(self, file_names):
+        """파일명 -> file_id (처음 보는 파일은 뒤에 추가)"""
+        ids = []
+        for f in file_names:
+            if f not in self.source_files:
+                self.source_files.append(f)
+            ids.append(self.source_files.index(f))
+        return ids
+
+    def append(self, file_id, row_id, name_id):
+        """행을 뒤에 추가하고, 새 상표 노드 ID 배열을 반환합니다."""
+        start = len(self)
+        self.file_id = np.concatenate([self.file_id, np.asarray(file_id, dtype=np.int16)])
+        self.row_id = np.concatenate([self.row_id, np.asarray(row_id, dtype=np.int32)])
+        self.name_id = np.concatenate([self.name_id, np.asarray(name_id, dtype=np.int32)])
+        return np.arange(start, len(self), dtype=np.int64)
+
+    def display_name(self, tm_idx):
+        """상표 노드 ID -> 상표명칭"""
+        return self.names[self.name_id[int(tm_idx)]]
+
+    def source(self, tm_idx):
+        """상표 노드 ID -> (원본 파일명, 행 번호)"""
+        tm_idx = int(tm_idx)
+        return self.source_files[self.file_id[tm_idx]], int(self.row_id[tm_idx])
+
+    # ------------------------------------------
+    # 저장 / 로드
+    # ------------------------------------------
+    def save(self, path):
+        table = pa.table({
+            'file_id': self.file_id,
+            'row_id': self.row_id,
+            'name_id': self.name_id,
+        })
+        meta = {b'source_files': json.dumps(self.source_files, ensure_ascii=False).encode('utf-8')}
+        table = table.replace_schema_metadata(meta)
+        tmp = path + ".tmp"
+        with pa.OSFile(tmp, 'wb') as sink:
+            with pa_ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, names=None):
+        table = pa_ipc.open_file(pa.memory_map(path, 'r')).read_all()
+        source_files = json.loads(table.schema.metadata[b'source_files'].decode('utf-8'))
+        cols = {c: table.column(c).to_numpy() for c in ['file_id', 'row_id', 'name_id']}
+        return cls(cols['file_id'], cols['row_id'], cols['name_id'], source_files, names=names)